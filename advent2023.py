@@ -0,0 +1,794 @@
+import argparse
+import contextlib
+import importlib
+import json
+import os
+import signal
+import sys
+import time
+import traceback
+from collections import deque
+from pathlib import Path
+from statistics import median
+from types import ModuleType
+from typing import TYPE_CHECKING, Dict, Iterator, List, NamedTuple, Optional, Sequence, Set, Tuple, Union
+
+import utils
+
+if TYPE_CHECKING:
+    from multiprocessing import Process
+    from multiprocessing.connection import Connection
+
+# Single entry point for running and benchmarking all of the day scripts.  Each day is imported as a module, and its
+# parse() and part_one()/part_two() are run repeatedly, so each part can be timed (or skipped) on its own.  The
+# process pool and tracemalloc are only imported by the options that need them, since between them they'd otherwise
+# be most of the runner's startup time.
+
+REPO_ROOT = Path(__file__).resolve().parent
+DAY_MODULE = "advent2023_day{day:02d}"
+PART_NAMES = ("one", "two")
+# Median wall time of each day's last run, used to schedule the slowest days first when running in parallel
+TIMING_HISTORY = REPO_ROOT / ".cache" / "timings.json"
+# How long past its budget we'll wait on a worker that didn't manage to cancel itself before giving up on it
+BUDGET_GRACE = 5.0
+
+
+# Opt-in store of answers and part timings from earlier runs, so re-running a day on an input it has already solved
+# with the same code is just a file read.  Entries are keyed on the day, a hash of its input and a hash of its source
+# (and utils', which every day leans on), so editing either one misses the cache rather than returning stale answers.
+# In "verify" mode every day is solved again anyway, and a run whose answers differ from the stored ones fails.
+class AnswerCache:
+    mode: Optional[str] = None  # None (off), "use" or "verify"
+    directory: Path = REPO_ROOT / ".cache" / "answers"
+    # Least-recently-used entries get evicted once the directory grows past this
+    max_bytes: int = 16 * 1024 * 1024
+
+
+class Stats(NamedTuple):
+    min: float
+    median: float
+    p95: float
+
+    @staticmethod
+    def from_samples(samples: List[float]) -> "Stats":
+        ordered = sorted(samples)
+        # Nearest-rank percentile, so with only a handful of samples p95 is just the slowest run
+        p95_index = max(0, -(-len(ordered) * 95 // 100) - 1)
+        return Stats(min=ordered[0], median=median(ordered), p95=ordered[p95_index])
+
+
+class RunResult(NamedTuple):
+    answers: Dict[str, str]
+    part_times: Dict[str, float]
+    total_time: float
+    phase_times: Dict[str, float]
+    # Came out of the answer cache, in which case the times are the ones recorded when it was stored
+    cached: bool = False
+    # Only measured with --memory: the whole run as "all", plus each phase
+    memory: Optional[Dict[str, utils.MemoryUsage]] = None
+    # Counters for each utils.memoize() function the run called
+    memo_stats: Optional[Dict[str, utils.MemoStats]] = None
+
+
+class DayReport(NamedTuple):
+    day: int
+    answers: Dict[str, str]
+    total: Stats
+    parts: Dict[str, Stats]
+    phases: Dict[str, Stats]
+    samples: List[float]
+    cached: bool = False
+    memory: Optional[Dict[str, utils.MemoryUsage]] = None
+    memo_stats: Optional[Dict[str, utils.MemoStats]] = None
+
+
+class DayFailure(NamedTuple):
+    day: int
+    reason: str
+
+
+class DayTimeout(Exception):
+    pass
+
+
+class AnswerMismatch(Exception):
+    pass
+
+
+class JobSettings(NamedTuple):
+    repeat: int
+    warmup: int
+    budget: Optional[float]
+    phases: bool
+    profile_dir: Optional[Path]
+    profile_phases: Optional[Set[str]]
+    parse_cache: bool
+    parts: Optional[Tuple[str, ...]]
+    answer_cache: Optional[str]
+    memory: bool
+    progress: bool
+    checkpoints: bool
+
+
+class RunningJob(NamedTuple):
+    process: "Process"
+    day: int
+    parts: Optional[Tuple[str, ...]]
+    # When the runner gives up on the worker and kills it, if there's a budget
+    deadline: Optional[float]
+
+
+class BatchResult(NamedTuple):
+    path: Path
+    answers: Dict[str, str]
+    part_times: Dict[str, float]
+    total_time: float
+    error: Optional[str]
+    cached: bool = False
+    memory: Optional[Dict[str, utils.MemoryUsage]] = None
+
+
+def available_days() -> List[int]:
+    return sorted(int(x.stem[-2:]) for x in REPO_ROOT.glob("advent2023_day[0-9][0-9].py"))
+
+
+def day_parts(module: ModuleType, parts: Optional[Sequence[str]] = None) -> List[str]:
+    # The requested parts (all of them by default) that the day actually has, since day 25 only has part one
+    return [x for x in (parts or PART_NAMES) if hasattr(module, f"part_{x}")]
+
+
+def answer_cache_entry(day: int, module: ModuleType, input_text: str) -> Path:
+    key = utils.content_hash(
+        f"day{day}\n".encode(),
+        input_text.encode(),
+        utils.source_bytes(module.__name__),
+        utils.source_bytes(utils.__name__),
+    )
+    return AnswerCache.directory / f"day{day:02d}_{key}.json"
+
+
+def load_answers(entry: Path) -> Optional[Dict]:
+    try:
+        stored = json.loads(entry.read_text())
+    except (OSError, ValueError):
+        return None
+    # Bump the mtime so eviction sees this entry as recently used
+    os.utime(entry)
+    return stored
+
+
+def store_answers(entry: Path, stored: Optional[Dict], result: RunResult):
+    # Parts solved on separate runs accumulate in the same entry
+    stored = stored or {"answers": {}, "parts": {}}
+    stored["answers"].update(result.answers)
+    stored["parts"].update(result.part_times)
+    AnswerCache.directory.mkdir(parents=True, exist_ok=True)
+    # Write then rename, so a parallel run never sees a half-written entry
+    temp_entry = entry.with_suffix(f".{os.getpid()}.tmp")
+    temp_entry.write_text(json.dumps(stored))
+    temp_entry.replace(entry)
+    utils.evict_lru(AnswerCache.directory, AnswerCache.max_bytes)
+
+
+def check_answers(stored: Dict, result: RunResult):
+    mismatches = [
+        f"part {part} gave {answer}, cached {stored['answers'][part]}"
+        for part, answer in result.answers.items()
+        if stored["answers"].get(part, answer) != answer
+    ]
+    if mismatches:
+        raise AnswerMismatch("; ".join(mismatches))
+
+
+def run_once(day: int, input_text: Optional[str] = None, parts: Optional[Sequence[str]] = None) -> RunResult:
+    # Both parts share one parse, and each part's time runs from the end of the one before, so the first part that
+    # runs also includes reading and parsing the input
+    module = importlib.import_module(DAY_MODULE.format(day=day))
+    utils.pop_phase_timings()
+    utils.pop_phase_memory()
+    utils.pop_memo_stats()
+    start = last_mark = time.perf_counter()
+    if input_text is None:
+        input_text = utils.read_data(day)
+    wanted = day_parts(module, parts)
+    entry, stored = None, None
+    if AnswerCache.mode:
+        entry = answer_cache_entry(day, module, input_text)
+        stored = load_answers(entry)
+        if AnswerCache.mode != "verify" and stored and all(x in stored["answers"] for x in wanted):
+            part_times = {x: stored["parts"][x] for x in wanted}
+            answers = {x: stored["answers"][x] for x in wanted}
+            return RunResult(answers, part_times, sum(part_times.values()), phase_times={}, cached=True)
+    tracker = utils.MemoryTracker() if utils.PhaseSettings.trace_memory else None
+    with tracker or contextlib.nullcontext():
+        parsed = module.parse(input_text)
+        answers, part_times = {}, {}
+        for part in wanted:
+            # Call-scoped memos start empty for each part, so the second part isn't timed with the first's cache
+            utils.clear_memos()
+            answer = getattr(module, f"part_{part}")(parsed)
+            now = time.perf_counter()
+            answers[part] = str(answer)
+            part_times[part] = now - last_mark
+            last_mark = now
+    total_time = time.perf_counter() - start
+    result = RunResult(
+        answers=answers,
+        part_times=part_times,
+        total_time=total_time,
+        phase_times=utils.pop_phase_timings(),
+        memory={"all": tracker.usage, **utils.pop_phase_memory()} if tracker else None,
+        memo_stats=utils.pop_memo_stats() or None,
+    )
+    if entry:
+        # A mismatch still replaces the stale entry with the fresh answers, so the next --answer-cache run gets them
+        try:
+            if stored and AnswerCache.mode == "verify":
+                check_answers(stored, result)
+        finally:
+            store_answers(entry, stored, result)
+    return result
+
+
+def benchmark_day(day: int, repeat: int, warmup: int, parts: Optional[Sequence[str]] = None) -> DayReport:
+    for _ in range(warmup):
+        run_once(day, parts=parts)
+    runs = [run_once(day, parts=parts) for _ in range(repeat)]
+    parts = {part: Stats.from_samples([x.part_times[part] for x in runs]) for part in runs[0].part_times}
+    phases = {name: Stats.from_samples([x.phase_times[name] for x in runs]) for name in runs[0].phase_times}
+    samples = [x.total_time for x in runs]
+    return DayReport(
+        day=day,
+        answers=runs[-1].answers,
+        total=Stats.from_samples(samples),
+        parts=parts,
+        phases=phases,
+        samples=samples,
+        cached=all(x.cached for x in runs),
+        # The last run's, since the first can include one-off allocations like compiled regexes
+        memory=runs[-1].memory,
+        memo_stats=runs[-1].memo_stats,
+    )
+
+
+@contextlib.contextmanager
+def time_budget(seconds: Optional[float]) -> Iterator[None]:
+    # Interrupts the day with DayTimeout once its budget runs out.  SIGALRM is only delivered to the main thread, which
+    # is where both the serial runner and the pool's worker processes run their days.
+    if not seconds or not hasattr(signal, "setitimer"):
+        yield
+        return
+
+    def on_alarm(signum, frame):
+        raise DayTimeout()
+
+    previous = signal.signal(signal.SIGALRM, on_alarm)
+    signal.setitimer(signal.ITIMER_REAL, seconds)
+    try:
+        yield
+    finally:
+        signal.setitimer(signal.ITIMER_REAL, 0)
+        signal.signal(signal.SIGALRM, previous)
+
+
+def report_progress(progress: utils.SearchProgress):
+    total = f"/{progress.total}" if progress.total is not None else ""
+    best = f", best {progress.best}" if progress.best is not None else ""
+    print(
+        f"[{progress.name}] {progress.explored}{total} explored, {progress.rate:.1f}/s{best}, {progress.elapsed:.1f}s",
+        file=sys.stderr,
+        flush=True,
+    )
+
+
+def run_day_job(
+    day: int, settings: JobSettings, parts: Optional[Sequence[str]] = None
+) -> Union[DayReport, DayFailure]:
+    # Everything a worker process needs to do for one day (or just some of its parts, overriding settings.parts),
+    # reporting failures rather than raising them
+    if settings.phases or settings.profile_dir or settings.memory:
+        utils.enable_phases(
+            settings.profile_dir, settings.profile_phases, f"day{day:02d}_", trace_memory=settings.memory
+        )
+    if settings.parse_cache:
+        utils.enable_parse_cache()
+    AnswerCache.mode = settings.answer_cache
+    if settings.memory:
+        import tracemalloc
+
+        tracemalloc.start()
+    if settings.progress:
+        utils.enable_search_progress(report_progress)
+    if settings.checkpoints:
+        utils.enable_checkpoints()
+    try:
+        with time_budget(settings.budget):
+            return benchmark_day(day, repeat=settings.repeat, warmup=settings.warmup, parts=parts or settings.parts)
+    except DayTimeout:
+        # So that running it again carries on from here rather than starting over
+        utils.save_checkpoints()
+        return DayFailure(day=day, reason=f"timed out after {settings.budget}s")
+    except Exception:
+        return DayFailure(day=day, reason=traceback.format_exc(limit=-1).strip().splitlines()[-1])
+    finally:
+        utils.disable_phases()
+        if settings.memory:
+            tracemalloc.stop()
+        utils.disable_search_progress()
+        utils.disable_checkpoints()
+
+
+def load_history() -> Dict[int, float]:
+    try:
+        return {int(k): v for k, v in json.loads(TIMING_HISTORY.read_text()).items()}
+    except (OSError, ValueError):
+        return {}
+
+
+def save_history(reports: List[DayReport]):
+    history = load_history()
+    history.update({x.day: x.total.median for x in reports})
+    TIMING_HISTORY.parent.mkdir(parents=True, exist_ok=True)
+    TIMING_HISTORY.write_text(json.dumps({str(k): v for k, v in sorted(history.items())}, indent=2))
+
+
+def schedule(days: List[int], history: Dict[int, float]) -> List[int]:
+    # Longest-processing-time first: the slowest days start straight away so they don't end up as the long tail.
+    # Days we've never timed go first of all, since for all we know they're the slowest.
+    return sorted(days, key=lambda x: history.get(x, float("inf")), reverse=True)
+
+
+def run_serial(days: List[int], settings: JobSettings) -> List[Union[DayReport, DayFailure]]:
+    return [run_day_job(day, settings) for day in days]
+
+
+def part_jobs(days: List[int], settings: JobSettings) -> List[Tuple[int, Optional[Tuple[str, ...]]]]:
+    # One job per part of each day, so a day's slow part two isn't stuck waiting behind its part one.  Each job
+    # parses the input for itself.
+    jobs = []
+    for day in days:
+        module = importlib.import_module(DAY_MODULE.format(day=day))
+        jobs += [(day, (part,)) for part in day_parts(module, settings.parts)]
+    return jobs
+
+
+def merge_part_reports(reports: List[DayReport]) -> DayReport:
+    # Put a day back together from jobs that each ran some of its parts.  Every job did its own parse, so the day's
+    # total is the sum of the jobs' totals.  The jobs come back in the order they finished, so put them back in part
+    # order first.
+    reports = sorted(reports, key=lambda x: min(map(PART_NAMES.index, x.parts), default=len(PART_NAMES)))
+    samples = [sum(x) for x in zip(*(report.samples for report in reports))]
+    return DayReport(
+        day=reports[0].day,
+        answers={part: answer for report in reports for part, answer in report.answers.items()},
+        total=Stats.from_samples(samples),
+        parts={part: stats for report in reports for part, stats in report.parts.items()},
+        phases=merge_phases(reports),
+        samples=samples,
+        cached=all(x.cached for x in reports),
+        memory=merge_memory([x.memory for x in reports]),
+        memo_stats=merge_memo_stats([x.memo_stats for x in reports]),
+    )
+
+
+def merge_phases(reports: List[DayReport]) -> Dict[str, Stats]:
+    # Every job timed its own parse, so a phase more than one job ran gets tagged with each job's parts (e.g.
+    # "parse:one" and "parse:two") rather than one of them overwriting the other
+    counts: Dict[str, int] = {}
+    for report in reports:
+        for name in report.phases:
+            counts[name] = counts.get(name, 0) + 1
+    return {
+        name if counts[name] == 1 else f"{name}:{'/'.join(report.parts)}": stats
+        for report in reports
+        for name, stats in report.phases.items()
+    }
+
+
+def merge_memory(
+    usages: List[Optional[Dict[str, utils.MemoryUsage]]]
+) -> Optional[Dict[str, utils.MemoryUsage]]:
+    # Each job ran in its own process, so the day's peak is the biggest of theirs rather than their sum
+    merged: Dict[str, utils.MemoryUsage] = {}
+    for usage in filter(None, usages):
+        for name, x in usage.items():
+            merged[name] = merged[name].combine(x) if name in merged else x
+    return merged or None
+
+
+def merge_job_results(
+    results: List[Tuple[Optional[Tuple[str, ...]], Union[DayReport, DayFailure]]]
+) -> List[Union[DayReport, DayFailure]]:
+    by_day: Dict[int, List[Tuple[Optional[Tuple[str, ...]], Union[DayReport, DayFailure]]]] = {}
+    for parts, result in results:
+        by_day.setdefault(result.day, []).append((parts, result))
+    merged = []
+    for day, day_results in by_day.items():
+        failures = [(parts, x) for parts, x in day_results if isinstance(x, DayFailure)]
+        if not failures:
+            merged.append(merge_part_reports([x for _, x in day_results]))
+        elif len(day_results) == 1:
+            merged.append(failures[0][1])
+        else:
+            reasons = "; ".join(f"part {'/'.join(parts)}: {x.reason}" for parts, x in failures)
+            merged.append(DayFailure(day=day, reason=reasons))
+    return merged
+
+
+def job_worker(connection: "Connection", day: int, settings: JobSettings, parts: Optional[Tuple[str, ...]]):
+    # The body of each worker process: run one job and send its result back up the pipe
+    connection.send(run_day_job(day, settings, parts))
+    connection.close()
+
+
+def run_parallel(
+    days: List[int], settings: JobSettings, workers: Optional[int], split_parts: bool = False
+) -> List[Union[DayReport, DayFailure]]:
+    # One process per job rather than a pool, so a worker that's stuck can be killed on its own without taking down
+    # the jobs running next to it
+    import multiprocessing
+    from multiprocessing.connection import wait
+
+    workers = workers or os.cpu_count() or 1
+    results: List[Tuple[Optional[Tuple[str, ...]], Union[DayReport, DayFailure]]] = []
+    ordered = schedule(days, load_history())
+    queue = deque(part_jobs(ordered, settings) if split_parts else [(x, None) for x in ordered])
+    running: Dict["Connection", RunningJob] = {}
+    while queue or running:
+        while queue and len(running) < workers:
+            day, parts = queue.popleft()
+            receiver, sender = multiprocessing.Pipe(duplex=False)
+            process = multiprocessing.Process(target=job_worker, args=(sender, day, settings, parts), daemon=True)
+            process.start()
+            sender.close()
+            # Workers cancel their own job when it runs over budget (time_budget() covers the whole job, warmups and
+            # repeats included), so this deadline only matters if one of them can't, e.g. because it's stuck in a
+            # long C call that never gives the signal handler a chance to run
+            deadline = time.monotonic() + settings.budget + BUDGET_GRACE if settings.budget else None
+            running[receiver] = RunningJob(process, day, parts, deadline)
+        deadlines = [x.deadline for x in running.values() if x.deadline is not None]
+        timeout = max(0.0, min(deadlines) - time.monotonic()) if deadlines else None
+        for receiver in wait(list(running), timeout=timeout):
+            job = running.pop(receiver)
+            try:
+                result = receiver.recv()
+            except EOFError:
+                # The worker died without sending anything back
+                job.process.join()
+                result = DayFailure(day=job.day, reason=f"worker failed: exit code {job.process.exitcode}")
+            receiver.close()
+            job.process.join()
+            results.append((job.parts, result))
+        now = time.monotonic()
+        for receiver, job in list(running.items()):
+            if job.deadline is not None and now >= job.deadline:
+                job.process.terminate()
+                job.process.join()
+                receiver.close()
+                del running[receiver]
+                reason = "cancelled: worker did not stop within its budget"
+                results.append((job.parts, DayFailure(day=job.day, reason=reason)))
+    return merge_job_results(results)
+
+
+def merge_memo_stats(
+    stats: List[Optional[Dict[str, utils.MemoStats]]]
+) -> Optional[Dict[str, utils.MemoStats]]:
+    merged: Dict[str, utils.MemoStats] = {}
+    for job_stats in filter(None, stats):
+        for name, x in job_stats.items():
+            if name in merged:
+                previous = merged[name]
+                x = utils.MemoStats(
+                    previous.hits + x.hits,
+                    previous.misses + x.misses,
+                    previous.evictions + x.evictions,
+                    max(previous.peak_size, x.peak_size),
+                )
+            merged[name] = x
+    return merged or None
+
+
+def solve_file(
+    day: int,
+    path: Path,
+    budget: Optional[float],
+    parts: Optional[Sequence[str]] = None,
+    answer_cache: Optional[str] = None,
+    memory: bool = False,
+) -> BatchResult:
+    # One batch job: solve a single input file, reporting failures rather than raising them
+    AnswerCache.mode = answer_cache
+    if memory:
+        import tracemalloc
+
+        utils.enable_phases(trace_memory=True)
+        tracemalloc.start()
+    try:
+        with time_budget(budget):
+            result = run_once(day, path.read_text(), parts)
+        return BatchResult(
+            path, result.answers, result.part_times, result.total_time, None, result.cached, result.memory
+        )
+    except DayTimeout:
+        return BatchResult(path, {}, {}, budget, error=f"timed out after {budget}s")
+    except Exception:
+        return BatchResult(path, {}, {}, 0.0, error=traceback.format_exc(limit=-1).strip().splitlines()[-1])
+    finally:
+        utils.disable_phases()
+        if memory:
+            tracemalloc.stop()
+
+
+def batch_inputs(directory: Path) -> List[Path]:
+    return sorted(x for x in directory.iterdir() if x.is_file() and not x.name.startswith("."))
+
+
+def run_batch(
+    day: int,
+    paths: List[Path],
+    workers: Optional[int],
+    budget: Optional[float],
+    parts: Optional[Sequence[str]] = None,
+    answer_cache: Optional[str] = None,
+    memory: bool = False,
+) -> Iterator[BatchResult]:
+    # Map one day over many inputs, yielding each result as soon as it's done rather than in submission order.
+    # Each worker imports the day once up front, so the only per-input cost is reading the file and solving it.
+    from concurrent.futures import ProcessPoolExecutor, as_completed
+
+    module_name = DAY_MODULE.format(day=day)
+    with ProcessPoolExecutor(max_workers=workers, initializer=importlib.import_module, initargs=(module_name,)) as pool:
+        futures = {pool.submit(solve_file, day, x, budget, parts, answer_cache, memory): x for x in paths}
+        for future in as_completed(futures):
+            try:
+                yield future.result()
+            except Exception as e:
+                yield BatchResult(futures[future], {}, {}, 0.0, error=f"worker failed: {e!r}")
+
+
+def format_batch_result(result: BatchResult) -> str:
+    if result.error:
+        return f"{result.path.name:<30} failed: {result.error}"
+    answers = "  ".join(f"{part}: {answer}" for part, answer in result.answers.items())
+    cached = "  (cached)" if result.cached else ""
+    peak = f"  peak {result.memory['all'].peak / 2**20:.1f} MiB" if result.memory else ""
+    return f"{result.path.name:<30} {result.total_time:>10.4f}s  {answers}{cached}{peak}"
+
+
+def memory_json(memory: Optional[Dict[str, utils.MemoryUsage]]) -> Optional[Dict]:
+    return {name: x._asdict() for name, x in memory.items()} if memory else None
+
+
+def batch_json(day: int, results: List[BatchResult]) -> Dict:
+    return {
+        "day": day,
+        "python": sys.version.split()[0],
+        "inputs": {
+            str(x.path): {
+                "answers": x.answers,
+                "parts": x.part_times,
+                "total": x.total_time,
+                "error": x.error,
+                "cached": x.cached,
+                "memory": memory_json(x.memory),
+            }
+            for x in sorted(results, key=lambda x: x.path)
+        },
+    }
+
+
+def format_table(reports: List[DayReport]) -> str:
+    header = f"{'Day':>3}  {'Part':<12} {'Min (s)':>10} {'Median (s)':>11} {'p95 (s)':>10}  Answer"
+    output = [header, "-" * len(header)]
+    for report in reports:
+        rows: List[Tuple[str, Stats, str]] = [("all", report.total, "(cached)" if report.cached else "")]
+        rows += [(part, stats, report.answers.get(part, "")) for part, stats in report.parts.items()]
+        # Phase rows only show up when the runner was asked for them
+        rows += [(f"[{name}]", stats, "") for name, stats in report.phases.items()]
+        for part, stats, answer in rows:
+            output.append(
+                f"{report.day:>3}  {part:<12} {stats.min:>10.4f} {stats.median:>11.4f} {stats.p95:>10.4f}  {answer}"
+            )
+    return "\n".join(output)
+
+
+def format_memory_table(reports: List[DayReport]) -> str:
+    header = f"{'Day':>3}  {'Phase':<10} {'Peak (KiB)':>11} {'Blocks':>10}"
+    output = [header, "-" * len(header)]
+    for report in reports:
+        for name, usage in (report.memory or {}).items():
+            label = name if name == "all" else f"[{name}]"
+            output.append(f"{report.day:>3}  {label:<10} {usage.peak / 1024:>11.1f} {usage.blocks:>10}")
+    return "\n".join(output)
+
+
+def format_memo_table(reports: List[DayReport]) -> str:
+    header = f"{'Day':>3}  {'Function':<40} {'Hits':>10} {'Misses':>10} {'Evictions':>10} {'Peak size':>10}"
+    output = [header, "-" * len(header)]
+    for report in reports:
+        for name, x in (report.memo_stats or {}).items():
+            output.append(
+                f"{report.day:>3}  {name:<40} {x.hits:>10} {x.misses:>10} {x.evictions:>10} {x.peak_size:>10}"
+            )
+    return "\n".join(output)
+
+
+def format_failures(failures: List[DayFailure]) -> str:
+    return "\n".join(f"Day {x.day} failed: {x.reason}" for x in failures)
+
+
+def to_json(reports: List[DayReport], failures: List[DayFailure], repeat: int, warmup: int) -> Dict:
+    return {
+        "repeat": repeat,
+        "warmup": warmup,
+        "failures": {str(x.day): x.reason for x in failures},
+        "python": sys.version.split()[0],
+        "days": {
+            str(x.day): {
+                "answers": x.answers,
+                "total": x.total._asdict(),
+                "parts": {part: stats._asdict() for part, stats in x.parts.items()},
+                "phases": {name: stats._asdict() for name, stats in x.phases.items()},
+                "samples": x.samples,
+                "cached": x.cached,
+                "memory": memory_json(x.memory),
+                "memo": {name: stats._asdict() for name, stats in x.memo_stats.items()} if x.memo_stats else None,
+            }
+            for x in reports
+        },
+    }
+
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Run and benchmark the Advent of Code 2023 solutions")
+    parser.add_argument("days", nargs="*", type=int, help="Days to run (default: all of them)")
+    parser.add_argument("-n", "--repeat", type=int, default=1, help="Timed runs per day")
+    parser.add_argument("-w", "--warmup", type=int, default=0, help="Untimed runs per day before timing starts")
+    parser.add_argument("--json", metavar="PATH", help="Also write the results as JSON ('-' for stdout)")
+    parser.add_argument("--phases", action="store_true", help="Also time the parse/part_one/part_two phases")
+    parser.add_argument("--profile", metavar="DIR", type=Path, help="cProfile each phase, dumping .prof/.folded to DIR")
+    parser.add_argument(
+        "--profile-phase", metavar="NAME", action="append", help="Only profile these phases (repeatable)"
+    )
+    parser.add_argument(
+        "-j",
+        "--jobs",
+        type=int,
+        nargs="?",
+        const=0,
+        help="Run days in parallel across this many processes (default: one per CPU), slowest days first",
+    )
+    parser.add_argument("--budget", type=float, help="Cancel any day that takes longer than this many seconds")
+    parser.add_argument(
+        "--answer-cache",
+        action="store_true",
+        help="Reuse answers (and timings) from .cache/answers when the input and the day's code haven't changed",
+    )
+    parser.add_argument(
+        "--verify-answers",
+        action="store_true",
+        help="Solve every day anyway and fail any whose answers differ from the ones in the answer cache",
+    )
+    parser.add_argument(
+        "--memory",
+        action="store_true",
+        help="Trace allocations, reporting each day's and phase's peak memory and net allocated blocks (slow)",
+    )
+    parser.add_argument(
+        "--memo-stats",
+        action="store_true",
+        help="Also show hit/miss/eviction counts for each day's utils.memoize() caches",
+    )
+    parser.add_argument(
+        "--progress",
+        action="store_true",
+        help="Report how far the long searches (days 23 and 24) have got on stderr, about once a second",
+    )
+    parser.add_argument(
+        "--checkpoint",
+        action="store_true",
+        help="Checkpoint the long searches to .cache/checkpoints, resuming from there if a day gets interrupted",
+    )
+    parser.add_argument("--part", choices=PART_NAMES, help="Only compute this part (default: both)")
+    parser.add_argument(
+        "--split-parts", action="store_true", help="With -j, run each day's parts as separate jobs in parallel"
+    )
+    parser.add_argument(
+        "--parse-cache", action="store_true", help="Reuse parsed inputs from .cache/parsed for days that support it"
+    )
+    parser.add_argument(
+        "--batch",
+        metavar="DIR",
+        type=Path,
+        help="Solve every input file in DIR with a single day, across -j processes, printing results as they finish",
+    )
+    args = parser.parse_args(argv)
+    if args.batch and len(args.days) != 1:
+        parser.error("--batch needs exactly one day")
+    if args.split_parts and args.jobs is None:
+        parser.error("--split-parts needs -j")
+    return args
+
+
+def answer_cache_mode(args: argparse.Namespace) -> Optional[str]:
+    if args.verify_answers:
+        return "verify"
+    return "use" if args.answer_cache else None
+
+
+def batch_main(args: argparse.Namespace):
+    day = args.days[0]
+    results = []
+    parts = (args.part,) if args.part else None
+    paths = batch_inputs(args.batch)
+    for result in run_batch(day, paths, args.jobs or None, args.budget, parts, answer_cache_mode(args), args.memory):
+        results.append(result)
+        if args.json != "-":
+            print(format_batch_result(result), flush=True)
+    if args.json:
+        report_json = json.dumps(batch_json(day, results), indent=2)
+        if args.json == "-":
+            print(report_json)
+        else:
+            Path(args.json).write_text(report_json)
+    if any(x.error for x in results):
+        raise SystemExit(1)
+
+
+def main(argv: Optional[List[str]] = None):
+    args = parse_args(argv)
+    if args.batch:
+        # Batch paths are relative to wherever we were run from, so resolve them before moving to the repo root
+        args.batch = args.batch.resolve()
+    # read_data() looks for inputs/ relative to the working directory
+    os.chdir(REPO_ROOT)
+    sys.path.insert(0, str(REPO_ROOT))
+    if args.batch:
+        batch_main(args)
+        return
+    days = args.days or available_days()
+    settings = JobSettings(
+        repeat=args.repeat,
+        warmup=args.warmup,
+        budget=args.budget,
+        phases=args.phases,
+        profile_dir=args.profile,
+        profile_phases=set(args.profile_phase) if args.profile_phase else None,
+        parse_cache=args.parse_cache,
+        parts=(args.part,) if args.part else None,
+        answer_cache=answer_cache_mode(args),
+        memory=args.memory,
+        progress=args.progress,
+        checkpoints=args.checkpoint,
+    )
+    if args.jobs is None:
+        results = run_serial(days, settings)
+    else:
+        results = run_parallel(days, settings, workers=args.jobs or None, split_parts=args.split_parts)
+    reports = sorted((x for x in results if isinstance(x, DayReport)), key=lambda x: x.day)
+    failures = sorted((x for x in results if isinstance(x, DayFailure)), key=lambda x: x.day)
+    save_history(reports)
+
+    report_json = json.dumps(to_json(reports, failures, args.repeat, args.warmup), indent=2)
+    if args.json == "-":
+        print(report_json)
+    else:
+        print(format_table(reports))
+        if args.memory:
+            print()
+            print(format_memory_table(reports))
+        if args.memo_stats:
+            print()
+            print(format_memo_table(reports))
+        if failures:
+            print(format_failures(failures))
+        if args.json:
+            Path(args.json).write_text(report_json)
+    # A timeout, a crash or an answer that doesn't match the cache all fail the run, so scripts can tell
+    if failures:
+        raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
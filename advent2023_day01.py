@@ -1,5 +1,6 @@
-from typing import Dict
-from utils import read_data
+from functools import partial
+from typing import Dict, Iterator, List
+from utils import map_lines, read_data, timed_phase
 import time
 
 
@@ -27,13 +28,37 @@ def find_digits(line: str, mapping: Dict[str, int] = None):
     return (first*10) + last
 
 
-def main():
-    lines = read_data().splitlines()
-    print(f"Part one: {sum(find_digits(x) for x in lines)}")
+def calibration_total(lines: List[str], mapping: Dict[str, int] = None) -> int:
+    return sum(find_digits(x, mapping) for x in lines)
+
+
+def parse(raw_input: str) -> str:
+    # Each line gets parsed as it's scored, so there's nothing to do up front
+    return raw_input
+
+
+@timed_phase("part_one")
+def part_one(raw_input: str) -> int:
+    return sum(map_lines(calibration_total, raw_input))
+
 
+@timed_phase("part_two")
+def part_two(raw_input: str) -> int:
     words = ['zero', 'one', 'two', 'three', 'four', 'five', 'six', 'seven', 'eight', 'nine']
     word_mappings = {words[x]: x for x in range(10)}
-    print(f"Part two: {sum(find_digits(x, word_mappings) for x in lines)}")
+    return sum(map_lines(partial(calibration_total, mapping=word_mappings), raw_input))
+
+
+def solve(raw_input: str) -> Iterator[int]:
+    raw_input = parse(raw_input)
+    yield part_one(raw_input)
+    yield part_two(raw_input)
+
+
+def main():
+    answers = solve(read_data())
+    print(f"Part one: {next(answers)}")
+    print(f"Part two: {next(answers)}")
 
 
 if __name__ == '__main__':
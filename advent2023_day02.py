@@ -1,17 +1,20 @@
 import re
 import time
 from math import prod
-from typing import Dict
+from typing import Dict, Iterator, List
 
-from utils import read_data
+from utils import map_lines, read_data, timed_phase
 
 PILES = re.compile(r"(?P<amount>\d+) (?P<color>red|green|blue)")
 
 
 class Game:
+    __slots__ = ("id", "max_colors")
+    id: int
     max_colors: Dict[str, int]
 
     def __init__(self, line: str):
+        self.id = int(line[len("Game "):line.index(":")])
         self.max_colors = {"red": 0, "green": 0, "blue": 0}
         for match in PILES.finditer(line):
             color, amount = match.group("color"), int(match.group("amount"))
@@ -22,11 +25,40 @@ class Game:
         return all(self.max_colors[x] <= max_valid[x] for x in max_valid)
 
 
+# Lines get scored in chunks by utils.map_lines, so games go by the id on their line rather than their line number
+def valid_id_total(lines: List[str]) -> int:
+    return sum(game.id for game in map(Game, lines) if game.is_valid())
+
+
+def power_total(lines: List[str]) -> int:
+    return sum(prod(Game(x).max_colors.values()) for x in lines)
+
+
+def parse(raw_input: str) -> str:
+    # Each line gets parsed as it's scored, so there's nothing to do up front
+    return raw_input
+
+
+@timed_phase("part_one")
+def part_one(raw_input: str) -> int:
+    return sum(map_lines(valid_id_total, raw_input))
+
+
+@timed_phase("part_two")
+def part_two(raw_input: str) -> int:
+    return sum(map_lines(power_total, raw_input))
+
+
+def solve(raw_input: str) -> Iterator[int]:
+    raw_input = parse(raw_input)
+    yield part_one(raw_input)
+    yield part_two(raw_input)
+
+
 def main():
-    games = [Game(x) for x in read_data().splitlines()]
-    # For part 1, we need to do i+1 because game 1 starts on line 0
-    print(f"Part one: {sum(i+1 for i, x in enumerate(games) if x.is_valid())}")
-    print(f"Part two: {sum(prod(x.max_colors.values()) for x in games)}")
+    answers = solve(read_data())
+    print(f"Part one: {next(answers)}")
+    print(f"Part two: {next(answers)}")
 
 
 if __name__ == "__main__":
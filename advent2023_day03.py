@@ -1,10 +1,12 @@
 import time
 from collections import defaultdict
 from math import prod
-from typing import Dict, List, Set
+from typing import Dict, Iterator, List, Set
 
 from utils import BaseCoord as Coord
-from utils import read_data
+from utils import Grid, read_data, timed_phase
+
+DIGITS = b"0123456789"
 
 
 class Schematic:
@@ -13,18 +15,10 @@ class Schematic:
     symbol_neighbors: defaultdict[Coord, Set[Coord]]
 
     def __init__(self, lines: List[str]):
-        self.numbers = {}
-        self.symbols = {}
         self.symbol_neighbors = defaultdict(set)
-        for y, line in enumerate(lines):
-            for x, char in enumerate(line):
-                curloc = Coord(y=y, x=x)
-                if char == ".":
-                    continue
-                elif char.isdigit():
-                    self.numbers[curloc] = char
-                else:
-                    self.symbols[curloc] = char
+        grid = Grid.from_str("\n".join(lines), margin=0)
+        self.numbers = grid.cells_of(DIGITS)
+        self.symbols = grid.cells_of(b"." + DIGITS, invert=True)
         for symbol_loc in self.symbols:
             for loc in symbol_loc.neighbors():
                 if loc in self.numbers:
@@ -50,10 +44,31 @@ class Schematic:
         return int(digits)
 
 
+@timed_phase("parse")
+def parse(raw_input: str) -> Schematic:
+    return Schematic(raw_input.splitlines())
+
+
+@timed_phase("part_one")
+def part_one(board: Schematic) -> int:
+    return sum(board.read_part_num(x) for x in board.part_num_origins())
+
+
+@timed_phase("part_two")
+def part_two(board: Schematic) -> int:
+    return sum(board.gear_ratio(x) for x in board.gear_locs())
+
+
+def solve(raw_input: str) -> Iterator[int]:
+    board = parse(raw_input)
+    yield part_one(board)
+    yield part_two(board)
+
+
 def main():
-    board = Schematic(read_data().splitlines())
-    print(f"Part one: {sum(board.read_part_num(x) for x in board.part_num_origins())}")
-    print(f"Part two: {sum(board.gear_ratio(x) for x in board.gear_locs())}")
+    answers = solve(read_data())
+    print(f"Part one: {next(answers)}")
+    print(f"Part two: {next(answers)}")
 
 
 if __name__ == "__main__":
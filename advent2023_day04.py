@@ -1,8 +1,12 @@
-from utils import read_data
+from itertools import chain
+from typing import Iterator, List
+
+from utils import map_lines, read_data, timed_phase
 import time
 
 
 class Card:
+    __slots__ = ("part_one_value", "part_two_value")
     part_one_value: int
     part_two_value: int
 
@@ -16,14 +20,40 @@ class Card:
         self.part_two_value = num_matches
 
 
-def main():
-    cards = [Card(x) for x in read_data().splitlines()]
-    print(f"Part one: {sum(x.part_one_value for x in cards)}")
+def parse_cards(lines: List[str]) -> List[Card]:
+    return [Card(x) for x in lines]
+
+
+@timed_phase("parse")
+def parse(raw_input: str) -> List[Card]:
+    # Chunks come back in input order, so the cards stay in order for part two's copies
+    return list(chain.from_iterable(map_lines(parse_cards, raw_input)))
+
+
+@timed_phase("part_one")
+def part_one(cards: List[Card]) -> int:
+    return sum(x.part_one_value for x in cards)
+
+
+@timed_phase("part_two")
+def part_two(cards: List[Card]) -> int:
     copies = {x: 1 for x in range(len(cards))}
     for i in range(len(cards)):
         for j in range(i+1, i+1+cards[i].part_two_value):
             copies[j] += copies[i]
-    print(f"Part two: {sum(copies.values())}")
+    return sum(copies.values())
+
+
+def solve(raw_input: str) -> Iterator[int]:
+    cards = parse(raw_input)
+    yield part_one(cards)
+    yield part_two(cards)
+
+
+def main():
+    answers = solve(read_data())
+    print(f"Part one: {next(answers)}")
+    print(f"Part two: {next(answers)}")
 
 
 if __name__ == '__main__':
@@ -1,20 +1,18 @@
-from collections import deque
-from functools import reduce
-from typing import Dict, List
+from typing import Dict, Iterator, List, Tuple
 
-from utils import read_data
+from utils import IntervalSet, read_data, timed_phase
 import time
 
 
 class Map:
     map_type: str
     mapping: Dict[range, range]
-    sorted_inputs: List[range]
+    sources: IntervalSet
 
     def __init__(self, map_type: str, mapping: Dict[range, range]):
         self.map_type = map_type
         self.mapping = mapping
-        self.sorted_inputs = sorted(self.mapping.keys(), key=lambda x: x.start)
+        self.sources = IntervalSet(self.mapping)
 
     @staticmethod
     def from_str(raw_data: str):
@@ -33,30 +31,12 @@ class Map:
             return self.mapping[match][source_num - match.start]
         return source_num
 
-    def traverse(self, input_ranges: List[range]) -> List[range]:
-        output_ranges = []
-        for input_range in input_ranges:
-            for my_range in self.sorted_inputs:
-                before_range = range(input_range.start, min(input_range.stop, my_range.start))
-                if before_range:
-                    # This is part of the input range that isn't mapped, so just pass it through
-                    output_ranges.append(before_range)
-                overlap_range = range(max(input_range.start, my_range.start), min(input_range.stop, my_range.stop))
-                if overlap_range:
-                    # This part of the input range is mapped, so do the translation
-                    offset = overlap_range.start - my_range.start
-                    map_start = self.mapping[my_range][offset]
-                    output_ranges.append(range(map_start, map_start + len(overlap_range)))
-                # reduce what we're considering by what we just mapped
-                input_range = range(max(input_range.start, my_range.stop), input_range.stop)
-                # If we've mapped everything in this input range, move on
-                if not input_range:
-                    break
-            # If we've gone through all of the ranges in the mapping and still have some input_range left over,
-            # the remaining range just passes through
-            if input_range:
-                output_ranges.append(input_range)
-        return output_ranges
+    def traverse(self, inputs: IntervalSet) -> IntervalSet:
+        # Anything outside every mapped range just passes through, and the rest gets moved by its range's offset
+        outputs = inputs - self.sources
+        for source_range, dest_range in self.mapping.items():
+            outputs |= inputs.clip(source_range.start, source_range.stop).shift(dest_range.start - source_range.start)
+        return outputs
 
 
 def follow_maps(start_num: int, mappings: List[Map]) -> int:
@@ -66,16 +46,40 @@ def follow_maps(start_num: int, mappings: List[Map]) -> int:
     return cur_num
 
 
-def main():
-    raw = read_data().split("\n\n")
+@timed_phase("parse")
+def parse(raw_input: str) -> Tuple[List[int], List[Map]]:
+    raw = raw_input.split("\n\n")
     seeds = [int(x) for x in raw[0].split(": ")[1].split()]
     mappings = [Map.from_str(x) for x in raw[1:]]
+    return seeds, mappings
+
+
+@timed_phase("part_one")
+def part_one(almanac: Tuple[List[int], List[Map]]) -> int:
+    seeds, mappings = almanac
     locations = [follow_maps(x, mappings) for x in seeds]
-    print(f"Part one: {min(locations)}")
-    part_two_ranges = [range(seeds[i], seeds[i]+seeds[i+1]) for i in range(0, len(seeds), 2)]
+    return min(locations)
+
+
+@timed_phase("part_two")
+def part_two(almanac: Tuple[List[int], List[Map]]) -> int:
+    seeds, mappings = almanac
+    part_two_ranges = IntervalSet(range(seeds[i], seeds[i]+seeds[i+1]) for i in range(0, len(seeds), 2))
     for mapping in mappings:
         part_two_ranges = mapping.traverse(part_two_ranges)
-    print(f"Part two: {min(x.start for x in part_two_ranges)}")
+    return part_two_ranges.min()
+
+
+def solve(raw_input: str) -> Iterator[int]:
+    almanac = parse(raw_input)
+    yield part_one(almanac)
+    yield part_two(almanac)
+
+
+def main():
+    answers = solve(read_data())
+    print(f"Part one: {next(answers)}")
+    print(f"Part two: {next(answers)}")
 
 
 if __name__ == "__main__":
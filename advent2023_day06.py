@@ -1,6 +1,8 @@
 from math import prod
 
-from utils import read_data
+from typing import Iterator, List, Tuple
+
+from utils import read_data, timed_phase
 import time
 import re
 
@@ -26,13 +28,34 @@ def ways_to_beat(race_time: int, race_distance: int) -> int:
     return race_end - race_start
 
 
-def main():
-    raw_time, raw_distance = read_data().splitlines()
-    races = list(zip((int(x) for x in DIGITS.findall(raw_time)), (int(y) for y in DIGITS.findall(raw_distance))))
-    print(f"Part one: {prod(ways_to_beat(*x) for x in races)}")
+@timed_phase("parse")
+def parse(raw_input: str) -> List[Tuple[int, int]]:
+    raw_time, raw_distance = raw_input.splitlines()
+    return list(zip((int(x) for x in DIGITS.findall(raw_time)), (int(y) for y in DIGITS.findall(raw_distance))))
+
+
+@timed_phase("part_one")
+def part_one(races: List[Tuple[int, int]]) -> int:
+    return prod(ways_to_beat(*x) for x in races)
+
+
+@timed_phase("part_two")
+def part_two(races: List[Tuple[int, int]]) -> int:
     new_time = int(''.join(str(x[0]) for x in races))
     new_distance = int(''.join(str(x[1]) for x in races))
-    print(f"Part two: {ways_to_beat(new_time, new_distance)}")
+    return ways_to_beat(new_time, new_distance)
+
+
+def solve(raw_input: str) -> Iterator[int]:
+    races = parse(raw_input)
+    yield part_one(races)
+    yield part_two(races)
+
+
+def main():
+    answers = solve(read_data())
+    print(f"Part one: {next(answers)}")
+    print(f"Part two: {next(answers)}")
 
 
 if __name__ == '__main__':
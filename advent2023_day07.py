@@ -1,7 +1,9 @@
+import heapq
 from collections import Counter
-from typing import Tuple
+from functools import partial
+from typing import Iterator, List, Tuple, Type
 
-from utils import read_data
+from utils import map_lines, read_data, timed_phase
 import time
 
 HAND_TYPES = {
@@ -19,6 +21,7 @@ REVISED_STRENGTHS = {x: 13-i for i, x in enumerate('AKQT98765432J')}
 
 
 class PartOneHand:
+    __slots__ = ("raw_hand", "bid", "type")
     raw_hand: str
     bid: int
     type: Tuple[int, str]
@@ -34,6 +37,10 @@ class PartOneHand:
     def card_strength(self, position: int):
         return CARD_STRENGTHS[self.raw_hand[position]]
 
+    def sort_key(self) -> Tuple[int, ...]:
+        # Orders hands the same way __lt__ does, as a plain tuple that's cheap to send back from a worker process
+        return (self.type[0], *(self.card_strength(i) for i in range(5)))
+
     def __lt__(self, other: 'PartOneHand'):
         assert self.raw_hand != other.raw_hand, "Not supposed to have identical hands"
         if self.type == other.type:
@@ -46,6 +53,8 @@ class PartOneHand:
 
 
 class PartTwoHand(PartOneHand):
+    __slots__ = ()
+
     def determine_type(self):
         counts = Counter(self.raw_hand)
         num_jokers = counts.pop('J', None)
@@ -58,12 +67,41 @@ class PartTwoHand(PartOneHand):
         return REVISED_STRENGTHS[self.raw_hand[position]]
 
 
+def ranked_bids(lines: List[str], hand_type: Type[PartOneHand]) -> List[Tuple[Tuple[int, ...], int]]:
+    return sorted((hand.sort_key(), hand.bid) for hand in map(hand_type, lines))
+
+
+def total_winnings(raw_input: str, hand_type: Type[PartOneHand]) -> int:
+    # Each chunk of hands comes back sorted, so merging them gives every hand's overall rank
+    ranked = heapq.merge(*map_lines(partial(ranked_bids, hand_type=hand_type), raw_input))
+    return sum(bid * (i+1) for i, (_, bid) in enumerate(ranked))
+
+
+def parse(raw_input: str) -> str:
+    # Each line gets parsed as it's scored, so there's nothing to do up front
+    return raw_input
+
+
+@timed_phase("part_one")
+def part_one(raw_input: str) -> int:
+    return total_winnings(raw_input, PartOneHand)
+
+
+@timed_phase("part_two")
+def part_two(raw_input: str) -> int:
+    return total_winnings(raw_input, PartTwoHand)
+
+
+def solve(raw_input: str) -> Iterator[int]:
+    raw_input = parse(raw_input)
+    yield part_one(raw_input)
+    yield part_two(raw_input)
+
+
 def main():
-    raw_input = read_data().splitlines()
-    part_one_hands = sorted(PartOneHand(x) for x in raw_input)
-    print(f"Part one: {sum(x.bid * (i+1) for i, x in enumerate(part_one_hands))}")
-    part_two_hands = sorted(PartTwoHand(x) for x in raw_input)
-    print(f"Part two: {sum(x.bid * (i+1) for i, x in enumerate(part_two_hands))}")
+    answers = solve(read_data())
+    print(f"Part one: {next(answers)}")
+    print(f"Part two: {next(answers)}")
 
 
 if __name__ == '__main__':
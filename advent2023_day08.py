@@ -1,24 +1,28 @@
 import re
 import time
 from math import lcm
-from typing import Dict, Iterable, Tuple
+from typing import Iterable, Iterator
 
-from utils import read_data
+from utils import Graph, read_data, timed_phase
 
 NAMES = re.compile(r"[0-9A-Z]+")
 
 
 class Network:
     instructions: str
-    nodes: Dict[str, Tuple[str, str]]
+    # Each node's edges are its (left, right) exits, in that order, so an instruction indexes straight into them
+    nodes: Graph
+    ends: bytearray
 
     def __init__(self, raw_str: str):
         lines = raw_str.splitlines()
         self.instructions = lines[0]
-        self.nodes = {}
+        edges = []
         for line in lines[2:]:
             node, left, right = NAMES.findall(line)
-            self.nodes[node] = (left, right)
+            edges += [(node, left), (node, right)]
+        self.nodes = Graph.from_edges(edges)
+        self.ends = bytearray(x.endswith("Z") for x in self.nodes.names)
 
     def instruction_loop(self) -> Iterable[int]:
         while True:
@@ -26,33 +30,57 @@ class Network:
                 yield 1 if char == "R" else 0
 
     def traverse(self) -> int:
-        cur_node = "AAA"
+        offsets, targets = self.nodes.offsets, self.nodes.targets
+        cur_node = self.nodes.node_id("AAA")
+        end = self.nodes.node_id("ZZZ")
         steps = 0
         for dir in self.instruction_loop():
-            if cur_node == "ZZZ":
+            if cur_node == end:
                 break
-            cur_node = self.nodes[cur_node][dir]
+            cur_node = targets[offsets[cur_node] + dir]
             steps += 1
         return steps
 
-    def find_period(self, node: str) -> int:
+    def find_period(self, node: int) -> int:
+        offsets, targets = self.nodes.offsets, self.nodes.targets
         steps = 0
         for dir in self.instruction_loop():
-            node = self.nodes[node][dir]
+            node = targets[offsets[node] + dir]
             steps += 1
-            if node.endswith("Z"):
+            if self.ends[node]:
                 return steps
 
     def traverse_part_two(self) -> int:
-        nodes = [x for x in self.nodes if x.endswith("A")]
+        nodes = [i for i, x in enumerate(self.nodes.names) if x.endswith("A")]
         periods = [self.find_period(x) for x in nodes]
         return lcm(*periods)
 
 
+@timed_phase("parse")
+def parse(raw_input: str) -> Network:
+    return Network(raw_input)
+
+
+@timed_phase("part_one")
+def part_one(network: Network) -> int:
+    return network.traverse()
+
+
+@timed_phase("part_two")
+def part_two(network: Network) -> int:
+    return network.traverse_part_two()
+
+
+def solve(raw_input: str) -> Iterator[int]:
+    network = parse(raw_input)
+    yield part_one(network)
+    yield part_two(network)
+
+
 def main():
-    network = Network(read_data())
-    print(f"Part one: {network.traverse()}")
-    print(f"Part two: {network.traverse_part_two()}")
+    answers = solve(read_data())
+    print(f"Part one: {next(answers)}")
+    print(f"Part two: {next(answers)}")
 
 
 if __name__ == "__main__":
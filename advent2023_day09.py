@@ -1,10 +1,12 @@
-from typing import List
+from functools import partial
+from typing import Iterator, List
 
-from utils import read_data
+from utils import map_lines, read_data, timed_phase
 import time
 
 
 class Sequence:
+    __slots__ = ("sequence",)
     sequence: List[int]
 
     def __init__(self, line: str):
@@ -23,10 +25,35 @@ class Sequence:
         return previous[-1]
 
 
+def prediction_total(lines: List[str], reversed=False) -> int:
+    return sum(Sequence(x).predict(reversed=reversed) for x in lines)
+
+
+def parse(raw_input: str) -> str:
+    # Each line gets parsed as it's scored, so there's nothing to do up front
+    return raw_input
+
+
+@timed_phase("part_one")
+def part_one(raw_input: str) -> int:
+    return sum(map_lines(prediction_total, raw_input))
+
+
+@timed_phase("part_two")
+def part_two(raw_input: str) -> int:
+    return sum(map_lines(partial(prediction_total, reversed=True), raw_input))
+
+
+def solve(raw_input: str) -> Iterator[int]:
+    raw_input = parse(raw_input)
+    yield part_one(raw_input)
+    yield part_two(raw_input)
+
+
 def main():
-    sequences = [Sequence(x) for x in read_data().splitlines()]
-    print(f"Part one: {sum(x.predict() for x in sequences)}")
-    print(f"Part two: {sum(x.predict(reversed=True) for x in sequences)}")
+    answers = solve(read_data())
+    print(f"Part one: {next(answers)}")
+    print(f"Part two: {next(answers)}")
 
 
 if __name__ == '__main__':
@@ -1,6 +1,8 @@
-from typing import Dict, Union, Set
+from copy import copy
+from typing import Dict, Union, Set, Iterator
 
-from utils import read_data, BaseCoord as Coord
+from utils import UNREACHED, Grid, PackedCoords, bfs, cached_parse, read_data, timed_phase
+from utils import BaseCoord as Coord
 import time
 
 REPLACEMENTS = {"F": "┌", "7": "┐", "J": "┘", "L": "└"}
@@ -22,16 +24,13 @@ CONNECTIONS = {
 class PipeDream:
     points: Dict[Coord, str]
     start_loc: Coord
+    packing: PackedCoords
 
     def __init__(self, raw_field: str):
-        self.points = {}
-        for y, line in enumerate(raw_field.splitlines()):
-            line = line.translate(str.maketrans(REPLACEMENTS))
-            for x, char in enumerate(line):
-                curloc = Coord(y=y, x=x)
-                if char == "S":
-                    self.start_loc = curloc
-                self.points[Coord(y=y, x=x)] = char
+        grid = Grid.from_str(raw_field, margin=0)
+        self.start_loc = grid.unpack(grid.find(b"S"))
+        self.packing = PackedCoords(grid.width, grid.height)
+        self.points = {coord: REPLACEMENTS.get(char, char) for coord, char in grid.cells_of().items()}
 
     def __str__(self, highlight: Union[Coord, Set[Coord], None] = None) -> str:
         if highlight is None:
@@ -95,20 +94,47 @@ class PipeDream:
             curloc += DIRECTIONS[heading]
 
         # At this point, we've marked all enclosed points next to walls, so we just need to flood fill
-        queue = list(enclosed_points)
-        while queue:
-            curloc = queue.pop()
-            for neighbor in curloc.cardinal_neighbors():
-                if not any(neighbor in x for x in (enclosed_points, self.points)):
-                    enclosed_points.add(neighbor)
-                    queue.append(neighbor)
-        return len(enclosed_points)
+        packing = self.packing
+        pipes = bytearray(packing.stride * (packing.height + 2 * packing.margin))
+        for coord in self.points:
+            pipes[packing.pack(coord)] = 1
+        deltas = packing.cardinal_deltas
+        depths = bfs(
+            map(packing.pack, enclosed_points),
+            lambda cell: (cell + x for x in deltas if not pipes[cell + x]),
+            len(pipes),
+        )
+        return len(depths) - depths.count(UNREACHED)
+
+
+@timed_phase("parse")
+def parse(raw_input: str) -> PipeDream:
+    return cached_parse(PipeDream, raw_input)
+
+
+@timed_phase("part_one")
+def part_one(field: PipeDream) -> int:
+    # winnow() cuts the field down to just the main loop, so do that on a copy
+    return copy(field).winnow()
+
+
+@timed_phase("part_two")
+def part_two(field: PipeDream) -> int:
+    field = copy(field)
+    field.winnow()
+    return field.num_enclosed()
+
+
+def solve(raw_input: str) -> Iterator[int]:
+    field = parse(raw_input)
+    yield part_one(field)
+    yield part_two(field)
 
 
 def main():
-    field = PipeDream(read_data())
-    print(f"Part one: {field.winnow()}")
-    print(f"Part two: {field.num_enclosed()}")
+    answers = solve(read_data())
+    print(f"Part one: {next(answers)}")
+    print(f"Part two: {next(answers)}")
 
 
 if __name__ == "__main__":
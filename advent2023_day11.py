@@ -1,72 +1,76 @@
 import time
-from itertools import combinations
-from typing import Set
+from bisect import bisect_left
+from copy import copy
+from typing import Iterator, List
 
 from utils import BaseCoord as Coord
-from utils import read_data
+from utils import CoordArray, Grid, read_data, timed_phase
+
+
+def stretch(values: List[int], amount: int) -> List[int]:
+    # Push each value out by amount for every empty row (or column) before it, i.e. every value between the lowest and
+    # highest that no galaxy sits on
+    occupied = set(values)
+    empty = [x for x in range(min(values), max(values)) if x not in occupied]
+    return [x + amount * bisect_left(empty, x) for x in values]
 
 
 class Universe:
-    galaxy_locs: Set[Coord]
+    galaxies: CoordArray
 
     def __init__(self, raw_universe: str):
-        self.galaxy_locs = set()
-        for y, line in enumerate(raw_universe.splitlines()):
-            for x, char in enumerate(line):
-                if char == "#":
-                    self.galaxy_locs.add(Coord(y=y, x=x))
+        grid = Grid.from_str(raw_universe, margin=0)
+        self.galaxies = CoordArray.from_coords(grid.unpack_all(grid.find_any(b"#")))
 
     def __str__(self):
         output = []
-        min_x, max_x = min(x.x for x in self.galaxy_locs), max(x.x for x in self.galaxy_locs)
-        min_y, max_y = min(x.y for x in self.galaxy_locs), max(x.y for x in self.galaxy_locs)
+        galaxy_locs = self.galaxies.to_set()
+        min_x, max_x = min(self.galaxies.xs), max(self.galaxies.xs)
+        min_y, max_y = min(self.galaxies.ys), max(self.galaxies.ys)
         for y in range(min_y, max_y + 1):
-            line = "".join("#" if Coord(y=y, x=x) in self.galaxy_locs else "." for x in range(min_x, max_x + 1))
+            line = "".join("#" if Coord(y=y, x=x) in galaxy_locs else "." for x in range(min_x, max_x + 1))
             output.append(line)
         return "\n".join(output)
 
     def expand(self, amount=1):
-        min_x, max_x = min(x.x for x in self.galaxy_locs), max(x.x for x in self.galaxy_locs)
-        min_y, max_y = min(x.y for x in self.galaxy_locs), max(x.y for x in self.galaxy_locs)
-
-        cur_x = min_x
-        while cur_x <= max_x:
-            if any(x.x == cur_x for x in self.galaxy_locs):
-                cur_x += 1
-            else:
-                affected_galaxies = {x for x in self.galaxy_locs if x.x > cur_x}
-                self.galaxy_locs -= affected_galaxies
-                adjusted_galaxies = {Coord(x=x.x + amount, y=x.y) for x in affected_galaxies}
-                self.galaxy_locs |= adjusted_galaxies
-                max_x += amount
-                cur_x += amount + 1
-
-        cur_y = min_y
-        while cur_y <= max_y:
-            if any(x.y == cur_y for x in self.galaxy_locs):
-                cur_y += 1
-            else:
-                affected_galaxies = {x for x in self.galaxy_locs if x.y > cur_y}
-                self.galaxy_locs -= affected_galaxies
-                adjusted_galaxies = {Coord(x=x.x, y=x.y + amount) for x in affected_galaxies}
-                self.galaxy_locs |= adjusted_galaxies
-                max_y += amount
-                cur_y += amount + 1
+        # Rows and columns expand independently, so each axis can be stretched in one go
+        self.galaxies = CoordArray(stretch(self.galaxies.ys, amount), stretch(self.galaxies.xs, amount))
 
     def shortest_paths(self) -> int:
-        total_length = 0
-        for first, second in combinations(self.galaxy_locs, 2):
-            total_length += first.distance(second)
-        return total_length
+        return self.galaxies.pairwise_distance_sum()
 
 
-def main():
-    universe = Universe(read_data())
+@timed_phase("parse")
+def parse(raw_input: str) -> Universe:
+    return Universe(raw_input)
+
+
+@timed_phase("part_one")
+def part_one(universe: Universe) -> int:
+    # expand() replaces the galaxies rather than changing them, so a shallow copy keeps the parsed universe intact
+    universe = copy(universe)
     universe.expand(amount=1)
-    print(f"Part one: {universe.shortest_paths()}")
-    # We've already replaced each 1 with 2, so now replace each of those 2 with 500k
-    universe.expand(amount=(1_000_000 // 2) - 1)
-    print(f"Part two: {universe.shortest_paths()}")
+    return universe.shortest_paths()
+
+
+@timed_phase("part_two")
+def part_two(universe: Universe) -> int:
+    # Replace each empty row and column with a million of them
+    universe = copy(universe)
+    universe.expand(amount=1_000_000 - 1)
+    return universe.shortest_paths()
+
+
+def solve(raw_input: str) -> Iterator[int]:
+    universe = parse(raw_input)
+    yield part_one(universe)
+    yield part_two(universe)
+
+
+def main():
+    answers = solve(read_data())
+    print(f"Part one: {next(answers)}")
+    print(f"Part two: {next(answers)}")
 
 
 if __name__ == "__main__":
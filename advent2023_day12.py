@@ -1,8 +1,8 @@
 import time
-from functools import lru_cache
-from typing import Tuple
+from functools import partial
+from typing import Iterator, List, Tuple
 
-from utils import read_data
+from utils import map_lines, memoize, read_data, timed_phase
 
 
 class Condition:
@@ -17,7 +17,8 @@ class Condition:
         self.known_good = int("".join(["1" if x == "#" else "0" for x in self.raw_record]), base=2)
         self.known_bad = int("".join(["0" if x == "." else "1" for x in self.raw_record]), base=2)
 
-    @lru_cache(maxsize=None)
+    # Cached per Condition, so each one's entries go with it rather than piling up across every line of both parts
+    @memoize(scope="instance")
     def _count_possibilities(self, groups: Tuple[int, ...], offset: int) -> int:
         # If we've successfully placed all the groups, this is a valid possibility
         if not groups:
@@ -49,13 +50,42 @@ class Condition:
         self.parity *= 5
         self.known_good = int("".join(["1" if x == "#" else "0" for x in self.raw_record]), base=2)
         self.known_bad = int("".join(["0" if x == "." else "1" for x in self.raw_record]), base=2)
+        # Anything counted before unfolding was for the old record
+        Condition._count_possibilities.cache_clear(self)
+
+
+def possibility_total(lines: List[str], unfold: bool = False) -> int:
+    conditions = [Condition(x) for x in lines]
+    if unfold:
+        [x.unfold() for x in conditions]
+    return sum(x.count_possibilities() for x in conditions)
+
+
+def parse(raw_input: str) -> str:
+    # Each line gets parsed as it's scored, so there's nothing to do up front
+    return raw_input
+
+
+@timed_phase("part_one")
+def part_one(raw_input: str) -> int:
+    return sum(map_lines(possibility_total, raw_input))
+
+
+@timed_phase("part_two")
+def part_two(raw_input: str) -> int:
+    return sum(map_lines(partial(possibility_total, unfold=True), raw_input))
+
+
+def solve(raw_input: str) -> Iterator[int]:
+    raw_input = parse(raw_input)
+    yield part_one(raw_input)
+    yield part_two(raw_input)
 
 
 def main():
-    conditions = [Condition(x) for x in read_data().splitlines()]
-    print(f"Part 1: {sum(x.count_possibilities() for x in conditions)}")
-    [x.unfold() for x in conditions]
-    print(f"Part 2: {sum(x.count_possibilities() for x in conditions)}")
+    answers = solve(read_data())
+    print(f"Part 1: {next(answers)}")
+    print(f"Part 2: {next(answers)}")
 
 
 if __name__ == "__main__":
@@ -1,6 +1,6 @@
 from typing import Set, Tuple, Iterator, Optional, List
 
-from utils import read_data, BaseCoord as Coord
+from utils import Grid, read_data, timed_phase, BaseCoord as Coord
 import time
 
 
@@ -12,14 +12,10 @@ class Pattern:
     max_y: int
 
     def __init__(self, raw_field: str):
-        self.field = set()
-        lines = raw_field.splitlines()
-        self.max_x = len(lines[0])
-        self.max_y = len(lines)
-        for y, line in enumerate(lines):
-            for x, char in enumerate(line):
-                if char == "#":
-                    self.field.add(Coord(y=y, x=x))
+        grid = Grid.from_str(raw_field, margin=0)
+        self.max_x = grid.width
+        self.max_y = grid.height
+        self.field = grid.coords_of(b"#")
 
         self.columns = [{x.y for x in self.field if x.x == i} for i in range(self.max_x)]
         self.rows = [{x.x for x in self.field if x.y == i} for i in range(self.max_y)]
@@ -74,16 +70,38 @@ class Pattern:
         for y in range(self.max_y):
             for x in range(self.max_x):
                 self.toggle_coord(Coord(x=x, y=y))
-                if found := self.find_mirror(old_line=old_line):
-                    return found
+                found = self.find_mirror(old_line=old_line)
+                # Put the smudge back either way, so the pattern is left as it was parsed
                 self.toggle_coord(Coord(x=x, y=y))
+                if found:
+                    return found
+
+
+@timed_phase("parse")
+def parse(raw_input: str) -> List[Pattern]:
+    return [Pattern(x) for x in raw_input.split("\n\n")]
+
+
+@timed_phase("part_one")
+def part_one(patterns: List[Pattern]) -> int:
+    return sum(x.find_mirror() for x in patterns)
+
+
+@timed_phase("part_two")
+def part_two(patterns: List[Pattern]) -> int:
+    return sum(x.smudge_walk(x.find_mirror()) for x in patterns)
+
+
+def solve(raw_input: str) -> Iterator[int]:
+    patterns = parse(raw_input)
+    yield part_one(patterns)
+    yield part_two(patterns)
 
 
 def main():
-    patterns = [Pattern(x) for x in read_data().split("\n\n")]
-    mirror_lines = [x.find_mirror() for x in patterns]
-    print(f"Part one: {sum(mirror_lines)}")
-    print(f"Part two: {sum(x.smudge_walk(mirror_lines[i]) for i, x in enumerate(patterns))}")
+    answers = solve(read_data())
+    print(f"Part one: {next(answers)}")
+    print(f"Part two: {next(answers)}")
 
 
 if __name__ == "__main__":
@@ -1,6 +1,7 @@
-from typing import Set, Optional, FrozenSet
+from copy import copy
+from typing import Set, Optional, FrozenSet, Iterator
 
-from utils import read_data, BaseCoord as Coord
+from utils import Grid, read_data, state_at, timed_phase, BaseCoord as Coord
 import time
 
 DIRECTIONS = {"N": Coord(x=0, y=-1), "E": Coord(x=1, y=0), "S": Coord(x=0, y=1), "W": Coord(x=-1, y=0)}
@@ -14,17 +15,11 @@ class Platform:
     max_y: int
 
     def __init__(self, raw_field: str):
-        self.walls, self.rocks = set(), set()
-        lines = raw_field.splitlines()
-        for y, line in enumerate(lines):
-            for x, char in enumerate(line):
-                if char == "#":
-                    self.walls.add(Coord(y=y, x=x))
-                elif char == "O":
-                    self.rocks.add(Coord(y=y, x=x))
+        grid = Grid.from_str(raw_field, margin=0)
+        self.walls, self.rocks = grid.coords_of(b"#"), grid.coords_of(b"O")
         self.initial_rocks = self.rocks.copy()
-        self.max_x = len(lines[0])
-        self.max_y = len(lines)
+        self.max_x = grid.width
+        self.max_y = grid.height
         # Put a line of walls around the field so we don't have to do separate bounds checking
         self.walls |= (
             {Coord(y=-1, x=x) for x in range(-1, self.max_x)}
@@ -70,23 +65,17 @@ class Platform:
         for rock in sorted(self.rocks, key=lambda x: x.x * raw_dir.x if raw_dir.x else x.y * raw_dir.y, reverse=True):
             self.roll_one(rock, direction)
 
+    def spin(self, rocks: FrozenSet[Coord]) -> FrozenSet[Coord]:
+        # One N/W/S/E combo, starting from rocks
+        self.rocks = set(rocks)
+        for direction in ("N", "W", "S", "E"):
+            self.roll(direction)
+        return frozenset(self.rocks)
+
     def spin_cycle(self, num_cycles: int):
-        # Each cycle is one N/W/S/E combo
-        num_cycles *= 4
-        seen = [frozenset(self.rocks)]
-        offset = None
-        while not offset:
-            for direction in ("N", "W", "S", "E"):
-                self.roll(direction)
-                rock_state = frozenset(self.rocks)
-                if rock_state in seen:
-                    offset = seen.index(rock_state)
-                    break
-                seen.append(rock_state)
-        if num_cycles < offset:
-            return self.score(seen[num_cycles])
-        cycle_length = len(seen) - offset
-        final_state = seen[offset + ((num_cycles - offset) % cycle_length)]
+        # The arrangements soon start repeating, so once one comes round again we can skip all the whole loops.  Only
+        # a hash of each arrangement is kept while looking for that, rather than every arrangement we've seen.
+        final_state = state_at(self.spin, frozenset(self.rocks), num_cycles, key=hash)
         return self.score(final_state)
 
     def score(self, to_score: Optional[FrozenSet[Coord]] = None):
@@ -94,12 +83,37 @@ class Platform:
         return sum(self.max_y - x.y for x in to_score)
 
 
-def main():
-    platform = Platform(read_data())
+@timed_phase("parse")
+def parse(raw_input: str) -> Platform:
+    return Platform(raw_input)
+
+
+@timed_phase("part_one")
+def part_one(platform: Platform) -> int:
+    # Rolling moves the rocks around, so work on a copy with its own set of them
+    platform = copy(platform)
+    platform.reset()
     platform.roll("N")
-    print(f"Part one: {platform.score()}")
+    return platform.score()
+
+
+@timed_phase("part_two")
+def part_two(platform: Platform) -> int:
+    platform = copy(platform)
     platform.reset()
-    print(f"Part two: {platform.spin_cycle(1000000000)}")
+    return platform.spin_cycle(1000000000)
+
+
+def solve(raw_input: str) -> Iterator[int]:
+    platform = parse(raw_input)
+    yield part_one(platform)
+    yield part_two(platform)
+
+
+def main():
+    answers = solve(read_data())
+    print(f"Part one: {next(answers)}")
+    print(f"Part two: {next(answers)}")
 
 
 if __name__ == "__main__":
@@ -1,7 +1,7 @@
 import time
-from typing import Dict
+from typing import Dict, Iterator, List
 
-from utils import read_data
+from utils import read_data, timed_phase
 
 
 def lhash(tohash: str) -> int:
@@ -17,9 +17,18 @@ def score_one(boxnum: int, box: Dict[str, int]) -> int:
     return boxnum * sum(i * v for i, v in enumerate(box.values(), start=1))
 
 
-def main():
-    instructions = read_data().split(",")
-    print(f"Part one: {sum(lhash(x) for x in instructions)}")
+@timed_phase("parse")
+def parse(raw_input: str) -> List[str]:
+    return raw_input.split(",")
+
+
+@timed_phase("part_one")
+def part_one(instructions: List[str]) -> int:
+    return sum(lhash(x) for x in instructions)
+
+
+@timed_phase("part_two")
+def part_two(instructions: List[str]) -> int:
     boxes = [{} for _ in range(256)]
     for instruction in instructions:
         if instruction.endswith("-"):
@@ -27,7 +36,19 @@ def main():
         else:
             label, value = instruction.split("=")
             boxes[lhash(label)][label] = int(value)
-    print(f"Part two: {sum(score_one(i, x) for i, x in enumerate(boxes, start=1))}")
+    return sum(score_one(i, x) for i, x in enumerate(boxes, start=1))
+
+
+def solve(raw_input: str) -> Iterator[int]:
+    instructions = parse(raw_input)
+    yield part_one(instructions)
+    yield part_two(instructions)
+
+
+def main():
+    answers = solve(read_data())
+    print(f"Part one: {next(answers)}")
+    print(f"Part two: {next(answers)}")
 
 
 if __name__ == "__main__":
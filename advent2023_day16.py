@@ -1,7 +1,6 @@
-from collections import defaultdict
-from typing import Dict, Set, Tuple
+from typing import Dict, Iterator, List, Set, Tuple
 
-from utils import read_data, BaseCoord as Coord
+from utils import Grid, bfs, read_data, timed_phase, BaseCoord as Coord
 import time
 
 DIRECTIONS = {"N": Coord(x=0, y=-1), "E": Coord(x=1, y=0), "S": Coord(x=0, y=1), "W": Coord(x=-1, y=0)}
@@ -12,22 +11,24 @@ NEW_DIRECTIONS = {
     "|": {"N": ["N"], "E": ["N", "S"], "S": ["S"], "W": ["N", "S"]},
     ".": {"N": ["N"], "E": ["E"], "S": ["S"], "W": ["W"]},
 }
+# Beam states are cell index * 4 + the heading's position in here
+HEADINGS = "NESW"
 
 
 class MirrorMirror:
     mirrors: Dict[Coord, str]
+    grid: Grid
+    # The states a beam carries on into from each state, leaving out any that would take it off the grid
+    transitions: List[Tuple[int, ...]]
     max_x: int
     max_y: int
 
     def __init__(self, raw_field: str):
-        self.mirrors = {}
-        lines = raw_field.splitlines()
-        for y, line in enumerate(lines):
-            for x, char in enumerate(line):
-                if char != ".":
-                    self.mirrors[Coord(y=y, x=x)] = char
-        self.max_y = len(lines)
-        self.max_x = len(lines[0])
+        self.grid = Grid.from_str(raw_field)
+        self.mirrors = self.grid.cells_of(b".", invert=True)
+        self.max_y = self.grid.height
+        self.max_x = self.grid.width
+        self.transitions = self.build_transitions()
 
     def __str__(self, highlight=None):
         output = []
@@ -39,22 +40,27 @@ class MirrorMirror:
             output.append(line)
         return "\n".join(output)
 
-    def in_bounds(self, coord: Coord) -> bool:
-        return 0 <= coord.x < self.max_x and 0 <= coord.y < self.max_y
+    def build_transitions(self) -> List[Tuple[int, ...]]:
+        transitions = [()] * (len(self.grid.cells) * len(HEADINGS))
+        for cell in self.grid.indices():
+            new_directions = NEW_DIRECTIONS[chr(self.grid[cell])]
+            for heading, name in enumerate(HEADINGS):
+                transitions[cell * 4 + heading] = tuple(
+                    next_cell * 4 + HEADINGS.index(x)
+                    for x in new_directions[name]
+                    if self.grid[next_cell := cell + self.grid.directions[x]] != ord(self.grid.pad_char)
+                )
+        return transitions
 
     def find_activated(self, start: Tuple[Coord, str] = (Coord(0, 0), "E")) -> int:
-        activated_squares: Set[Coord] = set()
-        seen_paths: Dict[Coord, Set[str]] = defaultdict(set)
-        queue = [start]
-        while queue:
-            curloc, curdir = queue.pop()
-            mirror_char = self.mirrors.get(curloc, ".")
-            if curdir in seen_paths[curloc] or not self.in_bounds(curloc):
-                continue
-            seen_paths[curloc].add(curdir)
-            activated_squares.add(curloc)
-            for new_dir in NEW_DIRECTIONS[mirror_char][curdir]:
-                queue.append((curloc + DIRECTIONS[new_dir], new_dir))
+        activated_squares: Set[int] = set()
+
+        def activate(_depth: int, beams: List[int]):
+            activated_squares.update(x >> 2 for x in beams)
+
+        start_loc, start_dir = start
+        start_state = self.grid.pack(start_loc) * 4 + HEADINGS.index(start_dir)
+        bfs([start_state], self.transitions.__getitem__, len(self.transitions), on_level=activate)
         return len(activated_squares)
 
     def align_beam(self) -> int:
@@ -67,10 +73,31 @@ class MirrorMirror:
         return max(self.find_activated(start=x) for x in starts)
 
 
+@timed_phase("parse")
+def parse(raw_input: str) -> MirrorMirror:
+    return MirrorMirror(raw_input)
+
+
+@timed_phase("part_one")
+def part_one(mirrors: MirrorMirror) -> int:
+    return mirrors.find_activated()
+
+
+@timed_phase("part_two")
+def part_two(mirrors: MirrorMirror) -> int:
+    return mirrors.align_beam()
+
+
+def solve(raw_input: str) -> Iterator[int]:
+    mirrors = parse(raw_input)
+    yield part_one(mirrors)
+    yield part_two(mirrors)
+
+
 def main():
-    mirrors = MirrorMirror(read_data())
-    print(f"Part one: {mirrors.find_activated()}")
-    print(f"Part two: {mirrors.align_beam()}")
+    answers = solve(read_data())
+    print(f"Part one: {next(answers)}")
+    print(f"Part two: {next(answers)}")
 
 
 if __name__ == "__main__":
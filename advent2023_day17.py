@@ -1,67 +1,87 @@
-import heapq
 import time
-from itertools import accumulate
-from typing import Dict, Iterator, Tuple
+from typing import Iterator, Tuple
 
-from utils import BaseCoord as Coord
-from utils import read_data
+from utils import Grid, dijkstra, read_data, timed_phase
 
-DIRECTIONS = {"N": Coord(x=0, y=-1), "E": Coord(x=1, y=0), "S": Coord(x=0, y=1), "W": Coord(x=-1, y=0)}
-RIGHT_TURNS = {"N": "E", "E": "S", "S": "W", "W": "N"}
-LEFT_TURNS = {"N": "W", "E": "N", "S": "E", "W": "S"}
-VALID_DIRECTIONS = {"N": {"N", "W", "E"}, "E": {"E", "N", "S"}, "S": {"S", "W", "E"}, "W": {"W", "N", "S"}}
+# Translating the grid with this gives each cell's heat loss as a small int, and OFF_MAP for the padding around it
+OFF_MAP = 255
+DIGIT_VALUES = bytes.maketrans(b"0123456789#", bytes(range(10)) + bytes([OFF_MAP]))
+# Search states are cell index * 2 + axis, where the axis is the way we were last moving.  Since we have to turn,
+# only the axis matters: arriving heading north or south leaves the same moves (east or west) open.
+HORIZONTAL, VERTICAL = 0, 1
 
 
 class HeatMap:
-    map: Dict[Coord, int]
+    grid: Grid
+    heat: bytes
+    # The two headings we can turn to, as index deltas, after moving along each axis
+    turns: Tuple[Tuple[int, int], Tuple[int, int]]
 
     def __init__(self, raw_map):
-        lines = raw_map.splitlines()
-        self.map = {}
-        for y, line in enumerate(lines):
-            for x, char in enumerate(line):
-                self.map[Coord(x=x, y=y)] = int(char)
-        self.max_y = len(lines)
-        self.max_x = len(lines[0])
-
-    def in_bounds(self, coord: Coord) -> bool:
-        return coord.x in range(self.max_x) and coord.y in range(self.max_y)
-
-    def walk_direction(self, coord: Coord, heading: str, min_move: int, max_move: int) -> Iterator[Tuple[Coord, int]]:
-        extra_cost = 0
-        # Need to start at one to accumulate total cost
-        for i in range(1, max_move + 1):
-            coord += DIRECTIONS[heading]
-            if not self.in_bounds(coord):
-                break
-            extra_cost += self.map[coord]
-            # Now that we've accumulated the heat loss, apply the min move setting
-            if i < min_move:
-                continue
-            yield extra_cost, coord
+        self.grid = Grid.from_str(raw_map)
+        self.heat = self.grid.cells.translate(DIGIT_VALUES)
+        directions = self.grid.directions
+        self.turns = ((directions["N"], directions["S"]), (directions["E"], directions["W"]))
+        self.max_y = self.grid.height
+        self.max_x = self.grid.width
+
+    def moves(self, state: int, min_move: int, max_move: int) -> Iterator[Tuple[int, int]]:
+        cell, axis = divmod(state, 2)
+        new_axis = VERTICAL if axis == HORIZONTAL else HORIZONTAL
+        for delta in self.turns[axis]:
+            new_cell = cell
+            extra_cost = 0
+            # Need to start at one to accumulate total cost
+            for i in range(1, max_move + 1):
+                new_cell += delta
+                step_cost = self.heat[new_cell]
+                if step_cost == OFF_MAP:
+                    break
+                extra_cost += step_cost
+                # Now that we've accumulated the heat loss, apply the min move setting
+                if i < min_move:
+                    continue
+                yield new_cell * 2 + new_axis, extra_cost
 
     def find_min_path(self, min_move: int = 0, max_move: int = 3) -> int:
-        # We need to avoid loops
-        seen = set()
-        # cost, curloc, last_dir
-        heap = [(0, Coord(0, 0), "E"), (0, Coord(0, 0), "S")]
-        destination = Coord(y=self.max_y - 1, x=self.max_x - 1)
-        while heap:
-            cost, curloc, last_dir = heapq.heappop(heap)
-            if curloc == destination:
-                return cost
-            if (curloc, last_dir) in seen:
-                continue
-            seen.add((curloc, last_dir))
-            for heading in (RIGHT_TURNS[last_dir], LEFT_TURNS[last_dir]):
-                for extra_cost, new_loc in self.walk_direction(curloc, heading, min_move, max_move):
-                    heapq.heappush(heap, (cost + extra_cost, new_loc, heading))
+        origin = self.grid.pack_yx(0, 0)
+        destination = self.grid.pack_yx(self.max_y - 1, self.max_x - 1)
+        found, heat_loss = dijkstra(
+            (origin * 2 + HORIZONTAL, origin * 2 + VERTICAL),
+            lambda state: self.moves(state, min_move, max_move),
+            len(self.heat) * 2,
+            goal=lambda state: state >> 1 == destination,
+        )
+        if found is None:
+            raise ValueError(f"No path to the bottom right moving between {min_move} and {max_move} at a time")
+        return heat_loss[found]
+
+
+@timed_phase("parse")
+def parse(raw_input: str) -> HeatMap:
+    return HeatMap(raw_input)
+
+
+@timed_phase("part_one")
+def part_one(heatmap: HeatMap) -> int:
+    return heatmap.find_min_path(max_move=3)
+
+
+@timed_phase("part_two")
+def part_two(heatmap: HeatMap) -> int:
+    return heatmap.find_min_path(min_move=4, max_move=10)
+
+
+def solve(raw_input: str) -> Iterator[int]:
+    heatmap = parse(raw_input)
+    yield part_one(heatmap)
+    yield part_two(heatmap)
 
 
 def main():
-    heatmap = HeatMap(read_data())
-    print(f"Part one: {heatmap.find_min_path(max_move=3)}")
-    print(f"Part two: {heatmap.find_min_path(min_move=4, max_move=10)}")
+    answers = solve(read_data())
+    print(f"Part one: {next(answers)}")
+    print(f"Part two: {next(answers)}")
 
 
 if __name__ == "__main__":
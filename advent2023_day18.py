@@ -1,7 +1,7 @@
-from math import prod
-from typing import Set, List, Tuple, Dict
+from itertools import accumulate
+from typing import Iterable, Tuple, Iterator
 
-from utils import read_data, BaseCoord as Coord
+from utils import CoordArray, read_data, timed_phase, BaseCoord as Coord
 import time
 
 
@@ -10,45 +10,61 @@ NUM_DIRECTIONS = {"3": Coord(x=0, y=-1), "0": Coord(x=1, y=0), "1": Coord(x=0, y
 
 
 # Black magic adapted from https://www.101computing.net/the-shoelace-algorithm/
-def shoelace_area(vertices: List[Coord], wall_area: int):
-    num_v = len(vertices)
-    sum1 = sum(vertices[i].x * vertices[(i + 1) % num_v].y for i in range(num_v))
-    sum2 = sum(vertices[i].y * vertices[(i + 1) % num_v].x for i in range(num_v))
-    return abs(sum1 - sum2) // 2 + wall_area // 2 + 1
+def shoelace_area(vertices: CoordArray, wall_area: int):
+    return abs(vertices.shoelace()) // 2 + wall_area // 2 + 1
 
 
 class Trench:
-    vertices: List[Coord]
-    hex_vertices: List[Coord]
+    vertices: CoordArray
+    hex_vertices: CoordArray
     wall_area: int
     hex_wall_area: int
 
     def __init__(self, raw_field: str):
-        self.vertices = []
-        self.hex_vertices = []
-        self.wall_area = self.hex_wall_area = 0
-        curloc = hex_curloc = Coord(0, 0)
+        steps, hex_steps = [], []
         for line in raw_field.splitlines():
             raw_heading, raw_distance, raw_color = line.split()
             # Handle part 1 instructions
-            distance = int(raw_distance)
-            displacement = DIRECTIONS[raw_heading] * distance
-            self.wall_area += distance
-            curloc += displacement
-            self.vertices.append(curloc)
-
+            steps.append(DIRECTIONS[raw_heading] * int(raw_distance))
             # Handle part 2 instructions
-            distance = int(raw_color[2:-2], base=16)
-            displacement = NUM_DIRECTIONS[raw_color[-2]] * distance
-            self.hex_wall_area += distance
-            hex_curloc += displacement
-            self.hex_vertices.append(hex_curloc)
+            hex_steps.append(NUM_DIRECTIONS[raw_color[-2]] * int(raw_color[2:-2], base=16))
+        self.vertices, self.wall_area = self.dig(steps)
+        self.hex_vertices, self.hex_wall_area = self.dig(hex_steps)
+
+    @staticmethod
+    def dig(displacements: Iterable[Coord]) -> Tuple[CoordArray, int]:
+        # Each vertex is the running total of the steps so far, and each step is straight along one axis, so its
+        # length is just its distance from the origin
+        steps = CoordArray.from_coords(displacements)
+        vertices = CoordArray(accumulate(steps.ys), accumulate(steps.xs))
+        return vertices, sum(steps.distances(Coord(0, 0)))
+
+
+@timed_phase("parse")
+def parse(raw_input: str) -> Trench:
+    return Trench(raw_input)
+
+
+@timed_phase("part_one")
+def part_one(trench: Trench) -> int:
+    return shoelace_area(trench.vertices, trench.wall_area)
+
+
+@timed_phase("part_two")
+def part_two(trench: Trench) -> int:
+    return shoelace_area(trench.hex_vertices, trench.hex_wall_area)
+
+
+def solve(raw_input: str) -> Iterator[int]:
+    trench = parse(raw_input)
+    yield part_one(trench)
+    yield part_two(trench)
 
 
 def main():
-    trench = Trench(read_data())
-    print(f"Part one: {shoelace_area(trench.vertices, trench.wall_area)}")
-    print(f"Part two: {shoelace_area(trench.hex_vertices, trench.hex_wall_area)}")
+    answers = solve(read_data())
+    print(f"Part one: {next(answers)}")
+    print(f"Part two: {next(answers)}")
 
 
 if __name__ == "__main__":
@@ -1,10 +1,9 @@
 import re
 import time
 from collections import deque
-from math import prod
-from typing import Dict, List, NamedTuple, Optional, Tuple
+from typing import Dict, Iterator, List, NamedTuple, Optional, Tuple
 
-from utils import read_data
+from utils import Box, read_data, timed_phase
 
 DIGITS = re.compile(r"\d+")
 ATTRS = "xmas"
@@ -25,23 +24,16 @@ class Part(NamedTuple):
         return sum(self)
 
 
-class PartRange(NamedTuple):
-    x: range
-    m: range
-    a: range
-    s: range
+# One range of ratings per attribute, in ATTRS order
+class PartRange(Box):
+    __slots__ = ()
 
     @staticmethod
     def full_range() -> "PartRange":
-        return PartRange(range(1, 4001), range(1, 4001), range(1, 4001), range(1, 4001))
+        return PartRange([range(1, 4001)] * len(ATTRS))
 
     def combinations(self) -> int:
-        return prod(len(x) for x in self)
-
-    def update_attr(self, attr_num: int, new_range: range) -> "PartRange":
-        mutable = list(self)
-        mutable[attr_num] = new_range
-        return PartRange(*mutable)
+        return self.volume()
 
 
 class Rule(NamedTuple):
@@ -56,14 +48,13 @@ class Rule(NamedTuple):
     def matches(self, part: Part) -> bool:
         return part[self.attr] > self.val if self.op == ">" else part[self.attr] < self.val
 
-    def split_range(self, part_range: PartRange) -> Tuple[PartRange, Optional[PartRange]]:
-        if self.val in (rating := part_range[self.attr]):
-            if self.op == ">":
-                original, new = range(rating.start, self.val + 1), range(self.val + 1, rating.stop)
-            else:
-                new, original = range(rating.start, self.val), range(self.val, rating.stop)
-            return part_range.update_attr(self.attr, original), part_range.update_attr(self.attr, new)
-        return part_range, None
+    def split_range(self, part_range: PartRange) -> Tuple[Optional[PartRange], Optional[PartRange]]:
+        # (the part that doesn't match and carries on to the next rule, the part that matches), either of which can
+        # be None if nothing's in it
+        if self.op == ">":
+            return part_range.split(self.attr, self.val + 1)
+        new, original = part_range.split(self.attr, self.val)
+        return original, new
 
 
 class Workflow:
@@ -95,6 +86,8 @@ class Workflow:
                     pass
                 else:
                     new_map.append((new_range, dest))
+            if not to_split:
+                return new_map, accepted_ranges
         if self.default == "A":
             accepted_ranges.append(to_split)
         elif self.default == "R":
@@ -128,12 +121,34 @@ class System:
         return sum(x.combinations() for x in accepted_ranges)
 
 
+@timed_phase("parse")
+def parse(raw_input: str) -> Tuple[System, List[Part]]:
+    raw_workflows, raw_parts = raw_input.split("\n\n")
+    return System(raw_workflows), [Part.from_str(x) for x in raw_parts.splitlines()]
+
+
+@timed_phase("part_one")
+def part_one(puzzle: Tuple[System, List[Part]]) -> int:
+    system, parts = puzzle
+    return sum(x.value() for x in parts if system.is_accepted(x))
+
+
+@timed_phase("part_two")
+def part_two(puzzle: Tuple[System, List[Part]]) -> int:
+    system, _ = puzzle
+    return system.all_accepted()
+
+
+def solve(raw_input: str) -> Iterator[int]:
+    puzzle = parse(raw_input)
+    yield part_one(puzzle)
+    yield part_two(puzzle)
+
+
 def main():
-    raw_workflows, raw_parts = read_data().split("\n\n")
-    system = System(raw_workflows)
-    parts = [Part.from_str(x) for x in raw_parts.splitlines()]
-    print(f"Part one: {sum(x.value() for x in parts if system.is_accepted(x))}")
-    print(f"Part two: {system.all_accepted()}")
+    answers = solve(read_data())
+    print(f"Part one: {next(answers)}")
+    print(f"Part two: {next(answers)}")
 
 
 if __name__ == "__main__":
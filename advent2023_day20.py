@@ -1,12 +1,15 @@
 import time
 from collections import deque
+from copy import copy, deepcopy
 from math import lcm, prod
-from typing import Dict, List, Optional, Tuple, Union
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple, Union
 
-from utils import read_data
+from utils import Graph, read_data, timed_phase
 
 
 class Module:
+    # There's one of these per module and a copy of them all per part, so they skip the per-instance __dict__
+    __slots__ = ("name", "outputs")
     name: str
     outputs: List[str]
 
@@ -23,14 +26,19 @@ class Module:
         else:
             return Module(line)
 
-    def handle_pulse(self, pulse_from: str, val: int) -> Optional[int]:
+    def handle_pulse(self, pulse_from: int, val: int) -> Optional[int]:
         return val
 
 
 class FlipFlopModule(Module):
-    state: bool = False
+    __slots__ = ("state",)
+    state: bool
 
-    def handle_pulse(self, pulse_from: str, val: bool) -> Optional[bool]:
+    def __init__(self, line: str):
+        super().__init__(line)
+        self.state = False
+
+    def handle_pulse(self, pulse_from: int, val: bool) -> Optional[bool]:
         if val:
             return None
         self.state = not self.state
@@ -38,32 +46,57 @@ class FlipFlopModule(Module):
 
 
 class ConjunctionModule(Module):
-    inputs: Dict[str, bool]
+    __slots__ = ("inputs",)
+    inputs: Dict[int, bool]
 
-    def set_inputs(self, inputs: List[str]):
+    def set_inputs(self, inputs: Iterable[int]):
         self.inputs = {x: False for x in inputs}
 
-    def handle_pulse(self, pulse_from: str, val: bool) -> Optional[bool]:
+    def handle_pulse(self, pulse_from: int, val: bool) -> Optional[bool]:
         self.inputs[pulse_from] = val
         return not all(self.inputs.values())
 
 
+# A pulse from the button rather than from another module
+BUTTON = -1
+
+
 class Machine:
-    modules: Dict[str, Union[Module, FlipFlopModule, ConjunctionModule]]
-    rx_input: str
+    # Indexed by node id in wiring; outputs with no module of their own (like rx) are None
+    modules: List[Optional[Union[Module, FlipFlopModule, ConjunctionModule]]]
+    wiring: Graph
+    # Each node's outputs that are modules, i.e. the ones a pulse has to be delivered to
+    receivers: List[Tuple[int, ...]]
+    broadcaster: int
+    rx_input: int
     times_pushed: int = 0
-    input_cycles: Dict[str, int]
+    input_cycles: Dict[int, int]
 
     def __init__(self, raw_modules: str):
-        self.modules = {(m := Module.from_str(x)).name: m for x in raw_modules.splitlines()}
-        for name, module in self.modules.items():
+        by_name = {(m := Module.from_str(x)).name: m for x in raw_modules.splitlines()}
+        self.wiring = Graph.from_edges(((x.name, y) for x in by_name.values() for y in x.outputs), nodes=by_name)
+        self.modules = [by_name.get(x) for x in self.wiring.names]
+        self.receivers = [
+            tuple(x for x in self.wiring.neighbors(i) if self.modules[x] is not None) for i in range(len(self.modules))
+        ]
+        inputs = self.wiring.reverse()
+        for i, module in enumerate(self.modules):
             if isinstance(module, ConjunctionModule):
-                module.set_inputs([x for x in self.modules if name in self.modules[x].outputs])
-        self.rx_input = next(x for x in self.modules if "rx" in self.modules[x].outputs)
+                module.set_inputs(inputs.neighbors(i))
+        self.broadcaster = self.wiring.node_id("broadcaster")
+        self.rx_input = inputs.neighbors(self.wiring.node_id("rx"))[0]
         self.input_cycles = {x: 0 for x in self.modules[self.rx_input].inputs}
 
+    def copy(self) -> "Machine":
+        # The wiring never changes, so only the modules' state needs copying
+        new = copy(self)
+        new.modules = deepcopy(self.modules)
+        new.input_cycles = dict(self.input_cycles)
+        return new
+
     def _push_button(self) -> Tuple[int, int]:
-        pulses = deque([("button", "broadcaster", False)])
+        modules, offsets, receivers = self.modules, self.wiring.offsets, self.receivers
+        pulses = deque([(BUTTON, self.broadcaster, False)])
         counts = [1, 0]  # one low signal sent and no high signals
         self.times_pushed += 1
         while pulses:
@@ -71,10 +104,10 @@ class Machine:
             # If it's a high pulse coming from one of our upstream inputs and we haven't already found its cycle
             if val and self.input_cycles.get(source, None) == 0:
                 self.input_cycles[source] = self.times_pushed
-            new_pulse_val = self.modules[dest].handle_pulse(source, val)
+            new_pulse_val = modules[dest].handle_pulse(source, val)
             if new_pulse_val is not None:
-                counts[new_pulse_val] += len(self.modules[dest].outputs)
-                pulses.extend((dest, x, new_pulse_val) for x in self.modules[dest].outputs if x in self.modules)
+                counts[new_pulse_val] += offsets[dest + 1] - offsets[dest]
+                pulses.extend((dest, x, new_pulse_val) for x in receivers[dest])
         # return low_count, high_count
         return counts[0], counts[1]
 
@@ -91,11 +124,32 @@ class Machine:
         return lcm(*self.input_cycles.values())
 
 
+@timed_phase("parse")
+def parse(raw_input: str) -> Machine:
+    return Machine(raw_input)
+
+
+@timed_phase("part_one")
+def part_one(machine: Machine) -> int:
+    # Pushing the button changes the modules' state, so each part pushes a fresh copy's
+    return prod(machine.copy().push_button(1000))
+
+
+@timed_phase("part_two")
+def part_two(machine: Machine) -> int:
+    return machine.copy().activate_rx()
+
+
+def solve(raw_input: str) -> Iterator[int]:
+    machine = parse(raw_input)
+    yield part_one(machine)
+    yield part_two(machine)
+
+
 def main():
-    machine = Machine(read_data())
-    print(f"Part one: {prod(machine.push_button(1000))}")
-    machine = Machine(read_data())
-    print(f"Part two: {machine.activate_rx()}")
+    answers = solve(read_data())
+    print(f"Part one: {next(answers)}")
+    print(f"Part two: {next(answers)}")
 
 
 if __name__ == "__main__":
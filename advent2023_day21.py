@@ -1,8 +1,8 @@
 import time
-from typing import List, Optional, Set, Tuple
+from typing import Iterator, List
 
 from utils import BaseCoord as Coord
-from utils import read_data
+from utils import Grid, bfs, char_mask, read_data, timed_phase
 
 
 # Adapted from https://pythonhint.com/post/1131993020348204/lagrange-interpolation-in-python
@@ -24,54 +24,83 @@ def lagrange_interpolation(data_points: List[int], multiple) -> int:
 
 
 class Garden:
-    walls: Set[Coord]
+    rows: List[bytes]
     start_loc: Coord
     max_x: int
     max_y: int
 
     def __init__(self, raw_garden: str):
-        self.walls = set()
-        lines = raw_garden.splitlines()
-        for y, line in enumerate(lines):
-            for x, char in enumerate(line):
-                if char == "#":
-                    self.walls.add(Coord(x=x, y=y))
-                elif char == "S":
-                    self.start_loc = Coord(x=x, y=y)
-        self.max_y = len(lines)
-        self.max_x = len(lines[0])
-
-    def point_valid(self, coord: Coord) -> bool:
-        return not (coord.y % self.max_y, coord.x % self.max_x) in self.walls
-
-    def points_of_interest(
-        self, steps: List[int], start: int = 0, state: Optional[Set[Coord]] = None
-    ) -> Tuple[List[int], Set[Coord]]:
+        grid = Grid.from_str(raw_garden, margin=0)
+        self.rows = raw_garden.encode().splitlines()
+        self.start_loc = grid.unpack(grid.find(b"S"))
+        self.max_y = grid.height
+        self.max_x = grid.width
+
+    def tiled(self, radius: int) -> Grid:
+        # The (endlessly repeating) garden, far enough out in every direction that nothing within radius steps of the
+        # start falls off the edge.  The margin is the rest of the plane, and the border past it is all wall.
+        grid = Grid(self.max_x, self.max_y, margin=radius + 1)
+        copies = -(-grid.stride // self.max_x) + 1
+        offset, width = -radius % self.max_x, grid.stride - 2
+        for y in range(-radius, self.max_y + radius):
+            row_start = grid.pack_yx(y, -radius)
+            grid.cells[row_start : row_start + width] = (self.rows[y % self.max_y] * copies)[offset : offset + width]
+        return grid
+
+    def points_of_interest(self, steps: List[int]) -> List[int]:
+        # Every cell reached in n steps can also be reached in n + 2 (step off and back), so the plots reachable in
+        # exactly n steps are every one first reached at a depth with n's parity and no deeper than n
+        last_step = max(steps)
+        grid = self.tiled(last_step)
+        open_cells = grid.cells.translate(char_mask(b"#", invert=True))
+        deltas = grid.cardinal_deltas
         values = []
-        state = state if state else {self.start_loc}
-        for i in range(start, max(steps) + 1):
-            if i in steps:
-                values.append(len(state))
-            new_state = set()
-            for loc in state:
-                new_state |= {x for x in loc.cardinal_neighbors() if self.point_valid(x)}
-            state = new_state
-        return values, state
+        reached = [0, 0]
 
+        def neighbors(cell: int) -> Iterator[int]:
+            return (cell + x for x in deltas if open_cells[cell + x])
 
-def main():
-    garden = Garden(read_data())
-    part_one, state = garden.points_of_interest([64])
-    print(f"Part one: {part_one[0]}")
+        def count_level(depth: int, frontier: List[int]) -> bool:
+            reached[depth % 2] += len(frontier)
+            if depth in steps:
+                values.append(reached[depth % 2])
+            return depth == last_step
+
+        bfs([grid.pack(self.start_loc)], neighbors, len(grid.cells), on_level=count_level)
+        return values
+
+
+@timed_phase("parse")
+def parse(raw_input: str) -> Garden:
+    return Garden(raw_input)
+
+
+@timed_phase("part_one")
+def part_one(garden: Garden) -> int:
+    return garden.points_of_interest([64])[0]
+
+
+@timed_phase("part_two")
+def part_two(garden: Garden) -> int:
     # For part two, we start in the middle of the board, and there are 65 squares to the edge
     # The board then repeats every 131 squares, so we want to sample at the beginning of our first three repeats
-    part_two, _ = garden.points_of_interest(
-        [garden.start_loc.x + (n * garden.max_x) for n in range(3)], start=65, state=state
-    )
+    counts = garden.points_of_interest([garden.start_loc.x + (n * garden.max_x) for n in range(3)])
     # The input is a square, and the given number of steps places us exactly at a boundary evenly divisible by
     # our repeat width (131 squares) after going to the first edge
     cycles = (26501365 - garden.start_loc.x) // garden.max_x
-    print(f"Part two: {lagrange_interpolation(part_two, cycles)}")
+    return lagrange_interpolation(counts, cycles)
+
+
+def solve(raw_input: str) -> Iterator[int]:
+    garden = parse(raw_input)
+    yield part_one(garden)
+    yield part_two(garden)
+
+
+def main():
+    answers = solve(read_data())
+    print(f"Part one: {next(answers)}")
+    print(f"Part two: {next(answers)}")
 
 
 if __name__ == "__main__":
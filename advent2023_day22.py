@@ -1,35 +1,46 @@
 import time
 from collections import defaultdict
-from typing import Dict, List, NamedTuple, Set, Tuple
+from itertools import product
+from typing import Dict, Iterator, Set, Tuple
 
-from utils import read_data
+from utils import Box, cached_parse, read_data, timed_phase
 
 
-class Brick(NamedTuple):
-    x: range
-    y: range
-    z: range
+X, Y, Z = range(3)
+
+
+class Brick(Box):
+    __slots__ = ()
+
+    @property
+    def x(self) -> range:
+        return self[X]
+
+    @property
+    def y(self) -> range:
+        return self[Y]
+
+    @property
+    def z(self) -> range:
+        return self[Z]
 
     @staticmethod
     def from_line(line: str) -> "Brick":
         raw_starts, raw_ends = line.split("~")
         starts = [int(x) for x in raw_starts.split(",")]
         ends = [int(x) for x in raw_ends.split(",")]
-        return Brick(*(range(starts[i], ends[i] + 1) for i in range(3)))
-
-    def overlap_xy(self, other: "Brick"):
-        x_overlap = range(max(self.x.start, other.x.start), min(self.x.stop, other.x.stop))
-        y_overlap = range(max(self.y.start, other.y.start), min(self.y.stop, other.y.stop))
-        return bool(x_overlap) and bool(y_overlap)
-
-    def overlapping_bricks(self, other_bricks: Dict["Brick", Set["Brick"]]) -> List["Brick"]:
-        return sorted((x for x in other_bricks if self.overlap_xy(x)), key=lambda x: x.z.stop, reverse=True)
-
-    def fall(self, fallen_bricks: Dict["Brick", Set["Brick"]]) -> Tuple["Brick", Set["Brick"]]:
-        overlapping_bricks = self.overlapping_bricks(fallen_bricks)
-        fall_distance = self.z.start - (overlapping_bricks[0].z.stop if overlapping_bricks else 1)
-        fallen_brick = Brick(x=self.x, y=self.y, z=range(self.z.start - fall_distance, self.z.stop - fall_distance))
-        resting_on = {x for x in overlapping_bricks if x.z.stop == overlapping_bricks[0].z.stop}
+        return Brick(range(starts[i], ends[i] + 1) for i in range(3))
+
+    def footprint(self) -> Iterator[Tuple[int, int]]:
+        return product(self.x, self.y)
+
+    def fall(self, tops: Dict[Tuple[int, int], "Brick"]) -> Tuple["Brick", Set["Brick"]]:
+        # tops is the highest fallen brick over each (x, y) so far, which are the only ones this one can land on, so
+        # there's no need to look at every brick that's already fallen
+        below = [tops[x] for x in self.footprint() if x in tops]
+        floor = max((x.z.stop for x in below), default=1)
+        fallen_brick = self.shift(Z, floor - self.z.start)
+        resting_on = {x for x in below if x.z.stop == floor}
         return fallen_brick, resting_on
 
 
@@ -50,15 +61,18 @@ class Cascade:
 
     def fall(self):
         new_bricks = {}
+        tops: Dict[Tuple[int, int], Brick] = {}
         # self.bricks should already be sorted by which ones need to fall first
         for brick in self.bricks:
-            new_brick, resting_on = brick.fall(new_bricks)
+            new_brick, resting_on = brick.fall(tops)
             new_bricks[new_brick] = resting_on
+            tops.update((x, new_brick) for x in new_brick.footprint())
         self.bricks = new_bricks
 
     def expendable_bricks(self):
-        expendable_bricks = [k for k in self.bricks if not any(x == {k} for x in self.bricks.values())]
-        return len(expendable_bricks)
+        # Anything that's the only thing holding up some other brick has to stay
+        sole_supports = {next(iter(x)) for x in self.bricks.values() if len(x) == 1}
+        return len(self.bricks) - len(sole_supports)
 
     def get_chain(self, brick: Brick) -> int:
         eliminated_bricks = {brick}
@@ -72,10 +86,31 @@ class Cascade:
         return len(eliminated_bricks - {brick})
 
 
+@timed_phase("parse")
+def parse(raw_input: str) -> Cascade:
+    return cached_parse(Cascade, raw_input)
+
+
+@timed_phase("part_one")
+def part_one(cascade: Cascade) -> int:
+    return cascade.expendable_bricks()
+
+
+@timed_phase("part_two")
+def part_two(cascade: Cascade) -> int:
+    return sum(cascade.get_chain(x) for x in cascade.bricks)
+
+
+def solve(raw_input: str) -> Iterator[int]:
+    cascade = parse(raw_input)
+    yield part_one(cascade)
+    yield part_two(cascade)
+
+
 def main():
-    cascade = Cascade(read_data())
-    print(f"Part one: {cascade.expendable_bricks()}")
-    print(f"Part two: {sum(cascade.get_chain(x) for x in cascade.bricks)}")
+    answers = solve(read_data())
+    print(f"Part one: {next(answers)}")
+    print(f"Part two: {next(answers)}")
 
 
 if __name__ == "__main__":
@@ -1,12 +1,17 @@
 import time
-from typing import Dict, FrozenSet, Iterable, NamedTuple, Optional, Set, Tuple
+from copy import copy
+from typing import Dict, Iterable, Iterator, List, NamedTuple, Optional, Set, Tuple
 
 from utils import BaseCoord as Coord
-from utils import read_data
+from utils import Graph, Grid, Search, cached_parse, content_hash, read_data, source_bytes, timed_phase
 
 DIRS: Dict[str, Coord] = {"N": Coord(x=0, y=-1), "E": Coord(x=1, y=0), "S": Coord(x=0, y=1), "W": Coord(x=-1, y=0)}
 RIGHT: Dict[str, str] = {"N": "E", "E": "S", "S": "W", "W": "N"}
 LEFT: Dict[str, str] = {"N": "W", "E": "N", "S": "E", "W": "S"}
+WALL = ord("#")
+# The longest-path DFS gets split into one independent search per path of this many steps from the start, which are
+# the pieces its progress reports and checkpoints count
+SPLIT_DEPTH = 10
 
 
 class Segment(NamedTuple):
@@ -16,6 +21,7 @@ class Segment(NamedTuple):
 
 
 class Node:
+    __slots__ = ("coord", "connections", "distances")
     coord: Coord
     connections: Dict[str, Optional[Coord]]
     distances: Dict[Coord, int]
@@ -44,7 +50,9 @@ class Node:
 
 
 class Hike:
-    walls: Set[Coord]
+    # Most of the map is walls, so they're looked up in the grid rather than kept as a set of Coords, whose
+    # allocation (and the garbage collection passes it sets off) grows faster than the map does
+    grid: Grid
     slopes: Dict[Coord, str]
     start: Coord
     end: Coord
@@ -54,21 +62,14 @@ class Hike:
     nodes: Dict[Coord, Node]
 
     def __init__(self, raw_hike: str):
-        self.walls = set()
-        self.slopes = {}
-        lines = raw_hike.splitlines()
-        self.max_y = len(lines)
-        self.max_x = len(lines[0])
-        for y, line in enumerate(lines):
-            for x, char in enumerate(line):
-                if char == "#":
-                    self.walls.add(Coord(x=x, y=y))
-                elif char in ("^", ">", "v", "<"):
-                    self.slopes[Coord(x=x, y=y)] = char
-                elif char == "." and y == 0:
-                    self.start = Coord(x=x, y=y)
-                elif char == "." and y == len(lines) - 1:
-                    self.end = Coord(x=x, y=y)
+        grid = Grid.from_str(raw_hike)
+        self.max_y = grid.height
+        self.max_x = grid.width
+        self.grid = grid
+        self.slopes = grid.cells_of(b"^>v<")
+        # The only open cells on the top and bottom rows are the start and the end
+        self.start = grid.unpack(grid.find(b"."))
+        self.end = grid.unpack(grid.cells.rfind(b"."))
         self.build_nodes()
 
     def __str__(self, highlight: Optional[Set[Coord]] = None):
@@ -79,7 +80,7 @@ class Hike:
             for x in range(self.max_x):
                 if (y, x) in highlight:
                     line.append("X")
-                elif (y, x) in self.walls:
+                elif self.is_wall(Coord(y, x)):
                     line.append("#")
                 elif (y, x) in self.slopes:
                     line.append(self.slopes[Coord(y, x)])
@@ -88,6 +89,10 @@ class Hike:
             output.append("".join(line))
         return "\n".join(output)
 
+    def is_wall(self, coord: Coord) -> bool:
+        # The grid's padding is walls too, so this is safe one step past the edge
+        return self.grid.get(coord) == WALL
+
     def follow_segment(self, start_loc: Coord, start_dir: str) -> Tuple[Coord, int, str]:
         curloc = start_loc
         curdir = start_dir
@@ -98,8 +103,8 @@ class Hike:
             if newloc == self.end:
                 return newloc, curlength, curdir
             # Turn left or right when you hit a wall.  Given our input, only one is valid
-            if newloc in self.walls:
-                if any(newdir := x for x in (RIGHT[curdir], LEFT[curdir]) if curloc + DIRS[x] not in self.walls):
+            if self.is_wall(newloc):
+                if any(newdir := x for x in (RIGHT[curdir], LEFT[curdir]) if not self.is_wall(curloc + DIRS[x])):
                     curdir = newdir
                     continue
                 else:
@@ -120,34 +125,94 @@ class Hike:
             curloc = queue.pop()
             for heading in self.nodes.setdefault(curloc, Node(curloc)).remaining_dirs():
                 newloc = curloc + DIRS[heading]
-                if newloc.y in range(self.max_y) and newloc not in self.walls:
+                if newloc.y in range(self.max_y) and not self.is_wall(newloc):
                     end, length, end_dir = self.follow_segment(newloc, heading)
                     self.nodes.setdefault(curloc, Node(curloc)).add_connection(heading, end, length)
                     self.nodes.setdefault(end, Node(end)).add_connection(RIGHT[RIGHT[heading]], curloc, length)
                     queue.append(end)
 
-    def _max_node_distance(self, coord: Coord, curlength: int, seen: FrozenSet[Coord]) -> int:
-        if coord == self.end:
+    def build_graph(self) -> Graph:
+        # The nodes as a weighted graph using only the exits we're currently allowed to take
+        edges = (
+            (coord, other, seg_length)
+            for coord, node in self.nodes.items()
+            for other, seg_length in node.connection_lengths(self.valid_exits).items()
+        )
+        return Graph.from_edges(edges, nodes=self.nodes)
+
+    def _max_node_distance(
+        self, adjacency: List[Tuple[Tuple[int, int], ...]], node: int, end: int, curlength: int, seen: int
+    ) -> int:
+        # seen is a bitmask of node ids, which is far cheaper to extend and test than a frozenset of Coords
+        if node == end:
             return curlength
         longest = 0
-        for other, seg_length in self.nodes[coord].connection_lengths(self.valid_exits).items():
-            if other in seen:
+        seen |= 1 << node
+        for other, seg_length in adjacency[node]:
+            if seen >> other & 1:
                 continue
-            longest = max(longest, self._max_node_distance(other, curlength + seg_length + 1, seen | {coord}))
+            longest = max(longest, self._max_node_distance(adjacency, other, end, curlength + seg_length + 1, seen))
         return longest
 
+    def _paths_from(
+        self, adjacency: List[Tuple[Tuple[int, int], ...]], node: int, end: int, curlength: int, seen: int, depth: int
+    ) -> Iterator[Tuple[int, int, int]]:
+        # Every path of depth steps from node (or fewer, if it gets to the end first), as the arguments to carry on
+        # from it with in _max_node_distance()
+        if depth == 0 or node == end:
+            yield node, curlength, seen
+            return
+        seen |= 1 << node
+        for other, seg_length in adjacency[node]:
+            if not seen >> other & 1:
+                yield from self._paths_from(adjacency, other, end, curlength + seg_length + 1, seen, depth - 1)
+
     def max_node_distance(self) -> int:
-        return self._max_node_distance(self.start, 0, frozenset())
+        graph = self.build_graph()
+        start, end = graph.node_id(self.start), graph.node_id(self.end)
+        adjacency = graph.adjacency()
+        paths = list(self._paths_from(adjacency, start, end, 0, 0, SPLIT_DEPTH))
+        key = content_hash(source_bytes(__name__), repr((adjacency, start, end)).encode())
+        search = Search("day23_longest_hike", key, total=len(paths))
+        longest = search.best or 0
+        for node, curlength, seen in search.remaining(paths):
+            longest = max(longest, self._max_node_distance(adjacency, node, end, curlength, seen))
+            search.advance(best=longest)
+        search.finish()
+        return longest
 
     def ignore_slopes(self):
         self.valid_exits = ("N", "E", "S", "W")
 
 
-def main():
-    hike = Hike(read_data())
-    print(f"Part one: {hike.max_node_distance()}")
+@timed_phase("parse")
+def parse(raw_input: str) -> Hike:
+    return cached_parse(Hike, raw_input)
+
+
+@timed_phase("part_one")
+def part_one(hike: Hike) -> int:
+    return hike.max_node_distance()
+
+
+@timed_phase("part_two")
+def part_two(hike: Hike) -> int:
+    # ignore_slopes() only swaps out which exits are allowed, so a shallow copy leaves the parsed hike as it was
+    hike = copy(hike)
     hike.ignore_slopes()
-    print(f"Part two: {hike.max_node_distance()}")
+    return hike.max_node_distance()
+
+
+def solve(raw_input: str) -> Iterator[int]:
+    hike = parse(raw_input)
+    yield part_one(hike)
+    yield part_two(hike)
+
+
+def main():
+    answers = solve(read_data())
+    print(f"Part one: {next(answers)}")
+    print(f"Part two: {next(answers)}")
 
 
 if __name__ == "__main__":
@@ -2,11 +2,11 @@ import re
 import sys
 import time
 from itertools import combinations
-from typing import Iterable, List, NamedTuple, Optional
+from typing import Iterable, Iterator, List, NamedTuple, Optional
 
 from utils import BaseCoord
 from utils import BaseCoord3D as Coord3D
-from utils import read_data
+from utils import CoordArray, Search, content_hash, read_data, source_bytes, timed_phase
 
 DIGITS = re.compile(r"[0-9-]+")
 TEST_RANGE = range(7, 27 + 1)
@@ -14,6 +14,8 @@ REAL_RANGE = range(200_000_000_000_000, 400_000_000_000_000 + 1)
 
 
 class Coord(BaseCoord):
+    __slots__ = ()
+
     def in_range(self, to_check: range) -> bool:
         return self.x in to_check and self.y in to_check
 
@@ -53,6 +55,29 @@ class Hailstone2D(NamedTuple):
 
         return Coord(x=x, y=y)
 
+    def count_intersections(self, positions: CoordArray, velocities: CoordArray, to_check: range) -> int:
+        # intersection() (without dv) against a whole batch of other hailstones, counting the ones that land inside
+        # to_check.  The determinants are worked out a column at a time instead of building Coords for every pair.
+        divs = velocities.cross(self.vel)
+        self_d = self.pos.y * self.vel.x - self.pos.x * self.vel.y
+        other_ds = positions.cross(positions - velocities)
+        count = 0
+        for div, other_d, pos_y, pos_x, vel_y, vel_x in zip(
+            divs, other_ds, positions.ys, positions.xs, velocities.ys, velocities.xs
+        ):
+            if div == 0:
+                continue
+            # The divisor comes out negated from cross(), so the numerators are too
+            x = int((other_d * self.vel.x - self_d * vel_x) / div)
+            y = int((other_d * self.vel.y - self_d * vel_y) / div)
+            # Both hailstones have to be heading towards the intersection rather than away from it
+            if (x >= self.pos.x) != (self.vel.x >= 0) or (y >= self.pos.y) != (self.vel.y >= 0):
+                continue
+            if (x >= pos_x) != (vel_x >= 0) or (y >= pos_y) != (vel_y >= 0):
+                continue
+            count += x in to_check and y in to_check
+        return count
+
 
 class Hailstone3D(NamedTuple):
     pos: Coord3D
@@ -84,10 +109,13 @@ class Storm:
         self.hail_xz = [x.demote("xz") for x in self.hailstones]
 
     def collisions_in_box(self) -> int:
-        # Count the number of intersections that are in the correct range
+        # Count the number of intersections that are in the correct range, checking each hailstone against every
+        # later one in a single batch
+        positions = CoordArray.from_coords(x.pos for x in self.hail_xy)
+        velocities = CoordArray.from_coords(x.vel for x in self.hail_xy)
         return sum(
-            bool(inter := i.intersection(j)) and inter.in_range(self.part_one_range)
-            for i, j in combinations(self.hail_xy, 2)
+            stone.count_intersections(positions[i + 1 :], velocities[i + 1 :], self.part_one_range)
+            for i, stone in enumerate(self.hail_xy)
         )
 
     @staticmethod
@@ -116,19 +144,45 @@ class Storm:
         return first if all(x is None or x == first for x in all_intersections) else None
 
     def find_rock_origin(self) -> Coord3D:
-        for rock_xy in self.xy_coords():
+        # Each xy velocity tried is one piece of the search, so a checkpoint is just how far along the spiral it got
+        key = content_hash(source_bytes(__name__), repr((self.hail_xy[:10], self.hail_xz[:10])).encode())
+        search = Search("day24_rock_velocity", key)
+        for rock_xy in search.remaining(self.xy_coords()):
             xy_intersection = self.check_candidate_velocity(self.hail_xy[:10], rock_xy)
             if xy_intersection:
                 for z in self.z_vals():
                     xz_intersection = self.check_candidate_velocity(self.hail_xz[:10], Coord(x=rock_xy.x, y=z))
                     if xz_intersection:
+                        search.finish()
                         return Coord3D(x=xy_intersection.x, y=xy_intersection.y, z=xz_intersection.y)
+            search.advance()
+
+
+@timed_phase("parse")
+def parse(raw_input: str) -> Storm:
+    return Storm(raw_input)
+
+
+@timed_phase("part_one")
+def part_one(storm: Storm) -> int:
+    return storm.collisions_in_box()
+
+
+@timed_phase("part_two")
+def part_two(storm: Storm) -> int:
+    return sum(storm.find_rock_origin())
+
+
+def solve(raw_input: str) -> Iterator[int]:
+    storm = parse(raw_input)
+    yield part_one(storm)
+    yield part_two(storm)
 
 
 def main():
-    storm = Storm(read_data())
-    print(f"Part one: {storm.collisions_in_box()}")
-    print(f"Part two: {sum(storm.find_rock_origin())}")
+    answers = solve(read_data())
+    print(f"Part one: {next(answers)}")
+    print(f"Part two: {next(answers)}")
 
 
 if __name__ == "__main__":
@@ -1,7 +1,7 @@
-from collections import defaultdict
-from typing import Dict, Set
+from heapq import heapify, heappop, heappush
+from typing import Iterator, List, Set
 
-from utils import read_data
+from utils import Graph, read_data, timed_phase
 import time
 import re
 
@@ -9,31 +9,63 @@ LETTERS = re.compile(r'[a-z]+')
 
 
 class Components:
-    connections: Dict[str, Set[str]]
-    in_group: Set[str]
+    # Undirected, so every wire is an edge in both directions
+    connections: Graph
+    in_group: Set[int]
+    external: List[int]
 
     def __init__(self, raw_connections: str):
-        self.connections = defaultdict(set)
+        edges = []
         for line in raw_connections.splitlines():
             key, *values = LETTERS.findall(line)
-            self.connections[key] |= set(values)
-            for value in values:
-                self.connections[value].add(key)
-        self.in_group = set(self.connections)
+            edges += ((key, value) for value in values)
+            edges += ((value, key) for value in values)
+        self.connections = Graph.from_edges(edges)
+        self.in_group = set(range(len(self.connections)))
+        # How many of each node's connections lead out of the group, kept up to date as nodes leave it
+        self.external = [0] * len(self.connections)
         self.split()
 
-    def external_connections(self, node: str):
-        return len(self.connections[node] - self.in_group)
+    def leave_group(self, node: int):
+        self.in_group.remove(node)
+        for other in self.connections.neighbors(node):
+            self.external[other] += 1
 
     def split(self):
-        while sum(self.external_connections(x) for x in self.in_group) != 3:
-            most_connected_node = max(self.in_group, key=self.external_connections)
-            self.in_group.remove(most_connected_node)
+        # Keeps a running count of the wires leaving the group, and a max-heap of each node's external count for
+        # picking the next one to leave.  Counts only go up, so a heap entry is stale once its count no longer matches.
+        crossing = 0
+        candidates = [(0, x) for x in self.in_group]
+        heapify(candidates)
+        while crossing != 3:
+            count, node = heappop(candidates)
+            if node not in self.in_group or -count != self.external[node]:
+                continue
+            crossing += self.connections.degree(node) - 2 * self.external[node]
+            self.leave_group(node)
+            for other in self.connections.neighbors(node):
+                if other in self.in_group:
+                    heappush(candidates, (-self.external[other], other))
+
+
+@timed_phase("parse")
+def parse(raw_input: str) -> Components:
+    return Components(raw_input)
+
+
+@timed_phase("part_one")
+def part_one(components: Components) -> int:
+    return len(components.in_group) * (len(components.connections) - len(components.in_group))
+
+
+def solve(raw_input: str) -> Iterator[int]:
+    components = parse(raw_input)
+    yield part_one(components)
 
 
 def main():
-    components = Components(read_data())
-    print(f"Part one: {len(components.in_group) * (len(components.connections) - len(components.in_group))}")
+    answers = solve(read_data())
+    print(f"Part one: {next(answers)}")
 
 
 if __name__ == '__main__':
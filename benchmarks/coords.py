@@ -0,0 +1,96 @@
+import argparse
+import timeit
+from typing import Callable, List, Tuple
+
+from utils import BaseCoord as Coord
+from utils import BaseCoord3D as Coord3D
+from utils import PackedCoords, PackedCoords3D
+
+# Micro-benchmarks for BaseCoord/BaseCoord3D against their packed-int equivalents from utils.PackedCoords.
+# Run from the repo root: python -m benchmarks.coords
+
+SIZE = 141
+
+
+def flood(start, neighbors: Callable, in_bounds: Callable) -> int:
+    # Plain BFS over an empty SIZE x SIZE board, the shape of the inner loop in days 10, 21 and 23
+    seen = {start}
+    frontier = [start]
+    while frontier:
+        new_frontier = []
+        for loc in frontier:
+            for neighbor in neighbors(loc):
+                if neighbor not in seen and in_bounds(neighbor):
+                    seen.add(neighbor)
+                    new_frontier.append(neighbor)
+        frontier = new_frontier
+    return len(seen)
+
+
+def cases(number: int) -> List[Tuple[str, Callable, Callable]]:
+    space = PackedCoords(SIZE, SIZE)
+    space_3d = PackedCoords3D(SIZE, SIZE, SIZE)
+    coords = [Coord(y=i % SIZE, x=(i * 7) % SIZE) for i in range(number)]
+    packed = [space.pack(x) for x in coords]
+    coords_3d = [Coord3D(y=i % SIZE, x=(i * 7) % SIZE, z=(i * 3) % SIZE) for i in range(number)]
+    packed_3d = [space_3d.pack(x) for x in coords_3d]
+    east, east_packed = Coord(y=0, x=1), space.directions["E"]
+    up_3d, up_packed = Coord3D(y=0, x=0, z=1), space_3d.delta(Coord3D(y=0, x=0, z=1))
+    origin, origin_packed = coords[0], packed[0]
+    origin_3d, origin_packed_3d = coords_3d[0], packed_3d[0]
+
+    def in_bounds(coord: Coord) -> bool:
+        return 0 <= coord.x < SIZE and 0 <= coord.y < SIZE
+
+    return [
+        ("2D step", lambda: [x + east for x in coords], lambda: [x + east_packed for x in packed]),
+        (
+            "2D distance",
+            lambda: [origin.distance(x) for x in coords],
+            lambda: [space.distance(origin_packed, x) for x in packed],
+        ),
+        (
+            "2D cardinal_neighbors",
+            lambda: [list(x.cardinal_neighbors()) for x in coords],
+            lambda: [space.cardinal_neighbors(x) for x in packed],
+        ),
+        (
+            "2D neighbors",
+            lambda: [list(x.neighbors()) for x in coords],
+            lambda: [space.neighbors(x) for x in packed],
+        ),
+        ("2D set build", lambda: set(coords), lambda: set(packed)),
+        (
+            "2D flood fill",
+            lambda: flood(Coord(y=0, x=0), Coord.cardinal_neighbors, in_bounds),
+            lambda: flood(space.pack_yx(0, 0), space.cardinal_neighbors, space.in_bounds),
+        ),
+        ("3D step", lambda: [x + up_3d for x in coords_3d], lambda: [x + up_packed for x in packed_3d]),
+        (
+            "3D distance",
+            lambda: [origin_3d.distance(x) for x in coords_3d],
+            lambda: [space_3d.distance(origin_packed_3d, x) for x in packed_3d],
+        ),
+        (
+            "3D cardinal_neighbors",
+            lambda: [list(x.cardinal_neighbors()) for x in coords_3d],
+            lambda: [space_3d.cardinal_neighbors(x) for x in packed_3d],
+        ),
+    ]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark BaseCoord against utils.PackedCoords")
+    parser.add_argument("-c", "--count", type=int, default=20_000, help="Coordinates per test")
+    parser.add_argument("-n", "--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    print(f"{'Test':<22} {'BaseCoord (ms)':>15} {'Packed (ms)':>12} {'Speedup':>8}")
+    for name, coord_version, packed_version in cases(args.count):
+        coord_time = min(timeit.repeat(coord_version, number=1, repeat=args.repeat))
+        packed_time = min(timeit.repeat(packed_version, number=1, repeat=args.repeat))
+        print(f"{name:<22} {coord_time * 1000:>15.2f} {packed_time * 1000:>12.2f} {coord_time / packed_time:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
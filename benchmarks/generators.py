@@ -0,0 +1,253 @@
+from math import isqrt
+from random import Random
+from typing import Callable, Dict, List
+
+# Synthetic puzzle inputs for the scaling benchmarks.  Each generator takes a size (lines, bricks, hailstones, or grid
+# cells for the grid days) and a seeded Random, and returns input text in the same format as the real puzzle, shaped
+# so the solvers' assumptions about their input hold.
+
+DIGIT_WORDS = ["one", "two", "three", "four", "five", "six", "seven", "eight", "nine"]
+LETTERS = "abcdefghijklmnopqrstuvwxyz"
+
+
+def grid_side(cells: int, minimum: int = 5) -> int:
+    return max(minimum, isqrt(cells))
+
+
+def day01(size: int, rng: Random) -> str:
+    lines = []
+    for _ in range(size):
+        chunks = [rng.choice(LETTERS) * rng.randint(0, 3) for _ in range(4)]
+        chunks.insert(rng.randint(0, 4), str(rng.randint(1, 9)))
+        chunks.insert(rng.randint(0, 5), rng.choice(DIGIT_WORDS))
+        lines.append("".join(chunks))
+    return "\n".join(lines)
+
+
+def day02(size: int, rng: Random) -> str:
+    lines = []
+    for game in range(1, size + 1):
+        draws = []
+        for _ in range(rng.randint(1, 6)):
+            colors = rng.sample(["red", "green", "blue"], rng.randint(1, 3))
+            draws.append(", ".join(f"{rng.randint(1, 20)} {x}" for x in colors))
+        lines.append(f"Game {game}: {'; '.join(draws)}")
+    return "\n".join(lines)
+
+
+def day04(size: int, rng: Random) -> str:
+    lines = []
+    for card in range(1, size + 1):
+        # Winning copies can't run past the last card
+        matches = min(rng.randint(0, 5), size - card)
+        numbers = rng.sample(range(1, 100), 35 - matches)
+        winning, mine = numbers[:10], numbers[10:] + numbers[:matches]
+        lines.append(f"Card {card:>3}: {' '.join(f'{x:>2}' for x in winning)} | {' '.join(f'{x:>2}' for x in mine)}")
+    return "\n".join(lines)
+
+
+def day07(size: int, rng: Random) -> str:
+    # Hands have to be unique, so pick distinct hand numbers and spell them out in base 13
+    cards = "23456789TJQKA"
+    hands = []
+    for number in rng.sample(range(13**5), size):
+        hand = ""
+        for _ in range(5):
+            number, card = divmod(number, 13)
+            hand += cards[card]
+        hands.append(f"{hand} {rng.randint(1, 1000)}")
+    return "\n".join(hands)
+
+
+def day09(size: int, rng: Random) -> str:
+    lines = []
+    for _ in range(size):
+        coefficients = [rng.randint(-10, 10) for _ in range(rng.randint(1, 6))]
+        lines.append(" ".join(str(sum(c * x**i for i, c in enumerate(coefficients))) for x in range(21)))
+    return "\n".join(lines)
+
+
+def day11(size: int, rng: Random) -> str:
+    side = grid_side(size)
+    empty_rows, empty_cols = set(rng.sample(range(side), side // 10)), set(rng.sample(range(side), side // 10))
+    lines = []
+    for y in range(side):
+        lines.append(
+            "".join(
+                "#" if y not in empty_rows and x not in empty_cols and rng.random() < 0.02 else "."
+                for x in range(side)
+            )
+        )
+    return "\n".join(lines)
+
+
+def day12(size: int, rng: Random) -> str:
+    lines = []
+    for _ in range(size):
+        groups = [rng.randint(1, 4) for _ in range(rng.randint(1, 5))]
+        record = "." * rng.randint(0, 2)
+        for group in groups:
+            record += "#" * group + "." * rng.randint(1, 3)
+        # Hide some of the known cells behind ?s
+        record = "".join("?" if rng.random() < 0.5 else x for x in record)
+        lines.append(f"{record} {','.join(str(x) for x in groups)}")
+    return "\n".join(lines)
+
+
+def day14(size: int, rng: Random) -> str:
+    side = grid_side(size)
+    return "\n".join("".join(rng.choices("O#.", weights=(2, 1, 7), k=side)) for _ in range(side))
+
+
+def day16(size: int, rng: Random) -> str:
+    side = grid_side(size)
+    return "\n".join("".join(rng.choices("./\\-|", weights=(36, 1, 1, 1, 1), k=side)) for _ in range(side))
+
+
+def day17(size: int, rng: Random) -> str:
+    side = grid_side(size)
+    return "\n".join("".join(rng.choices("123456789", k=side)) for _ in range(side))
+
+
+def day20(size: int, rng: Random) -> str:
+    # The usual shape: the broadcaster feeds several 12-bit counters, each made of a chain of flip-flops and a
+    # conjunction that resets them, and each counter's conjunction feeds (via an inverter) the conjunction before rx
+    num_counters = max(1, size // 14)
+    lines = []
+    starts = []
+    name = iter(f"{a}{b}{c}" for a in LETTERS for b in LETTERS for c in LETTERS)
+    final = next(name)
+    for _ in range(num_counters):
+        bits = [next(name) for _ in range(12)]
+        conjunction, inverter = next(name), next(name)
+        # Bit 0 always feeds the conjunction, the others do so at random
+        feeds = [i == 0 or rng.random() < 0.5 for i in range(12)]
+        for i, bit in enumerate(bits):
+            outputs = [bits[i + 1]] if i < 11 else []
+            if feeds[i]:
+                outputs.append(conjunction)
+            lines.append(f"%{bit} -> {', '.join(outputs)}")
+        resets = [bit for bit, feeds_it in zip(bits, feeds) if not feeds_it] + [bits[0]]
+        lines.append(f"&{conjunction} -> {', '.join(resets + [inverter])}")
+        lines.append(f"&{inverter} -> {final}")
+        starts.append(bits[0])
+    lines.append(f"&{final} -> rx")
+    lines.insert(0, f"broadcaster -> {', '.join(starts)}")
+    return "\n".join(lines)
+
+
+def day21(size: int, rng: Random) -> str:
+    # Odd-sized square with S in the middle, like the real input, with a clear row and column through S
+    side = grid_side(size) | 1
+    middle = side // 2
+    lines = []
+    for y in range(side):
+        row = ["#" if rng.random() < 0.1 and middle not in (x, y) else "." for x in range(side)]
+        if y == middle:
+            row[middle] = "S"
+        lines.append("".join(row))
+    return "\n".join(lines)
+
+
+def day22(size: int, rng: Random) -> str:
+    lines = []
+    for i in range(size):
+        x, y = rng.randint(0, 9), rng.randint(0, 9)
+        # Every brick starts at its own height, so no two bricks can be identical
+        z = i + 1
+        length = rng.randint(0, 3)
+        axis = rng.randint(0, 2)
+        end = [x, y, z]
+        end[axis] = min(end[axis] + length, 9) if axis < 2 else end[axis] + length
+        lines.append(f"{x},{y},{z}~{end[0]},{end[1]},{end[2]}")
+    return "\n".join(lines)
+
+
+def day23(size: int, rng: Random) -> str:
+    # A square lattice of junctions joined by straight corridors, with slopes on the cells either side of each
+    # junction.  The real input's junctions aren't on a lattice, but building the node graph only cares about walls,
+    # slopes and corridors.
+    spacing = 6
+    num_junctions = max(2, grid_side(size) // spacing)
+    last = 3 + spacing * (num_junctions - 1)
+    width, height = last + 4, last + 3
+    grid = [["#"] * width for _ in range(height)]
+    junctions = [3 + spacing * i for i in range(num_junctions)]
+    for y in junctions:
+        for x in junctions:
+            grid[y][x] = "."
+            if x != last:
+                grid[y][x + 1 : x + spacing] = [">"] + ["."] * (spacing - 3) + [">"]
+            if y != last:
+                for i in range(1, spacing):
+                    grid[y + i][x] = "v" if i in (1, spacing - 1) else "."
+    # Start above the first junction, end below the last one
+    grid[0][3], grid[1][3], grid[2][3] = ".", ".", "v"
+    grid[last + 1][last], grid[last + 2][last] = "v", "."
+    return "\n".join("".join(x) for x in grid)
+
+
+def day24(size: int, rng: Random) -> str:
+    lines = []
+    for _ in range(size):
+        position = [rng.randint(100_000_000_000_000, 500_000_000_000_000) for _ in range(3)]
+        velocity = [rng.choice([-1, 1]) * rng.randint(1, 400) for _ in range(3)]
+        lines.append(f"{', '.join(str(x) for x in position)} @ {', '.join(str(x) for x in velocity)}")
+    return "\n".join(lines)
+
+
+def node_names(count: int) -> List[str]:
+    names = []
+    for i in range(count):
+        name = ""
+        for _ in range(4):
+            i, letter = divmod(i, 26)
+            name += LETTERS[letter]
+        names.append(name)
+    return names
+
+
+def day25(size: int, rng: Random) -> str:
+    # Two densely connected halves joined by exactly three edges
+    names = node_names(max(size, 20))
+    rng.shuffle(names)
+    halves = names[: len(names) // 2], names[len(names) // 2 :]
+    edges = set()
+    for half in halves:
+        for i, node in enumerate(half):
+            # A ring keeps each half connected, and the random extra edges keep it dense
+            edges.add((node, half[(i + 1) % len(half)]))
+            for other in rng.sample(half, 4):
+                if other != node:
+                    edges.add((node, other))
+    for first, second in zip(rng.sample(halves[0], 3), rng.sample(halves[1], 3)):
+        edges.add((first, second))
+    # Each connection only gets listed once, from whichever end comes first
+    connections: Dict[str, List[str]] = {}
+    for first, second in {tuple(sorted(x)) for x in edges}:
+        connections.setdefault(first, []).append(second)
+    return "\n".join(f"{node}: {' '.join(others)}" for node, others in connections.items())
+
+
+GENERATORS: Dict[int, Callable[[int, Random], str]] = {
+    1: day01,
+    2: day02,
+    4: day04,
+    7: day07,
+    9: day09,
+    11: day11,
+    12: day12,
+    14: day14,
+    16: day16,
+    17: day17,
+    20: day20,
+    21: day21,
+    22: day22,
+    23: day23,
+    24: day24,
+    25: day25,
+}
+
+
+def generate(day: int, size: int, seed: int = 2023) -> str:
+    return GENERATORS[day](size, Random(seed))
@@ -0,0 +1,96 @@
+import argparse
+import timeit
+import tracemalloc
+from typing import Callable, Dict, Set, Tuple
+
+from utils import BaseCoord as Coord
+from utils import CARDINAL_NEIGHBORS_2D, Grid, read_data
+
+# Compares the Dict[Coord, str]/Set[Coord] representation most of the grid days use against utils.Grid, for memory
+# use and neighbor-lookup throughput.  Run from the repo root: python -m benchmarks.grid [day]
+
+
+def build_dict(raw: str) -> Dict[Coord, str]:
+    return {Coord(y=y, x=x): char for y, line in enumerate(raw.splitlines()) for x, char in enumerate(line)}
+
+
+def build_set(raw: str, wall: str = "#") -> Set[Coord]:
+    return {Coord(y=y, x=x) for y, line in enumerate(raw.splitlines()) for x, char in enumerate(line) if char == wall}
+
+
+def measure_memory(build: Callable[[], object]) -> int:
+    tracemalloc.start()
+    result = build()
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del result
+    return current
+
+
+def dict_lookups(cells: Dict[Coord, str]) -> int:
+    open_neighbors = 0
+    for coord in cells:
+        for delta in CARDINAL_NEIGHBORS_2D:
+            if cells.get(coord + delta, "#") != "#":
+                open_neighbors += 1
+    return open_neighbors
+
+
+def set_lookups(walls: Set[Coord], width: int, height: int) -> int:
+    open_neighbors = 0
+    for y in range(height):
+        for x in range(width):
+            coord = Coord(y=y, x=x)
+            for delta in CARDINAL_NEIGHBORS_2D:
+                neighbor = coord + delta
+                if 0 <= neighbor.y < height and 0 <= neighbor.x < width and neighbor not in walls:
+                    open_neighbors += 1
+    return open_neighbors
+
+
+def grid_lookups(grid: Grid) -> int:
+    open_neighbors = 0
+    cells, deltas, wall = grid.cells, grid.cardinal_deltas, ord("#")
+    for index in grid.indices():
+        for delta in deltas:
+            if cells[index + delta] != wall:
+                open_neighbors += 1
+    return open_neighbors
+
+
+def time_it(func: Callable[[], object], repeat: int) -> float:
+    return min(timeit.repeat(func, number=1, repeat=repeat))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark utils.Grid against dict/set grids")
+    parser.add_argument("day", nargs="?", type=int, default=23, help="Day whose input to use as the grid")
+    parser.add_argument("-n", "--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    raw = read_data(args.day)
+    grid = Grid.from_str(raw)
+    cells, walls = build_dict(raw), build_set(raw)
+    cell_count = len(grid) * len(CARDINAL_NEIGHBORS_2D)
+    # All three should agree, otherwise the comparison is meaningless
+    assert dict_lookups(cells) == set_lookups(walls, grid.width, grid.height) == grid_lookups(grid)
+
+    rows: Tuple[Tuple[str, Callable, Callable], ...] = (
+        ("dict", lambda: build_dict(raw), lambda: dict_lookups(cells)),
+        ("set", lambda: build_set(raw), lambda: set_lookups(walls, grid.width, grid.height)),
+        ("grid", lambda: Grid.from_str(raw), lambda: grid_lookups(grid)),
+    )
+    print(f"Day {args.day}: {grid.width}x{grid.height} grid, {cell_count} neighbor lookups per pass")
+    print(f"{'Type':<6} {'Memory (KiB)':>13} {'Build (ms)':>11} {'Lookups (ms)':>13} {'Lookups/s':>12}")
+    for name, build, lookups in rows:
+        memory = measure_memory(build)
+        build_time = time_it(build, args.repeat)
+        lookup_time = time_it(lookups, args.repeat)
+        print(
+            f"{name:<6} {memory / 1024:>13.1f} {build_time * 1000:>11.2f} {lookup_time * 1000:>13.2f} "
+            f"{cell_count / lookup_time:>12,.0f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,233 @@
+import argparse
+import importlib
+import json
+import time
+from math import ceil, log
+from types import ModuleType
+from typing import Callable, List, NamedTuple, Optional, Sequence
+
+from benchmarks.generators import GENERATORS, generate
+
+# Runs each day's public classes over synthetic inputs at growing sizes and fits the empirical growth exponent, i.e.
+# the slope of log(time) against log(size).  Anything that grows faster than its case says it should gets flagged,
+# and with --check the run fails, so an accidentally quadratic change gets caught even when the real input is too
+# small for it to show up in the timings.
+# Run from the repo root: python -m benchmarks.scaling [days] [--scales 1,10,100] [--case NAME] [--check]
+# Or point it at any class (and method) of a day with a generator: --target 22:Cascade.expendable_bricks --bound 1.0
+
+DIGIT_WORDS = ["zero", "one", "two", "three", "four", "five", "six", "seven", "eight", "nine"]
+WORD_MAPPINGS = {x: i for i, x in enumerate(DIGIT_WORDS)}
+MIN_SAMPLE_SECONDS = 0.05
+
+
+class ScalingCase(NamedTuple):
+    day: int
+    name: str
+    # Size of the 1x input, in whatever unit the day's generator takes (lines, bricks, grid cells...)
+    base_size: int
+    run: Callable[[ModuleType, str], object]
+    # The exponent this should grow at, which --check holds it to (give or take --tolerance).  Some days are
+    # inherently quadratic (every pair of hailstones), so this is what a reasonable algorithm manages rather than
+    # always 1.
+    expected: float
+
+
+class ScalingResult(NamedTuple):
+    case: ScalingCase
+    sizes: List[int]
+    times: List[float]
+    exponent: Optional[float]
+
+    def flagged(self, tolerance: float) -> bool:
+        return self.exponent is not None and self.exponent > self.case.expected + tolerance
+
+
+def roll_all(module: ModuleType, raw: str):
+    platform = module.Platform(raw)
+    for direction in ("N", "W", "S", "E"):
+        platform.roll(direction)
+    return platform.score()
+
+
+def expand_universe(module: ModuleType, raw: str) -> int:
+    universe = module.Universe(raw)
+    universe.expand(amount=1)
+    return universe.shortest_paths()
+
+
+def garden_walk(module: ModuleType, raw: str) -> int:
+    garden = module.Garden(raw)
+    return garden.points_of_interest([garden.max_x // 2])[0]
+
+
+CASES: List[ScalingCase] = [
+    ScalingCase(
+        1, "find_digits", 1000, lambda m, raw: sum(m.find_digits(x, WORD_MAPPINGS) for x in raw.splitlines()), 1.0
+    ),
+    ScalingCase(2, "Game", 100, lambda m, raw: sum(m.Game(x).is_valid() for x in raw.splitlines()), 1.0),
+    ScalingCase(4, "Card", 1000, lambda m, raw: sum(m.Card(x).part_one_value for x in raw.splitlines()), 1.0),
+    # Sorting, so n log n, though on sort_key() tuples the way the solver does it rather than through __lt__
+    ScalingCase(7, "ranked_bids", 1000, lambda m, raw: m.ranked_bids(raw.splitlines(), m.PartTwoHand), 1.1),
+    ScalingCase(9, "Sequence.predict", 200, lambda m, raw: sum(m.Sequence(x).predict() for x in raw.splitlines()), 1.0),
+    # Sums the distance between every pair of galaxies, but by sorting each axis rather than visiting the pairs
+    ScalingCase(11, "Universe.shortest_paths", 2500, expand_universe, 1.1),
+    ScalingCase(
+        12,
+        "Condition.count_possibilities",
+        200,
+        lambda m, raw: sum(m.Condition(x).count_possibilities() for x in raw.splitlines()),
+        1.0,
+    ),
+    ScalingCase(14, "Platform.roll", 2500, roll_all, 1.0),
+    ScalingCase(16, "MirrorMirror.find_activated", 2500, lambda m, raw: m.MirrorMirror(raw).find_activated(), 1.0),
+    # Dijkstra, but with a bucket queue rather than a heap, so linear plus the spread of path costs
+    ScalingCase(17, "HeatMap.find_min_path", 2500, lambda m, raw: m.HeatMap(raw).find_min_path(), 1.1),
+    ScalingCase(20, "Machine.push_button", 56, lambda m, raw: m.Machine(raw).push_button(1000), 1.0),
+    # One BFS that visits each cell within side / 2 steps once
+    ScalingCase(21, "Garden.points_of_interest", 2500, garden_walk, 1.0),
+    # Each brick only looks at the bricks under its own footprint as it falls
+    ScalingCase(22, "Cascade", 100, lambda m, raw: m.Cascade(raw).expendable_bricks(), 1.0),
+    ScalingCase(23, "Hike", 2500, lambda m, raw: len(m.Hike(raw).nodes), 1.0),
+    # Checks every pair of hailstones
+    ScalingCase(24, "Storm.collisions_in_box", 30, lambda m, raw: m.Storm(raw).collisions_in_box(), 2.0),
+    # Picks each node to leave the group off a heap, so n log n
+    ScalingCase(25, "Components", 100, lambda m, raw: len(m.Components(raw).in_group), 1.1),
+]
+
+
+def target_case(target: str, base_size: int, bound: float) -> ScalingCase:
+    # "22:Cascade" times building a Cascade from the input, "22:Cascade.expendable_bricks" also calls that on it
+    raw_day, _, path = target.partition(":")
+    day = int(raw_day)
+    if day not in GENERATORS:
+        raise ValueError(f"Day {day} has no input generator")
+    class_name, _, method = path.partition(".")
+
+    def run(module: ModuleType, raw: str):
+        instance = getattr(module, class_name)(raw)
+        return getattr(instance, method)() if method else instance
+
+    return ScalingCase(day, path, base_size, run, bound)
+
+
+def fit_exponent(sizes: Sequence[float], times: Sequence[float]) -> Optional[float]:
+    # Least-squares slope of log(time) against log(size)
+    points = [(log(x), log(y)) for x, y in zip(sizes, times) if y > 0]
+    if len(points) < 2:
+        return None
+    mean_x = sum(x for x, _ in points) / len(points)
+    mean_y = sum(y for _, y in points) / len(points)
+    spread = sum((x - mean_x) ** 2 for x, _ in points)
+    return sum((x - mean_x) * (y - mean_y) for x, y in points) / spread if spread else None
+
+
+def time_run(run: Callable[[], object], repeat: int) -> float:
+    # The 1x sizes finish in a millisecond or two, where timer and scheduler noise is enough to swing the fitted
+    # exponent by a quarter either way.  So each sample loops the run until it's taken at least MIN_SAMPLE_SECONDS,
+    # and the fastest per-run time over the samples counts.  Long runs still get repeated, since a busy machine can
+    # slow any one of them down as much as the noise does a short one.
+    start = time.perf_counter()
+    run()
+    best = time.perf_counter() - start
+    number = max(1, ceil(MIN_SAMPLE_SECONDS / best)) if best else 1
+    # The first run already counts as a sample when it's long enough on its own
+    for _ in range(repeat - 1 if number == 1 else repeat):
+        start = time.perf_counter()
+        for _ in range(number):
+            run()
+        best = min(best, (time.perf_counter() - start) / number)
+    return best
+
+
+def measure(case: ScalingCase, scales: Sequence[int], repeat: int, max_seconds: float) -> ScalingResult:
+    module = importlib.import_module(f"advent2023_day{case.day:02d}")
+    sizes, times = [], []
+    for scale in scales:
+        size = case.base_size * scale
+        raw = generate(case.day, size)
+        elapsed = time_run(lambda: case.run(module, raw), repeat)
+        sizes.append(size)
+        times.append(elapsed)
+        # Don't wait around on the bigger sizes once this one has already taken too long
+        if elapsed > max_seconds:
+            break
+    return ScalingResult(case=case, sizes=sizes, times=times, exponent=fit_exponent(sizes, times))
+
+
+def format_results(results: List[ScalingResult], scales: Sequence[int], tolerance: float) -> str:
+    time_headers = " ".join(f"{f'{x}x (s)':>10}" for x in scales)
+    header = f"{'Day':>3}  {'Case':<30} {time_headers} {'Exponent':>9} {'Expected':>9}"
+    output = [header, "-" * len(header)]
+    for result in results:
+        times = " ".join(f"{x:>10.4f}" for x in result.times) + " " * 11 * (len(scales) - len(result.times))
+        exponent = f"{result.exponent:>9.2f}" if result.exponent is not None else f"{'-':>9}"
+        flag = ""
+        if result.flagged(tolerance):
+            flag = "  SUPER-LINEAR" if result.case.expected <= 1.0 else "  GROWS FASTER THAN EXPECTED"
+        output.append(
+            f"{result.case.day:>3}  {result.case.name:<30} {times} {exponent} {result.case.expected:>9.1f}{flag}"
+        )
+    return "\n".join(output)
+
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Measure how the solvers scale on synthetic inputs")
+    parser.add_argument("days", nargs="*", type=int, help="Days to run (default: every day with a generator)")
+    parser.add_argument(
+        "--case", metavar="NAME", action="append", help="Only run cases whose name contains this (repeatable)"
+    )
+    parser.add_argument(
+        "--target", metavar="DAY:CLASS[.METHOD]", action="append", help="Also time this, built from the raw input"
+    )
+    parser.add_argument("--bound", type=float, default=1.0, help="Declared exponent for --target (default: 1.0)")
+    parser.add_argument("--base-size", type=int, default=100, help="1x input size for --target (default: 100)")
+    parser.add_argument("--scales", default="1,10,100", help="Comma-separated multiples of each case's base size")
+    parser.add_argument("-n", "--repeat", type=int, default=3, help="Runs per size (the fastest one counts)")
+    parser.add_argument(
+        "--max-seconds", type=float, default=10.0, help="Skip larger sizes once a run takes this long"
+    )
+    parser.add_argument("--tolerance", type=float, default=0.25, help="How far over its expected exponent to flag")
+    parser.add_argument("--json", metavar="PATH", help="Also write the results as JSON")
+    parser.add_argument("--check", action="store_true", help="Exit with an error if any case is flagged")
+    return parser.parse_args(argv)
+
+
+def main(argv: Optional[List[str]] = None) -> List[ScalingResult]:
+    args = parse_args(argv)
+    scales = [int(x) for x in args.scales.split(",")]
+    cases = [x for x in CASES if not args.days or x.day in args.days]
+    if args.case:
+        cases = [x for x in cases if any(name.lower() in x.name.lower() for name in args.case)]
+    if args.target:
+        # Just the targets, unless cases were asked for as well
+        cases = cases if args.days or args.case else []
+        cases += [target_case(x, args.base_size, args.bound) for x in args.target]
+    results = [measure(x, scales, args.repeat, args.max_seconds) for x in cases]
+    print(format_results(results, scales, args.tolerance))
+    if args.json:
+        with open(args.json, "w") as outfile:
+            json.dump(
+                [
+                    {
+                        "day": x.case.day,
+                        "case": x.case.name,
+                        "sizes": x.sizes,
+                        "times": x.times,
+                        "exponent": x.exponent,
+                        "expected": x.case.expected,
+                        "flagged": x.flagged(args.tolerance),
+                    }
+                    for x in results
+                ],
+                outfile,
+                indent=2,
+            )
+    flagged = [x for x in results if x.flagged(args.tolerance)]
+    if args.check and flagged:
+        names = ", ".join(f"day {x.case.day} {x.case.name}" for x in flagged)
+        raise SystemExit(f"Grew faster than declared: {names}")
+    return results
+
+
+if __name__ == "__main__":
+    main()
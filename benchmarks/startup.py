@@ -0,0 +1,213 @@
+import argparse
+import json
+import os
+import subprocess
+import sys
+import time
+from pathlib import Path
+from typing import Dict, List, NamedTuple, Optional, Sequence, Tuple
+
+from advent2023 import REPO_ROOT, available_days
+
+# Measures what it costs each day to get going in a fresh interpreter: how long importing it takes (from
+# python -X importtime) and how long `python advent2023_dayNN.py` takes from launch to exit.  Both get compared with
+# the per-day budgets recorded in benchmarks/startup_budgets.json, so an import that makes every day slower to start
+# shows up even on the days where it's lost in the solve time.
+# Run from the repo root: python -m benchmarks.startup [days] [--check] [--record]
+
+BUDGETS = Path(__file__).resolve().parent / "startup_budgets.json"
+# Recorded budgets are the measurement times this, plus a fixed allowance, so ordinary noise doesn't trip them
+HEADROOM = 1.5
+IMPORT_SLACK_MS = 10.0
+COLD_START_SLACK_MS = 50.0
+
+
+class StartupResult(NamedTuple):
+    day: int
+    # Cumulative import time of the day's module, utils and everything else it pulls in included
+    import_ms: float
+    # The modules with the most import time of their own, slowest first
+    slowest_imports: List[Tuple[str, float]]
+    # Launch to exit of the day script, answers and all
+    cold_start_ms: Optional[float]
+
+
+class Budget(NamedTuple):
+    import_ms: float
+    cold_start_ms: Optional[float]
+
+
+def python_env() -> Dict[str, str]:
+    # Let the warm-up runs write .pyc files, or else every run measures compiling utils from source as well
+    env = dict(os.environ)
+    env.pop("PYTHONDONTWRITEBYTECODE", None)
+    return env
+
+
+def run_python(args: Sequence[str]) -> subprocess.CompletedProcess:
+    return subprocess.run(
+        [sys.executable, *args], cwd=REPO_ROOT, env=python_env(), capture_output=True, text=True, check=True
+    )
+
+
+def parse_importtime(stderr: str) -> Dict[str, Tuple[float, float]]:
+    # Lines look like "import time:       self [us] |  cumulative | package", nested imports indented under the name
+    times = {}
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "[us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:") :].split("|")
+        times[name.strip()] = (int(self_us) / 1000, int(cumulative_us) / 1000)
+    return times
+
+
+def measure_imports(day: int, repeat: int, top: int) -> Tuple[float, List[Tuple[str, float]]]:
+    module = f"advent2023_day{day:02d}"
+    best: Optional[Dict[str, Tuple[float, float]]] = None
+    for _ in range(repeat):
+        times = parse_importtime(run_python(["-X", "importtime", "-c", f"import {module}"]).stderr)
+        if best is None or times[module][1] < best[module][1]:
+            best = times
+    slowest = sorted(((name, x[0]) for name, x in best.items()), key=lambda x: x[1], reverse=True)
+    return best[module][1], slowest[:top]
+
+
+def measure_cold_start(day: int, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        run_python([f"advent2023_day{day:02d}.py"])
+        elapsed = time.perf_counter() - start
+        best = min(best, elapsed)
+        # The slow days are well clear of the startup noise after one run
+        if elapsed > 1.0:
+            break
+    return best * 1000
+
+
+def measure(day: int, repeat: int, top: int, cold_start: bool) -> StartupResult:
+    # One untimed run first, to get the .pyc files written and the input into the page cache
+    run_python(["-c", f"import advent2023_day{day:02d}"])
+    import_ms, slowest = measure_imports(day, repeat, top)
+    cold_start_ms = measure_cold_start(day, repeat) if cold_start else None
+    return StartupResult(day, import_ms, slowest, cold_start_ms)
+
+
+def interpreter_ms(repeat: int) -> float:
+    # The floor under every cold start: launching python and doing nothing
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        run_python(["-c", "pass"])
+        best = min(best, time.perf_counter() - start)
+    return best * 1000
+
+
+def load_budgets() -> Dict[int, Budget]:
+    try:
+        raw = json.loads(BUDGETS.read_text())
+    except (OSError, ValueError):
+        return {}
+    return {int(day): Budget(x["import_ms"], x.get("cold_start_ms")) for day, x in raw["days"].items()}
+
+
+def save_budgets(results: List[StartupResult]):
+    budgets = load_budgets()
+    for x in results:
+        if x.cold_start_ms is not None:
+            cold_start = round(x.cold_start_ms * HEADROOM + COLD_START_SLACK_MS, 1)
+        else:
+            # An --imports-only run keeps whatever cold start budget there already was
+            cold_start = budgets[x.day].cold_start_ms if x.day in budgets else None
+        budgets[x.day] = Budget(round(x.import_ms * HEADROOM + IMPORT_SLACK_MS, 1), cold_start)
+    BUDGETS.write_text(
+        json.dumps(
+            {
+                "python": sys.version.split()[0],
+                "days": {str(day): x._asdict() for day, x in sorted(budgets.items())},
+            },
+            indent=2,
+        )
+        + "\n"
+    )
+
+
+def over_budget(result: StartupResult, budget: Optional[Budget]) -> List[str]:
+    if budget is None:
+        return []
+    over = []
+    if result.import_ms > budget.import_ms:
+        over.append("import")
+    if result.cold_start_ms is not None and budget.cold_start_ms is not None:
+        if result.cold_start_ms > budget.cold_start_ms:
+            over.append("cold start")
+    return over
+
+
+def format_results(results: List[StartupResult], budgets: Dict[int, Budget], baseline: float) -> str:
+    header = f"{'Day':>3}  {'Import (ms)':>11} {'Budget':>8}  {'Cold (ms)':>10} {'Budget':>8}  Slowest imports (ms)"
+    output = [f"Interpreter alone: {baseline:.1f} ms", header, "-" * len(header)]
+    for result in results:
+        budget = budgets.get(result.day)
+        import_budget = f"{budget.import_ms:>8.1f}" if budget else f"{'-':>8}"
+        cold = f"{result.cold_start_ms:>10.1f}" if result.cold_start_ms is not None else f"{'-':>10}"
+        cold_budget = f"{budget.cold_start_ms:>8.1f}" if budget and budget.cold_start_ms else f"{'-':>8}"
+        slowest = ", ".join(f"{name} {ms:.1f}" for name, ms in result.slowest_imports)
+        over = over_budget(result, budget)
+        flag = f"  OVER BUDGET ({', '.join(over)})" if over else ""
+        output.append(
+            f"{result.day:>3}  {result.import_ms:>11.1f} {import_budget}  {cold} {cold_budget}  {slowest}{flag}"
+        )
+    return "\n".join(output)
+
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Measure each day's import time and cold start against its budget")
+    parser.add_argument("days", nargs="*", type=int, help="Days to run (default: all of them)")
+    parser.add_argument("-n", "--repeat", type=int, default=5, help="Runs per measurement (the fastest one counts)")
+    parser.add_argument("--top", type=int, default=3, help="How many of the slowest imports to list")
+    parser.add_argument(
+        "--imports-only", action="store_true", help="Skip the cold starts, which means solving each day"
+    )
+    parser.add_argument("--record", action="store_true", help=f"Save new budgets from this run to {BUDGETS.name}")
+    parser.add_argument("--check", action="store_true", help="Exit with an error if any day is over its budget")
+    parser.add_argument("--json", metavar="PATH", help="Also write the results as JSON")
+    return parser.parse_args(argv)
+
+
+def main(argv: Optional[List[str]] = None) -> List[StartupResult]:
+    args = parse_args(argv)
+    days = args.days or available_days()
+    baseline = interpreter_ms(args.repeat)
+    results = [measure(day, args.repeat, args.top, not args.imports_only) for day in days]
+    budgets = load_budgets()
+    print(format_results(results, budgets, baseline))
+    if args.json:
+        with open(args.json, "w") as outfile:
+            json.dump(
+                {
+                    "python": sys.version.split()[0],
+                    "interpreter_ms": baseline,
+                    "days": {
+                        str(x.day): {
+                            "import_ms": x.import_ms,
+                            "slowest_imports": dict(x.slowest_imports),
+                            "cold_start_ms": x.cold_start_ms,
+                            "budget": budgets[x.day]._asdict() if x.day in budgets else None,
+                        }
+                        for x in results
+                    },
+                },
+                outfile,
+                indent=2,
+            )
+    if args.record:
+        save_budgets(results)
+    over = [x.day for x in results if over_budget(x, budgets.get(x.day))]
+    if args.check and over:
+        raise SystemExit(f"Over their startup budget: days {', '.join(map(str, over))}")
+    return results
+
+
+if __name__ == "__main__":
+    main()
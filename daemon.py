@@ -0,0 +1,136 @@
+import argparse
+import importlib
+import io
+import json
+import os
+import socket
+import socketserver
+import sys
+import time
+import traceback
+from pathlib import Path
+from typing import IO, Dict, Iterable, List, Optional
+
+from advent2023 import DAY_MODULE, REPO_ROOT, available_days, run_once
+
+# A long-lived solver process that keeps every day module imported, so solving another input costs milliseconds
+# instead of an interpreter startup plus imports.  Requests and responses are one JSON object per line, either over
+# stdin/stdout or over a Unix socket:
+#
+#   {"day": 14, "input": "<puzzle text>"}       solve day 14 with this input
+#   {"day": 14, "input_file": "path/to/input"}  ...or with the input in this file
+#   {"day": 14}                                 ...or with the day's usual input from inputs/
+#   {"day": 14, "parts": ["two"]}               only compute some of the parts
+#   {"cmd": "ping"} / {"cmd": "shutdown"}
+#
+# Each answer comes back as {"day": 14, "answers": {...}, "parts": {...}, "total": seconds}, or {"error": "..."}.
+# An "id" in a request is echoed in its response.
+
+
+# Relative input_file and --socket paths are relative to wherever the daemon was started, not the repo root we chdir to
+LAUNCH_DIR = Path.cwd()
+
+
+def preload(days: Iterable[int]):
+    for day in days:
+        importlib.import_module(DAY_MODULE.format(day=day))
+
+
+def handle_request(request: Dict) -> Dict:
+    response = {"id": request["id"]} if "id" in request else {}
+    if request.get("cmd") == "ping":
+        return {**response, "ok": True}
+    try:
+        day = int(request["day"])
+        input_text = request.get("input")
+        if input_text is None and "input_file" in request:
+            input_text = (LAUNCH_DIR / request["input_file"]).read_text()
+        start = time.perf_counter()
+        result = run_once(day, input_text, request.get("parts"))
+        return {
+            **response,
+            "day": day,
+            "answers": result.answers,
+            "parts": result.part_times,
+            "total": result.total_time,
+            "latency": time.perf_counter() - start,
+        }
+    except Exception:
+        return {**response, "error": traceback.format_exc(limit=-1).strip().splitlines()[-1]}
+
+
+def serve_stream(instream: IO[str], outstream: IO[str]) -> bool:
+    # Returns True if we were asked to shut down
+    for line in instream:
+        if not line.strip():
+            continue
+        try:
+            request = json.loads(line)
+        except ValueError as e:
+            outstream.write(json.dumps({"error": f"bad request: {e}"}) + "\n")
+            outstream.flush()
+            continue
+        if request.get("cmd") == "shutdown":
+            outstream.write(json.dumps({"ok": True}) + "\n")
+            outstream.flush()
+            return True
+        outstream.write(json.dumps(handle_request(request)) + "\n")
+        outstream.flush()
+    return False
+
+
+class SolverServer(socketserver.UnixStreamServer):
+    stop_requested: bool = False
+
+
+class RequestHandler(socketserver.StreamRequestHandler):
+    server: SolverServer
+
+    def handle(self):
+        instream = io.TextIOWrapper(self.rfile)
+        outstream = io.TextIOWrapper(self.wfile, write_through=True)
+        if serve_stream(instream, outstream):
+            self.server.stop_requested = True
+        # Leave closing the socket's files to the server
+        instream.detach()
+        outstream.detach()
+
+
+def serve_socket(path: Path):
+    path.unlink(missing_ok=True)
+    # Solvers share global state (phase timings, the parse cache), so connections are handled one at a time
+    with SolverServer(str(path), RequestHandler) as server:
+        try:
+            while not server.stop_requested:
+                server.handle_request()
+        finally:
+            path.unlink(missing_ok=True)
+
+
+def query(path: Path, request: Dict) -> Dict:
+    # Minimal client, for scripts that want to drive a running daemon
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as client:
+        client.connect(str(path))
+        client.sendall(json.dumps(request).encode() + b"\n")
+        client.shutdown(socket.SHUT_WR)
+        return json.loads(client.makefile().readline())
+
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description="Keep the solvers warm and answer solve requests")
+    parser.add_argument("--socket", type=Path, help="Listen on this Unix socket instead of stdin/stdout")
+    args = parser.parse_args(argv)
+    if args.socket:
+        args.socket = LAUNCH_DIR / args.socket
+
+    # read_data() looks for inputs/ relative to the working directory
+    os.chdir(REPO_ROOT)
+    preload(available_days())
+    if args.socket:
+        serve_socket(args.socket)
+    else:
+        serve_stream(sys.stdin, sys.stdout)
+
+
+if __name__ == "__main__":
+    main()
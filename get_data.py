@@ -1,33 +1,149 @@
-from aocd.exceptions import PuzzleLockedError
-from aocd.models import Puzzle
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from pathlib import Path
+from typing import Callable, Dict, List, Optional
+import argparse
+import hashlib
+import json
+import os
 import sys
 
 # This is a standalone script meant to be run to automatically grab my data
 # for a given year/day and dump it into an automatically-named file.
+# Run it with no arguments to grab the next day, or with --all to grab every unlocked day that's missing.
 
 YEAR_NUM = 2023
+INPUT_DIR = Path('inputs/')
+# sha256 of each input as it was fetched, so a truncated or hand-edited file gets fetched again
+CHECKSUMS = INPUT_DIR / 'checksums.json'
 
-old_max_day = len(list(Path('inputs/').glob('*.txt')))
-new_day = old_max_day + 1
 
-try:
-    puzzle = Puzzle(year=YEAR_NUM, day=new_day)
+class DayLocked(Exception):
+    pass
+
+
+class LocalPuzzle:
+    # Stand-in for aocd's Puzzle that serves inputs out of a local directory instead of the network, for testing.
+    # Any day that doesn't have a file there counts as locked.
+    source_dir: Path = INPUT_DIR
+
+    def __init__(self, year: int, day: int):
+        self.path = self.source_dir / f'advent{year}_day{day:02d}_input.txt'
+        if not self.path.exists():
+            raise DayLocked(f"No local input for {year} day {day}")
+
+    @property
+    def input_data(self) -> str:
+        return self.path.read_text()
+
+
+def aocd_puzzle(year: int, day: int):
+    # Only pull in aocd when we're actually going to the network
+    from aocd.exceptions import PuzzleLockedError
+    from aocd.models import Puzzle
+
+    try:
+        puzzle = Puzzle(year=year, day=day)
+        # Touch input_data here so a locked day is reported as DayLocked either way
+        puzzle.input_data
+    except PuzzleLockedError as e:
+        raise DayLocked(str(e)) from e
+    return puzzle
+
+
+def input_location(day: int) -> Path:
+    return INPUT_DIR / f'advent{YEAR_NUM}_day{day:02d}_input.txt'
+
+
+def checksum(data: bytes) -> str:
+    return hashlib.sha256(data).hexdigest()
+
+
+def load_checksums() -> Dict[str, str]:
+    try:
+        return json.loads(CHECKSUMS.read_text())
+    except (OSError, ValueError):
+        return {}
+
+
+def write_atomically(location: Path, data: str):
+    # Write to a temp file next to the real one and rename it into place, so nothing ever sees a partial input
+    temp_location = location.with_name(f'.{location.name}.{os.getpid()}.tmp')
+    temp_location.write_text(data)
+    temp_location.replace(location)
+
+
+def is_present(day: int, checksums: Dict[str, str]) -> bool:
+    location = input_location(day)
+    if not location.exists():
+        return False
+    recorded = checksums.get(location.name)
+    # Inputs from before checksums were recorded get trusted as they are
+    return recorded is None or recorded == checksum(location.read_bytes())
+
+
+def fetch_day(day: int, puzzle_factory: Callable) -> str:
+    data = puzzle_factory(year=YEAR_NUM, day=day).input_data
+    write_atomically(input_location(day), data)
+    return checksum(data.encode())
+
 
-    file_location = Path(f'inputs/advent{YEAR_NUM}_day{new_day:02d}_input.txt')
-    file_location.write_text(puzzle.input_data)
-except PuzzleLockedError as e:
-    print(f"Day {new_day} not available: {e}")
-    sys.exit(1)
+def fetch_all(puzzle_factory: Callable, workers: int = 8, days: Optional[List[int]] = None) -> Dict[int, str]:
+    # Fetch every missing day concurrently.  Returns a status per day that was attempted.
+    INPUT_DIR.mkdir(exist_ok=True)
+    checksums = load_checksums()
+    days = days or list(range(1, 26))
+    missing = [x for x in days if not is_present(x, checksums)]
+    statuses = {}
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        futures = {executor.submit(fetch_day, x, puzzle_factory): x for x in missing}
+        for future in as_completed(futures):
+            day = futures[future]
+            try:
+                checksums[input_location(day).name] = future.result()
+                statuses[day] = "fetched"
+            except DayLocked as e:
+                statuses[day] = f"not available: {e}"
+            except Exception as e:
+                statuses[day] = f"failed: {e!r}"
+    for day in days:
+        location = input_location(day)
+        if location.exists() and location.name not in checksums:
+            checksums[location.name] = checksum(location.read_bytes())
+    write_atomically(CHECKSUMS, json.dumps(dict(sorted(checksums.items())), indent=2))
+    return statuses
 
 
-program_location = Path(f"advent{YEAR_NUM}_day{new_day:02d}.py")
-blank_day = """from utils import read_data
+blank_day = """from typing import Iterator
+
+from utils import read_data, timed_phase
 import time
 
 
+@timed_phase("parse")
+def parse(raw_input: str) -> str:
+    return raw_input
+
+
+@timed_phase("part_one")
+def part_one(parsed: str) -> int:
+    return 0
+
+
+@timed_phase("part_two")
+def part_two(parsed: str) -> int:
+    return 0
+
+
+def solve(raw_input: str) -> Iterator[int]:
+    parsed = parse(raw_input)
+    yield part_one(parsed)
+    yield part_two(parsed)
+
+
 def main():
-    pass
+    answers = solve(read_data())
+    print(f"Part one: {next(answers)}")
+    print(f"Part two: {next(answers)}")
 
 
 if __name__ == '__main__':
@@ -36,5 +152,42 @@ if __name__ == '__main__':
     print(f"Time: {time.monotonic()-start}")
 """
 
-if not program_location.exists():
-    program_location.write_text(blank_day)
+
+def write_template(day: int):
+    program_location = Path(f"advent{YEAR_NUM}_day{day:02d}.py")
+    if not program_location.exists():
+        program_location.write_text(blank_day)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=f"Fetch Advent of Code {YEAR_NUM} inputs")
+    parser.add_argument('--all', action='store_true', help="Fetch every unlocked day that's missing, concurrently")
+    parser.add_argument('--workers', type=int, default=8, help="Concurrent fetches for --all")
+    parser.add_argument('--source', type=Path, help="Read inputs from this directory instead of the network")
+    args = parser.parse_args()
+
+    puzzle_factory = aocd_puzzle
+    if args.source:
+        LocalPuzzle.source_dir = args.source
+        puzzle_factory = LocalPuzzle
+
+    if args.all:
+        for day, status in sorted(fetch_all(puzzle_factory, workers=args.workers).items()):
+            print(f"Day {day}: {status}")
+            if status == "fetched":
+                write_template(day)
+        return
+
+    new_day = len(list(INPUT_DIR.glob('*.txt'))) + 1
+    try:
+        checksums = load_checksums()
+        checksums[input_location(new_day).name] = fetch_day(new_day, puzzle_factory)
+        write_atomically(CHECKSUMS, json.dumps(dict(sorted(checksums.items())), indent=2))
+    except DayLocked as e:
+        print(f"Day {new_day} not available: {e}")
+        sys.exit(1)
+    write_template(new_day)
+
+
+if __name__ == '__main__':
+    main()
@@ -1,14 +1,597 @@
+from array import array
+from bisect import bisect_left, bisect_right
+from collections import OrderedDict, deque
 from pathlib import Path
-from typing import NamedTuple, Iterator
-from typing_extensions import Self
-import inspect
+from itertools import accumulate, chain, compress, islice, repeat, starmap
+from math import prod
+from operator import add, mod, mul, sub
+from typing import TYPE_CHECKING, Callable, Container, ContextManager, Dict, Hashable, Iterable, Iterator, List
+from typing import NamedTuple, Optional, Set, Tuple, TypeVar, Union
+import contextlib
+import functools
+import os
+import sys
+import time
+import weakref
+
+if TYPE_CHECKING:
+    import cProfile
+    import mmap
+
+    import numpy
+    # typing_extensions pulls in inspect, which costs more to import than the rest of utils put together, and it's
+    # only needed for annotations
+    from typing_extensions import Self
+
+F = TypeVar("F", bound=Callable)
+T = TypeVar("T")
+
+
+INPUT_DIR = Path("inputs")
+CACHE_DIR = Path(".cache")
+INPUT_NAME = "advent2023_day{day:02d}"
+
+
+class CachedInput(NamedTuple):
+    # (mtime, size) of the file when it was loaded, so an edited input gets picked up again
+    signature: Tuple[int, int]
+    raw: bytes
+    text: Optional[str]
+
+
+# Loaded inputs, keyed by path.  The runner reads each day's input again on every --repeat run, as does the daemon on
+# every request that doesn't bring its own input, so only the first of those has to touch the file
+INPUT_CACHE: Dict[Path, CachedInput] = {}
+# Memory-mapped inputs have to stay open as long as anything holds a memoryview into them, so they live here
+MAPPED_INPUTS: Dict[Path, Tuple[Tuple[int, int], "mmap.mmap"]] = {}
+
+
+# Find the automatically-named file generated by get_data.py, either for an explicit day number or for whichever
+# day script called into utils.  depth is how many frames up from input_path() that day script is.
+def input_path(day: Optional[int] = None, depth: int = 1) -> Path:
+    if day is not None:
+        return INPUT_DIR / f"{INPUT_NAME.format(day=day)}_input.txt"
+    # sys._getframe() is a lot cheaper than inspect.stack(), which builds every frame's source context
+    caller_filename = sys._getframe(depth).f_code.co_filename
+    return INPUT_DIR / f"{Path(caller_filename).stem}_input.txt"
+
+
+def file_signature(path: Path) -> Tuple[int, int]:
+    stat = path.stat()
+    return stat.st_mtime_ns, stat.st_size
+
+
+def _load_input(path: Path, decode: bool) -> CachedInput:
+    signature = file_signature(path)
+    cached = INPUT_CACHE.get(path)
+    if cached is None or cached.signature != signature:
+        cached = CachedInput(signature=signature, raw=path.read_bytes(), text=None)
+    if decode and cached.text is None:
+        text = cached.raw.decode()
+        # Match the universal-newline handling read_text() used to give us
+        if "\r" in text:
+            text = text.replace("\r\n", "\n").replace("\r", "\n")
+        cached = cached._replace(text=text)
+    INPUT_CACHE[path] = cached
+    return cached
 
 
 # Grab my input data from the automatically-named file generated by get_data.py
-def read_data():
-    caller_filename = inspect.stack()[1].filename
-    filename = Path(f"inputs/{Path(caller_filename).stem}_input.txt")
-    return filename.read_text()
+def read_data(day: Optional[int] = None) -> str:
+    return _load_input(input_path(day, depth=2), decode=True).text
+
+
+def read_bytes(day: Optional[int] = None) -> bytes:
+    return _load_input(input_path(day, depth=2), decode=False).raw
+
+
+# Zero-copy view of an input file.  Slicing the memoryview doesn't copy either, so big inputs can be parsed in place.
+def map_data(day: Optional[int] = None) -> memoryview:
+    return memoryview(_map_input(input_path(day, depth=2)))
+
+
+# Iterate over an input's lines as memoryview slices of the mapped file, without building a str or a splitlines() list
+def iter_lines(day: Optional[int] = None) -> Iterator[memoryview]:
+    mapped = _map_input(input_path(day, depth=2))
+    view = memoryview(mapped)
+    start, end = 0, len(mapped)
+    while start < end:
+        newline = mapped.find(b"\n", start)
+        if newline == -1:
+            newline = end
+        yield view[start:newline]
+        start = newline + 1
+
+
+def _map_input(path: Path) -> Union["mmap.mmap", bytes]:
+    import mmap
+
+    signature = file_signature(path)
+    # mmap refuses to map an empty file
+    if not signature[1]:
+        return b""
+    cached = MAPPED_INPUTS.get(path)
+    if cached is None or cached[0] != signature:
+        with path.open("rb") as infile:
+            cached = (signature, mmap.mmap(infile.fileno(), 0, access=mmap.ACCESS_READ))
+        MAPPED_INPUTS[path] = cached
+    return cached[1]
+
+
+def clear_input_cache() -> None:
+    INPUT_CACHE.clear()
+    # Anything still holding a view into one of these keeps it alive; dropping our reference is all we can do
+    MAPPED_INPUTS.clear()
+
+
+# Line-parallel map/reduce for days whose lines are independent of each other.  The input gets cut into byte ranges
+# that end on line boundaries, each range is split into lines and scored in a worker process, and the caller reduces
+# the per-chunk results (usually just sum()).  Anything smaller than PIPELINE_MIN_BYTES is scored in-process, since
+# for the real inputs starting the workers costs far more than it saves.
+PIPELINE_MIN_BYTES = 1024 * 1024
+PIPELINE_CHUNK_BYTES = 4 * 1024 * 1024
+
+
+def chunk_ranges(data: Union[str, bytes, "mmap.mmap"], chunk_size: int) -> Iterator[Tuple[int, int]]:
+    newline = "\n" if isinstance(data, str) else b"\n"
+    start, end = 0, len(data)
+    while start < end:
+        stop = start + chunk_size
+        if stop < end:
+            # Extend the chunk to the end of whatever line it stopped partway through
+            line_end = data.find(newline, stop - 1)
+            stop = end if line_end == -1 else line_end + 1
+        yield start, min(stop, end)
+        start = stop
+
+
+def _score_chunk(score: Callable[[List[str]], T], chunk: Union[str, bytes]) -> T:
+    if isinstance(chunk, bytes):
+        chunk = chunk.decode()
+    return score(chunk.splitlines())
+
+
+def _score_file_chunk(score: Callable[[List[str]], T], path: Path, start: int, end: int) -> T:
+    # Workers read their own byte range, so a file-backed input never has to pass through the parent process
+    with path.open("rb") as infile:
+        infile.seek(start)
+        return _score_chunk(score, infile.read(end - start))
+
+
+# Yields score(lines) for each chunk of the input, in input order.  source can be the input itself or the path of a
+# file too big to want in memory.  score has to be picklable (a module-level function, or a partial of one).
+def map_lines(
+    score: Callable[[List[str]], T],
+    source: Union[str, bytes, Path],
+    workers: Optional[int] = None,
+    chunk_size: Optional[int] = None,
+    min_size: Optional[int] = None,
+) -> Iterator[T]:
+    min_size = PIPELINE_MIN_BYTES if min_size is None else min_size
+    chunk_size = chunk_size or PIPELINE_CHUNK_BYTES
+    size = source.stat().st_size if isinstance(source, Path) else len(source)
+    if size < min_size:
+        yield _score_chunk(score, source.read_bytes() if isinstance(source, Path) else source)
+        return
+    import mmap
+    from concurrent.futures import Future, ProcessPoolExecutor
+
+    if isinstance(source, Path):
+        with source.open("rb") as infile, mmap.mmap(infile.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            ranges = list(chunk_ranges(mapped, chunk_size))
+        jobs = ((_score_file_chunk, score, source, start, end) for start, end in ranges)
+    else:
+        jobs = ((_score_chunk, score, source[start:end]) for start, end in chunk_ranges(source, chunk_size))
+    workers = workers or os.cpu_count() or 1
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        # Only keep a couple of chunks per worker in flight, so memory stays flat however big the input is
+        pending: "deque[Future]" = deque()
+        for job in jobs:
+            pending.append(pool.submit(*job))
+            if len(pending) >= workers * 2:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
+
+
+# Opt-in on-disk cache of parsed inputs, for days whose parsing does real work (walking segments, dropping bricks...).
+# Entries are pickles keyed on the input text plus the source of the day module and of utils, so editing
+# either the input or the code that builds the structure means a miss rather than a stale object.
+class ParseCache:
+    enabled: bool = bool(os.environ.get("ADVENT2023_PARSE_CACHE"))
+    directory: Path = CACHE_DIR / "parsed"
+    # Least-recently-used entries get evicted once the directory grows past this
+    max_bytes: int = 256 * 1024 * 1024
+    hits: int = 0
+    misses: int = 0
+
+
+def enable_parse_cache(directory: Optional[Path] = None, max_bytes: Optional[int] = None) -> None:
+    ParseCache.enabled = True
+    ParseCache.directory = Path(directory) if directory else ParseCache.directory
+    ParseCache.max_bytes = max_bytes if max_bytes is not None else ParseCache.max_bytes
+
+
+def disable_parse_cache() -> None:
+    ParseCache.enabled = False
+
+
+def content_hash(*chunks: bytes) -> str:
+    import hashlib
+
+    digest = hashlib.blake2b(digest_size=16)
+    for chunk in chunks:
+        digest.update(chunk)
+    return digest.hexdigest()
+
+
+def source_bytes(module_name: str) -> bytes:
+    return _load_input(Path(sys.modules[module_name].__file__), decode=False).raw
+
+
+# Build a day's parsed structure from its input, e.g. cached_parse(Hike) instead of Hike(read_data()).  With the cache
+# switched off this is exactly that; with it on, a previous run's pickled result is loaded instead when there is one.
+def cached_parse(build: Callable[[str], T], raw_input: str) -> T:
+    if not ParseCache.enabled:
+        return build(raw_input)
+    import pickle
+
+    key = content_hash(
+        raw_input.encode(),
+        source_bytes(build.__module__),
+        source_bytes(__name__),
+        # Run as a script, the day's classes pickle as __main__.X, which won't load under the runner's module name
+        f"{build.__module__}.{build.__qualname__}".encode(),
+    )
+    entry = ParseCache.directory / f"{Path(sys.modules[build.__module__].__file__).stem}_{key}.pickle"
+    try:
+        parsed = pickle.loads(entry.read_bytes())
+        # Bump the mtime so eviction sees this entry as recently used
+        os.utime(entry)
+        ParseCache.hits += 1
+        return parsed
+    except (OSError, pickle.UnpicklingError, EOFError, AttributeError):
+        pass
+    ParseCache.misses += 1
+    parsed = build(raw_input)
+    ParseCache.directory.mkdir(parents=True, exist_ok=True)
+    # Write then rename, so a parallel run never sees a half-written pickle
+    temp_entry = entry.with_suffix(f".{os.getpid()}.tmp")
+    temp_entry.write_bytes(pickle.dumps(parsed, protocol=pickle.HIGHEST_PROTOCOL))
+    temp_entry.replace(entry)
+    evict_lru(ParseCache.directory, ParseCache.max_bytes)
+    return parsed
+
+
+def evict_lru(directory: Path, max_bytes: int) -> None:
+    entries = []
+    for entry in directory.iterdir():
+        try:
+            stat = entry.stat()
+        except OSError:
+            continue
+        entries.append((stat.st_mtime_ns, stat.st_size, entry))
+    total = sum(x[1] for x in entries)
+    for _, size, entry in sorted(entries):
+        if total <= max_bytes:
+            break
+        entry.unlink(missing_ok=True)
+        total -= size
+
+
+# Per-phase timing (parse / part one / part two), switched on by the runner.  While it's off, phase() hands back a
+# shared no-op context manager, so the day scripts can leave their phase markers in without paying for them.
+class PhaseSettings:
+    enabled: bool = False
+    # When set, phases named in profile_phases (or every phase, if that's None) get run under cProfile and dumped here
+    profile_dir: Optional[Path] = None
+    profile_phases: Optional[Set[str]] = None
+    profile_prefix: str = ""
+    timings: Dict[str, float] = {}
+    # When set (and tracemalloc is tracing), each phase's memory use gets recorded too
+    trace_memory: bool = False
+    memory: Dict[str, "MemoryUsage"] = {}
+
+
+NO_PHASE = contextlib.nullcontext()
+
+
+class MemoryUsage(NamedTuple):
+    # Highest traced memory above what was already allocated when the block started, in bytes
+    peak: int
+    # Net change in allocated memory blocks, i.e. roughly how many objects the block left behind
+    blocks: int
+
+    def combine(self, other: "MemoryUsage") -> "MemoryUsage":
+        return MemoryUsage(max(self.peak, other.peak), self.blocks + other.blocks)
+
+
+class MemoryTracker:
+    # Measures a block's memory use through tracemalloc, which has to be started already.  tracemalloc only keeps one
+    # peak, and each tracker resets it on the way in, so a nested tracker passes the peak it saw back to the one
+    # around it rather than losing it.
+    active: List["MemoryTracker"] = []
+    start: int
+    start_blocks: int
+    inner_peak: int
+    usage: Optional[MemoryUsage] = None
+
+    def __enter__(self) -> "MemoryTracker":
+        import tracemalloc
+
+        current, peak = tracemalloc.get_traced_memory()
+        if self.active:
+            self.active[-1].inner_peak = max(self.active[-1].inner_peak, peak)
+        tracemalloc.reset_peak()
+        self.start, self.start_blocks, self.inner_peak = current, sys.getallocatedblocks(), 0
+        self.active.append(self)
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        import tracemalloc
+
+        _, peak = tracemalloc.get_traced_memory()
+        peak = max(peak, self.inner_peak)
+        self.active.pop()
+        if self.active:
+            self.active[-1].inner_peak = max(self.active[-1].inner_peak, peak)
+        self.usage = MemoryUsage(peak - self.start, sys.getallocatedblocks() - self.start_blocks)
+
+
+class Phase:
+    name: str
+    start: float
+    profiler: Optional["cProfile.Profile"]
+    memory: Optional[MemoryTracker]
+
+    def __init__(self, name: str):
+        self.name = name
+        self.profiler = None
+        self.memory = None
+
+    def __enter__(self) -> "Phase":
+        wanted = PhaseSettings.profile_phases is None or self.name in PhaseSettings.profile_phases
+        if PhaseSettings.profile_dir and wanted:
+            # Only pull in cProfile when someone actually asks for a profile
+            import cProfile
+
+            self.profiler = cProfile.Profile()
+            self.profiler.enable()
+        if PhaseSettings.trace_memory:
+            self.memory = MemoryTracker().__enter__()
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        elapsed = time.perf_counter() - self.start
+        if self.memory:
+            self.memory.__exit__(*exc_info)
+            previous = PhaseSettings.memory.get(self.name)
+            usage = self.memory.usage
+            PhaseSettings.memory[self.name] = previous.combine(usage) if previous else usage
+        if self.profiler:
+            self.profiler.disable()
+            dump_profile(self.profiler, PhaseSettings.profile_dir / f"{PhaseSettings.profile_prefix}{self.name}")
+        # A phase can be entered more than once per run (e.g. in a loop), so accumulate
+        PhaseSettings.timings[self.name] = PhaseSettings.timings.get(self.name, 0.0) + elapsed
+
+
+def phase(name: str) -> ContextManager:
+    return Phase(name) if PhaseSettings.enabled else NO_PHASE
+
+
+def timed_phase(name: str) -> Callable[[F], F]:
+    # Decorator version of phase(), for when a whole function is one phase
+    def decorator(func: F) -> F:
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with phase(name):
+                return func(*args, **kwargs)
+
+        return wrapper
+
+    return decorator
+
+
+def enable_phases(
+    profile_dir: Optional[Path] = None,
+    profile_phases: Optional[Set[str]] = None,
+    profile_prefix: str = "",
+    trace_memory: bool = False,
+) -> None:
+    PhaseSettings.enabled = True
+    PhaseSettings.trace_memory = trace_memory
+    PhaseSettings.profile_dir = Path(profile_dir) if profile_dir else None
+    PhaseSettings.profile_phases = profile_phases
+    PhaseSettings.profile_prefix = profile_prefix
+    if PhaseSettings.profile_dir:
+        PhaseSettings.profile_dir.mkdir(parents=True, exist_ok=True)
+
+
+def disable_phases() -> None:
+    PhaseSettings.enabled = False
+    PhaseSettings.profile_dir = None
+    PhaseSettings.trace_memory = False
+
+
+def pop_phase_timings() -> Dict[str, float]:
+    timings, PhaseSettings.timings = PhaseSettings.timings, {}
+    return timings
+
+
+def pop_phase_memory() -> Dict[str, MemoryUsage]:
+    memory, PhaseSettings.memory = PhaseSettings.memory, {}
+    return memory
+
+
+# Memoization for the recursive days, in place of functools.lru_cache.  On a method, lru_cache keys on self, so every
+# instance it's ever seen stays alive in one cache that only grows.  memoize() instead keeps the cache on the instance
+# itself (scope="instance"), so it goes when the instance does, or one cache per function (scope="call") that the
+# runner clears before each part.  Either way maxsize bounds each cache, evicting the least recently used entries, and
+# every memoized function keeps hit/miss counters the runner can read back.
+MEMO_SCOPES = ("instance", "call")
+MISSING = object()
+
+
+class MemoStats(NamedTuple):
+    hits: int
+    misses: int
+    evictions: int
+    # The most entries any one of its caches held
+    peak_size: int
+
+
+class Memoized:
+    # Every memoized function by qualname, for clear_memos() and pop_memo_stats()
+    registry: Dict[str, "Memoized"] = {}
+
+    def __init__(self, func: Callable, maxsize: Optional[int], scope: str):
+        if scope not in MEMO_SCOPES:
+            raise ValueError(f"Unknown memo scope {scope!r}, expected one of {MEMO_SCOPES}")
+        functools.update_wrapper(self, func)
+        self.func = func
+        self.maxsize = maxsize
+        self.scope = scope
+        # hits, misses, evictions, peak size
+        self.counts = [0, 0, 0, 0]
+        self.shared = self.new_cache()
+        self.call_shared = self.cached(self.shared)
+        self.registry[func.__qualname__] = self
+
+    def new_cache(self) -> Dict:
+        # Plain dicts are cheaper when nothing ever needs evicting
+        return OrderedDict() if self.maxsize else {}
+
+    def cached(self, cache: Dict, instance=None) -> Callable:
+        # For an instance's own cache, the closure only holds a weak reference to it.  The closure lives in the
+        # instance's __dict__, so a strong one would be a reference cycle that only the cyclic GC could free.
+        func, maxsize, counts = self.func, self.maxsize, self.counts
+        instance_ref = weakref.ref(instance) if instance is not None else None
+        freed = f"{self.__qualname__} called after its instance was freed"
+
+        def unbounded(*args, **kwargs):
+            key = (args, tuple(kwargs.items())) if kwargs else args
+            value = cache.get(key, MISSING)
+            if value is not MISSING:
+                counts[0] += 1
+                return value
+            counts[1] += 1
+            if instance_ref is None:
+                value = cache[key] = func(*args, **kwargs)
+            elif (owner := instance_ref()) is not None:
+                value = cache[key] = func(owner, *args, **kwargs)
+            else:
+                raise ReferenceError(freed)
+            if len(cache) > counts[3]:
+                counts[3] = len(cache)
+            return value
+
+        def lru(*args, **kwargs):
+            key = (args, tuple(kwargs.items())) if kwargs else args
+            value = cache.get(key, MISSING)
+            if value is not MISSING:
+                counts[0] += 1
+                cache.move_to_end(key)
+                return value
+            counts[1] += 1
+            if instance_ref is None:
+                value = cache[key] = func(*args, **kwargs)
+            elif (owner := instance_ref()) is not None:
+                value = cache[key] = func(owner, *args, **kwargs)
+            else:
+                raise ReferenceError(freed)
+            if len(cache) > maxsize:
+                cache.popitem(last=False)
+                counts[2] += 1
+            counts[3] = max(counts[3], len(cache))
+            return value
+
+        return lru if maxsize else unbounded
+
+    def __call__(self, *args, **kwargs):
+        return self.call_shared(*args, **kwargs)
+
+    def __get__(self, instance, owner=None) -> Callable:
+        if instance is None:
+            return self
+        if self.scope == "call":
+            return functools.partial(self.call_shared, instance)
+        # The instance keeps its own cached copy of the method under the method's name.  This is a non-data
+        # descriptor, so from then on that's found in the instance's __dict__ without coming back through here (which
+        # also means instance-scoped classes can't use __slots__).
+        bound = self.cached(self.new_cache(), instance)
+        instance.__dict__[self.__name__] = bound
+        return bound
+
+    def cache_clear(self, instance=None) -> None:
+        # With an instance, just that instance's cache (e.g. after it's changed in a way that invalidates it)
+        if instance is None:
+            self.shared.clear()
+        else:
+            instance.__dict__.pop(self.__name__, None)
+
+    def pop_stats(self) -> MemoStats:
+        stats = MemoStats(*self.counts)
+        self.counts[:] = [0, 0, 0, 0]
+        return stats
+
+
+def memoize(maxsize: Optional[int] = None, scope: str = "instance") -> Callable[[Callable], Memoized]:
+    def decorator(func: Callable) -> Memoized:
+        return Memoized(func, maxsize, scope)
+
+    return decorator
+
+
+def clear_memos() -> None:
+    # The runner calls this before each part, so neither part gets a head start from the other's call-scoped caches
+    for memo in Memoized.registry.values():
+        memo.cache_clear()
+
+
+def pop_memo_stats() -> Dict[str, MemoStats]:
+    # Counters since the last call, for the functions that were actually called
+    stats = {name: memo.pop_stats() for name, memo in Memoized.registry.items()}
+    return {name: x for name, x in stats.items() if x.hits or x.misses}
+
+
+# Writes both a .prof for pstats/snakeviz and a collapsed-stack .folded file for flamegraph.pl/speedscope.
+# cProfile only records caller->callee edges rather than whole stacks, so the stacks get rebuilt by walking the call
+# graph down from the roots and splitting each function's time across its callers in proportion to the edge times.
+def dump_profile(profiler: "cProfile.Profile", base_path: Path) -> None:
+    import pstats
+
+    profiler.dump_stats(base_path.with_suffix(".prof"))
+    stats = pstats.Stats(profiler).stats
+    callees: Dict[Tuple, List[Tuple[Tuple, float]]] = {}
+    for func, (_, _, _, _, callers) in stats.items():
+        for caller, (_, _, _, edge_cumtime) in callers.items():
+            callees.setdefault(caller, []).append((func, edge_cumtime))
+
+    def label(func: Tuple) -> str:
+        filename, line, name = func
+        return f"{name} ({Path(filename).name}:{line})" if line else name
+
+    folded: Dict[str, float] = {}
+
+    def walk(func: Tuple, stack: Tuple[str, ...], share: float, on_stack: Set[Tuple]) -> None:
+        _, _, tottime, cumtime, _ = stats[func]
+        stack = stack + (label(func).replace(";", ","),)
+        fraction = share / cumtime if cumtime else 0.0
+        key = ";".join(stack)
+        folded[key] = folded.get(key, 0.0) + tottime * fraction
+        for callee, edge_cumtime in callees.get(func, []):
+            if callee not in on_stack:
+                walk(callee, stack, edge_cumtime * fraction, on_stack | {callee})
+
+    for func, (_, _, _, cumtime, callers) in stats.items():
+        if not callers:
+            walk(func, (), cumtime, {func})
+
+    with base_path.with_suffix(".folded").open("w") as outfile:
+        for stack, seconds in folded.items():
+            if (micros := round(seconds * 1_000_000)) > 0:
+                outfile.write(f"{stack} {micros}\n")
 
 
 class BaseCoord(NamedTuple):
@@ -16,23 +599,23 @@ class BaseCoord(NamedTuple):
     y: int
     x: int
 
-    def __add__(self, other: Self) -> Self:
+    def __add__(self, other: "Self") -> "Self":
         # Using self.__class__ because this is intended to be subclassed and I want to return the subclass
         return self.__class__(x=self.x + other.x, y=self.y + other.y)
 
-    def __sub__(self, other: Self) -> Self:
+    def __sub__(self, other: "Self") -> "Self":
         return self.__class__(x=self.x - other.x, y=self.y - other.y)
 
-    def __mul__(self, amount: int) -> Self:
+    def __mul__(self, amount: int) -> "Self":
         return self.__class__(x=self.x * amount, y=self.y * amount)
 
-    def distance(self, other: Self) -> int:
+    def distance(self, other: "Self") -> int:
         return abs(self.x - other.x) + abs(self.y - other.y)
 
-    def neighbors(self) -> Iterator[Self]:
+    def neighbors(self) -> Iterator["Self"]:
         yield from (self + x for x in ALL_NEIGHBORS_2D)
 
-    def cardinal_neighbors(self) -> Iterator[Self]:
+    def cardinal_neighbors(self) -> Iterator["Self"]:
         yield from (self + x for x in CARDINAL_NEIGHBORS_2D)
 
     def __repr__(self) -> str:
@@ -44,22 +627,22 @@ class BaseCoord3D(NamedTuple):
     x: int
     z: int
 
-    def __add__(self, other: Self) -> Self:
+    def __add__(self, other: "Self") -> "Self":
         return self.__class__(x=self.x + other.x, y=self.y + other.y, z=self.z + other.z)
 
-    def __sub__(self, other: Self) -> Self:
+    def __sub__(self, other: "Self") -> "Self":
         return self.__class__(x=self.x - other.x, y=self.y - other.y, z=self.z - other.z)
 
-    def __mul__(self, amount: int) -> Self:
+    def __mul__(self, amount: int) -> "Self":
         return self.__class__(x=self.x * amount, y=self.y * amount, z=self.z * amount)
 
-    def distance(self, other: Self) -> int:
+    def distance(self, other: "Self") -> int:
         return abs(self.x - other.x) + abs(self.y - other.y) + abs(self.z - other.z)
 
-    def neighbors(self) -> Iterator[Self]:
+    def neighbors(self) -> Iterator["Self"]:
         yield from (self + x for x in ALL_NEIGHBORS_3D)
 
-    def cardinal_neighbors(self) -> Iterator[Self]:
+    def cardinal_neighbors(self) -> Iterator["Self"]:
         yield from (self + x for x in CARDINAL_NEIGHBORS_3D)
 
     def __repr__(self) -> str:
@@ -76,3 +659,857 @@ ALL_NEIGHBORS_3D = tuple(
 )
 CARDINAL_NEIGHBORS_2D = tuple(x for x in ALL_NEIGHBORS_2D if not (abs(x.x) == abs(x.y)))
 CARDINAL_NEIGHBORS_3D = tuple(x for x in ALL_NEIGHBORS_3D if abs(x.x) + abs(x.y) + abs(x.z) == 1)
+
+
+# A batch of 2D coords stored as a column of ys and a column of xs, for solvers that work on whole sets of coords at
+# once.  Arithmetic runs as map()s over the columns, so there's no Python-level loop or NamedTuple per coord.  The
+# columns are plain lists of ints (numpy's int64 would overflow on day 24's hailstones), and to_numpy() gives the same
+# data as a structured array for anyone who has numpy installed.
+class CoordArray:
+    ys: List[int]
+    xs: List[int]
+
+    def __init__(self, ys: Iterable[int] = (), xs: Iterable[int] = ()):
+        self.ys, self.xs = list(ys), list(xs)
+
+    @classmethod
+    def from_coords(cls, coords: Iterable[BaseCoord]) -> "Self":
+        columns = tuple(zip(*coords))
+        return cls(*columns) if columns else cls()
+
+    @classmethod
+    def concat(cls, arrays: Iterable["CoordArray"]) -> "Self":
+        arrays = list(arrays)
+        return cls(chain.from_iterable(x.ys for x in arrays), chain.from_iterable(x.xs for x in arrays))
+
+    def __len__(self) -> int:
+        return len(self.ys)
+
+    def __iter__(self) -> Iterator[BaseCoord]:
+        return map(BaseCoord, self.ys, self.xs)
+
+    def __getitem__(self, index: Union[int, slice]) -> Union[BaseCoord, "Self"]:
+        if isinstance(index, slice):
+            return self.__class__(self.ys[index], self.xs[index])
+        return BaseCoord(y=self.ys[index], x=self.xs[index])
+
+    def __repr__(self) -> str:
+        return f"CoordArray({list(self)})"
+
+    @staticmethod
+    def _columns(other: Union["CoordArray", BaseCoord]) -> Tuple[Iterable[int], Iterable[int]]:
+        # A single coord gets broadcast against every row
+        if isinstance(other, CoordArray):
+            return other.ys, other.xs
+        return repeat(other.y), repeat(other.x)
+
+    def __add__(self, other: Union["CoordArray", BaseCoord]) -> "Self":
+        ys, xs = self._columns(other)
+        return self.__class__(map(add, self.ys, ys), map(add, self.xs, xs))
+
+    def __sub__(self, other: Union["CoordArray", BaseCoord]) -> "Self":
+        ys, xs = self._columns(other)
+        return self.__class__(map(sub, self.ys, ys), map(sub, self.xs, xs))
+
+    def __mul__(self, amount: int) -> "Self":
+        return self.__class__(map(mul, self.ys, repeat(amount)), map(mul, self.xs, repeat(amount)))
+
+    def __mod__(self, size: Union["CoordArray", BaseCoord]) -> "Self":
+        # Wrap every coord onto a height x width tile, for grids that repeat forever
+        ys, xs = self._columns(size)
+        return self.__class__(map(mod, self.ys, ys), map(mod, self.xs, xs))
+
+    def distances(self, other: Union["CoordArray", BaseCoord]) -> List[int]:
+        ys, xs = self._columns(other)
+        return list(map(add, map(abs, map(sub, self.ys, ys)), map(abs, map(sub, self.xs, xs))))
+
+    def pairwise_distance_sum(self) -> int:
+        # Sum of the Manhattan distance between every pair, without visiting the pairs: along each axis, once sorted,
+        # the i-th of n values is subtracted from the n-1-i values above it and has the i values below subtracted
+        # from it, so it contributes value * (2i - n + 1)
+        n = len(self)
+        return sum(sum(map(mul, sorted(column), range(1 - n, n, 2))) for column in (self.ys, self.xs))
+
+    def cross(self, other: Union["CoordArray", BaseCoord]) -> List[int]:
+        # Row-by-row 2D cross product (the determinant of each pair of coords), x * other.y - y * other.x
+        ys, xs = self._columns(other)
+        return list(map(sub, map(mul, self.xs, ys), map(mul, self.ys, xs)))
+
+    def roll(self, shift: int) -> "Self":
+        # Like numpy.roll: row i of the result is row i - shift of this one
+        shift %= len(self) or 1
+        return self.__class__(self.ys[-shift:] + self.ys[:-shift], self.xs[-shift:] + self.xs[:-shift])
+
+    def shoelace(self) -> int:
+        # Twice the signed area of the polygon with these coords as its vertices, in order
+        return sum(self.cross(self.roll(-1)))
+
+    def neighbors(self, deltas: Iterable[BaseCoord] = CARDINAL_NEIGHBORS_2D) -> "Self":
+        # Every coord stepped by every delta, one block per delta (duplicates and all; see unique())
+        return self.concat(self + x for x in deltas)
+
+    def unique(self) -> "Self":
+        # Set-like dedup that keeps the first occurrence of each coord, in order
+        return self.__class__(*self._unzip(dict.fromkeys(zip(self.ys, self.xs))))
+
+    def isin(self, coords: Container) -> List[bool]:
+        # Plain (y, x) tuples hash and compare the same as BaseCoords, so this works against a Set[BaseCoord]
+        return list(map(coords.__contains__, zip(self.ys, self.xs)))
+
+    def select(self, mask: Iterable[bool]) -> "Self":
+        mask = list(mask)
+        return self.__class__(compress(self.ys, mask), compress(self.xs, mask))
+
+    def to_set(self) -> Set[BaseCoord]:
+        return set(self)
+
+    def to_numpy(self) -> "numpy.ndarray":
+        # numpy is optional, so only import it if someone asks for an array
+        import numpy
+
+        array = numpy.empty(len(self), dtype=[("y", numpy.int64), ("x", numpy.int64)])
+        array["y"], array["x"] = self.ys, self.xs
+        return array
+
+    @staticmethod
+    def _unzip(pairs: Iterable[Tuple[int, int]]) -> Tuple[Iterable[int], Iterable[int]]:
+        columns = tuple(zip(*pairs))
+        return columns if columns else ((), ())
+
+
+# Packed-integer coordinates: an opt-in alternative to BaseCoord for hot loops.  A coord is stored as a single int,
+# (y + margin) * stride + (x + margin), so stepping is an int add and sets/dicts hash ints instead of NamedTuples.
+# margin leaves room for coordinates that wander a little outside the width x height window (e.g. off the edge).
+class PackedCoords:
+    width: int
+    height: int
+    margin: int
+    stride: int
+    coord_class: type
+    # Deltas in the same order as CARDINAL_NEIGHBORS_2D/ALL_NEIGHBORS_2D, plus the usual compass names
+    cardinal_deltas: Tuple[int, ...]
+    all_deltas: Tuple[int, ...]
+    directions: Dict[str, int]
+
+    def __init__(self, width: int, height: int, margin: int = 1, coord_class: type = BaseCoord):
+        self.width, self.height, self.margin, self.coord_class = width, height, margin, coord_class
+        self.stride = width + 2 * margin
+        self.cardinal_deltas = tuple(self.delta(x) for x in CARDINAL_NEIGHBORS_2D)
+        self.all_deltas = tuple(self.delta(x) for x in ALL_NEIGHBORS_2D)
+        self.directions = {
+            "N": self.delta(BaseCoord(y=-1, x=0)),
+            "E": self.delta(BaseCoord(y=0, x=1)),
+            "S": self.delta(BaseCoord(y=1, x=0)),
+            "W": self.delta(BaseCoord(y=0, x=-1)),
+        }
+
+    def pack(self, coord: BaseCoord) -> int:
+        return (coord.y + self.margin) * self.stride + coord.x + self.margin
+
+    def pack_yx(self, y: int, x: int) -> int:
+        return (y + self.margin) * self.stride + x + self.margin
+
+    def unpack(self, packed: int) -> BaseCoord:
+        y, x = divmod(packed, self.stride)
+        return self.coord_class(y=y - self.margin, x=x - self.margin)
+
+    def delta(self, offset: BaseCoord) -> int:
+        # Turn a relative Coord (a direction, or a direction * distance) into an offset that can be added to a
+        # packed int
+        return offset.y * self.stride + offset.x
+
+    def distance(self, first: int, second: int) -> int:
+        first_y, first_x = divmod(first, self.stride)
+        second_y, second_x = divmod(second, self.stride)
+        return abs(first_x - second_x) + abs(first_y - second_y)
+
+    def neighbors(self, packed: int) -> Tuple[int, ...]:
+        return tuple(packed + x for x in self.all_deltas)
+
+    def cardinal_neighbors(self, packed: int) -> Tuple[int, ...]:
+        return tuple(packed + x for x in self.cardinal_deltas)
+
+    def in_bounds(self, packed: int) -> bool:
+        y, x = divmod(packed, self.stride)
+        return self.margin <= y < self.height + self.margin and self.margin <= x < self.width + self.margin
+
+
+class PackedCoords3D:
+    width: int
+    height: int
+    depth: int
+    margin: int
+    stride: int
+    layer: int
+    coord_class: type
+    cardinal_deltas: Tuple[int, ...]
+    all_deltas: Tuple[int, ...]
+
+    def __init__(self, width: int, height: int, depth: int, margin: int = 1, coord_class: type = BaseCoord3D):
+        self.width, self.height, self.depth, self.margin = width, height, depth, margin
+        self.coord_class = coord_class
+        self.stride = width + 2 * margin
+        self.layer = self.stride * (height + 2 * margin)
+        self.cardinal_deltas = tuple(self.delta(x) for x in CARDINAL_NEIGHBORS_3D)
+        self.all_deltas = tuple(self.delta(x) for x in ALL_NEIGHBORS_3D)
+
+    def pack(self, coord: BaseCoord3D) -> int:
+        return (coord.z + self.margin) * self.layer + (coord.y + self.margin) * self.stride + coord.x + self.margin
+
+    def unpack(self, packed: int) -> BaseCoord3D:
+        z, rest = divmod(packed, self.layer)
+        y, x = divmod(rest, self.stride)
+        return self.coord_class(y=y - self.margin, x=x - self.margin, z=z - self.margin)
+
+    def delta(self, offset: BaseCoord3D) -> int:
+        return offset.z * self.layer + offset.y * self.stride + offset.x
+
+    def distance(self, first: int, second: int) -> int:
+        first_z, first_rest = divmod(first, self.layer)
+        first_y, first_x = divmod(first_rest, self.stride)
+        second_z, second_rest = divmod(second, self.layer)
+        second_y, second_x = divmod(second_rest, self.stride)
+        return abs(first_x - second_x) + abs(first_y - second_y) + abs(first_z - second_z)
+
+    def neighbors(self, packed: int) -> Tuple[int, ...]:
+        return tuple(packed + x for x in self.all_deltas)
+
+    def cardinal_neighbors(self, packed: int) -> Tuple[int, ...]:
+        return tuple(packed + x for x in self.cardinal_deltas)
+
+
+# 256-byte bytes.translate() table that maps every character in chars to 1 and everything else to 0 (or the other way
+# around with invert), so a whole grid can be searched for a set of characters with one translate and some finds
+@functools.lru_cache(maxsize=None)
+def char_mask(chars: bytes, invert: bool = False) -> bytes:
+    return bytes((x in chars) != invert for x in range(256))
+
+
+# A character grid stored as one flat bytearray, for the grid days that would otherwise keep a Dict/Set of Coords.
+# Cells are addressed by their PackedCoords value, and the real cells are surrounded by `margin` rings of pad_char so
+# that neighbor lookups never need a bounds check: walking off the edge just lands on padding.
+class Grid(PackedCoords):
+    pad_char: bytes
+    cells: bytearray
+
+    def __init__(self, width: int, height: int, fill: bytes = b".", margin: int = 1, pad_char: bytes = b"#"):
+        super().__init__(width, height, margin=margin)
+        self.pad_char = pad_char
+        padding_row = pad_char * self.stride
+        inner_row = pad_char * margin + fill * width + pad_char * margin
+        self.cells = bytearray(padding_row * margin + inner_row * height + padding_row * margin)
+
+    @classmethod
+    def from_str(cls, raw_grid: str, margin: int = 1, pad_char: bytes = b"#") -> "Self":
+        lines = raw_grid.encode().splitlines()
+        grid = cls(len(lines[0]), len(lines), margin=margin, pad_char=pad_char)
+        side = pad_char * margin
+        padding_row = pad_char * grid.stride
+        grid.cells[:] = padding_row * margin + b"".join(side + x + side for x in lines) + padding_row * margin
+        return grid
+
+    def __str__(self) -> str:
+        return "\n".join(
+            self.cells[self.pack_yx(y, 0) : self.pack_yx(y, self.width)].decode() for y in range(self.height)
+        )
+
+    def __len__(self) -> int:
+        return self.width * self.height
+
+    def __getitem__(self, packed: int) -> int:
+        return self.cells[packed]
+
+    def __setitem__(self, packed: int, value: int):
+        self.cells[packed] = value
+
+    def copy(self) -> "Self":
+        new = self.__class__.__new__(self.__class__)
+        new.__dict__.update(self.__dict__)
+        new.cells = self.cells[:]
+        return new
+
+    def get(self, coord: BaseCoord) -> int:
+        return self.cells[self.pack(coord)]
+
+    def indices(self) -> Iterator[int]:
+        # Every real (non-padding) cell, row by row
+        if not self.margin:
+            return iter(range(len(self.cells)))
+        return self._padded_indices()
+
+    def _padded_indices(self) -> Iterator[int]:
+        for y in range(self.height):
+            start = self.pack_yx(y, 0)
+            yield from range(start, start + self.width)
+
+    def find(self, char: bytes) -> int:
+        # Just the first match, so this stops scanning there rather than going through find_all()
+        index = self.cells.find(char, self.pack_yx(0, 0))
+        # Only searching for the padding character can turn up the border
+        while index != -1 and self.margin and char == self.pad_char and not self.in_bounds(index):
+            index = self.cells.find(char, index + 1)
+        if index == -1:
+            raise ValueError(f"{char!r} not in grid")
+        return index
+
+    def find_all(self, char: bytes) -> List[int]:
+        found = []
+        index = self.cells.find(char)
+        while index != -1:
+            found.append(index)
+            index = self.cells.find(char, index + 1)
+        # Searching for the padding character would otherwise turn up the border too
+        if self.margin and char == self.pad_char:
+            found = [x for x in found if self.in_bounds(x)]
+        return found
+
+    def find_any(self, chars: bytes, invert: bool = False) -> List[int]:
+        # Every cell holding any of chars (or, with invert, any character not in chars), in row order.  This is the
+        # bulk path for parsing: one translate turns the grid into a 0/1 mask and compress() picks out the hits, so
+        # no Python code runs per cell.
+        mask = self.cells.translate(char_mask(chars, invert))
+        found = list(compress(range(len(mask)), mask))
+        if self.margin and (self.pad_char in chars) != invert:
+            found = [x for x in found if self.in_bounds(x)]
+        return found
+
+    def unpack_all(self, indices: Iterable[int]) -> Iterator[BaseCoord]:
+        coords = map(divmod, indices, repeat(self.stride))
+        if self.margin:
+            return (self.coord_class(y=y - self.margin, x=x - self.margin) for y, x in coords)
+        # Coords are (y, x) ordered, so divmod's output can go straight in
+        return starmap(self.coord_class, coords)
+
+    def coords_of(self, chars: bytes, invert: bool = False) -> Set[BaseCoord]:
+        return set(self.unpack_all(self.find_any(chars, invert)))
+
+    def cells_of(self, chars: Optional[bytes] = None, invert: bool = False) -> Dict[BaseCoord, str]:
+        # Coord -> character for the cells holding any of chars, or for every cell if chars is None
+        indices = list(self.indices()) if chars is None else self.find_any(chars, invert)
+        return dict(zip(self.unpack_all(indices), map(chr, map(self.cells.__getitem__, indices))))
+
+    def to_numpy(self, include_padding: bool = False) -> "numpy.ndarray":
+        # numpy is optional, so only import it if someone asks for an array
+        import numpy
+
+        array = numpy.frombuffer(self.cells, dtype=numpy.uint8).reshape(-1, self.stride)
+        if include_padding or not self.margin:
+            return array
+        return array[self.margin : -self.margin, self.margin : -self.margin]
+
+
+# A directed graph over interned node names, stored in compressed sparse row (CSR) form: node ids are dense ints in
+# the order names were first seen, node i's edges are targets[offsets[i]:offsets[i + 1]] (in the order they were
+# added), and weights runs parallel to targets.  Walking it is array indexing on ints rather than hashing strings or
+# Coords at every step.  Undirected graphs just add each edge both ways.
+class Graph:
+    names: List[Hashable]
+    ids: Dict[Hashable, int]
+    offsets: array
+    targets: array
+    weights: array
+
+    def __init__(self, names: List[Hashable], sources: Iterable[int], targets: Iterable[int], weights: Iterable[int]):
+        self.names = names
+        self.ids = {name: i for i, name in enumerate(names)}
+        sources, targets, weights = list(sources), list(targets), list(weights)
+        counts = [0] * len(names)
+        for source in sources:
+            counts[source] += 1
+        self.offsets = array("q", accumulate(counts, initial=0))
+        # sorted() is stable, so each node's edges stay in the order they were added
+        order = sorted(range(len(sources)), key=sources.__getitem__)
+        self.targets = array("q", map(targets.__getitem__, order))
+        self.weights = array("q", map(weights.__getitem__, order))
+
+    @classmethod
+    def from_edges(cls, edges: Iterable[Tuple], nodes: Iterable[Hashable] = ()) -> "Self":
+        # Each edge is (source, target) or (source, target, weight).  Nodes get ids in the order they're first seen,
+        # starting with anything in nodes, which is also how to include nodes that have no edges at all.
+        ids: Dict[Hashable, int] = {}
+        for name in nodes:
+            ids.setdefault(name, len(ids))
+        sources, targets, weights = [], [], []
+        for source, target, *weight in edges:
+            sources.append(ids.setdefault(source, len(ids)))
+            targets.append(ids.setdefault(target, len(ids)))
+            weights.append(weight[0] if weight else 1)
+        return cls(list(ids), sources, targets, weights)
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    def __contains__(self, name: Hashable) -> bool:
+        return name in self.ids
+
+    def __repr__(self):
+        return f"Graph({len(self)} nodes, {len(self.targets)} edges)"
+
+    def node_id(self, name: Hashable) -> int:
+        return self.ids[name]
+
+    def degree(self, node: int) -> int:
+        return self.offsets[node + 1] - self.offsets[node]
+
+    def neighbors(self, node: int) -> array:
+        return self.targets[self.offsets[node] : self.offsets[node + 1]]
+
+    def edges(self, node: int) -> Iterator[Tuple[int, int]]:
+        start, end = self.offsets[node], self.offsets[node + 1]
+        return zip(self.targets[start:end], self.weights[start:end])
+
+    def adjacency(self) -> List[Tuple[Tuple[int, int], ...]]:
+        # Every node's (target, weight) pairs unpacked into tuples, for recursive searches that revisit the same
+        # nodes so often that even the slicing adds up
+        return [tuple(self.edges(x)) for x in range(len(self))]
+
+    def reverse(self) -> "Graph":
+        # Same node ids with every edge flipped, e.g. to find what feeds into a node
+        sources = chain.from_iterable(repeat(x, self.degree(x)) for x in range(len(self)))
+        return Graph(self.names, self.targets, sources, self.weights)
+
+    def bfs(self, start: int) -> Iterator[Tuple[int, int]]:
+        # (node, depth) for every node reachable from start, nearest first
+        seen = bytearray(len(self))
+        seen[start] = 1
+        queue = deque([(start, 0)])
+        while queue:
+            node, depth = queue.popleft()
+            yield node, depth
+            for other in self.neighbors(node):
+                if not seen[other]:
+                    seen[other] = 1
+                    queue.append((other, depth + 1))
+
+    def dfs(self, start: int) -> Iterator[int]:
+        # Every node reachable from start in depth-first preorder, taking each node's edges in order
+        seen = bytearray(len(self))
+        stack = [start]
+        while stack:
+            node = stack.pop()
+            if seen[node]:
+                continue
+            seen[node] = 1
+            yield node
+            stack.extend(x for x in reversed(self.neighbors(node)) if not seen[x])
+
+
+# Shared searches over states encoded as ints in range(num_states), e.g. a Grid index, or index * 4 + heading when
+# the direction matters too.  Distances live in one flat array rather than a dict keyed by Coord, and states nobody
+# reached are left at UNREACHED.
+UNREACHED = sys.maxsize
+
+
+def bfs(
+    starts: Iterable[int],
+    neighbors: Callable[[int], Iterable[int]],
+    num_states: int,
+    on_level: Optional[Callable[[int, List[int]], Optional[bool]]] = None,
+) -> array:
+    # Level by level, so on_level(depth, frontier) sees every state first reached at that depth, and can stop the
+    # search before the level is expanded by returning True.  Returns each state's depth.
+    depths = array("q", [UNREACHED]) * num_states
+    frontier = []
+    for state in starts:
+        if depths[state] == UNREACHED:
+            depths[state] = 0
+            frontier.append(state)
+    depth = 0
+    while frontier:
+        if on_level is not None and on_level(depth, frontier):
+            break
+        depth += 1
+        next_frontier = []
+        for state in frontier:
+            for other in neighbors(state):
+                if depths[other] == UNREACHED:
+                    depths[other] = depth
+                    next_frontier.append(other)
+        frontier = next_frontier
+    return depths
+
+
+def astar(
+    starts: Iterable[int],
+    edges: Callable[[int], Iterable[Tuple[int, int]]],
+    num_states: int,
+    goal: Optional[Callable[[int], bool]] = None,
+    heuristic: Optional[Callable[[int], int]] = None,
+) -> Tuple[Optional[int], array]:
+    # edges(state) gives (next_state, cost) pairs with non-negative int costs.  Rather than a heap, states wait in a
+    # bucket per priority (cost so far + heuristic), which only ever increases as long as the heuristic is consistent
+    # (it never drops by more than the cost of the edge taken), so popping is just walking the buckets in order.
+    # Returns the first goal state settled (or None) and the cost table, which is final for every settled state.
+    distances = array("q", [UNREACHED]) * num_states
+    buckets: List[List[int]] = [[]]
+    for state in starts:
+        distances[state] = 0
+        priority = heuristic(state) if heuristic else 0
+        buckets.extend([] for _ in range(priority + 1 - len(buckets)))
+        buckets[priority].append(state)
+    priority = 0
+    while priority < len(buckets):
+        bucket = buckets[priority]
+        while bucket:
+            state = bucket.pop()
+            cost = distances[state]
+            # Stale entry: this state was queued again at a better priority and has already been handled
+            if cost + (heuristic(state) if heuristic else 0) != priority:
+                continue
+            if goal is not None and goal(state):
+                return state, distances
+            for other, step in edges(state):
+                new_cost = cost + step
+                if new_cost < distances[other]:
+                    distances[other] = new_cost
+                    new_priority = new_cost + heuristic(other) if heuristic else new_cost
+                    buckets.extend([] for _ in range(new_priority + 1 - len(buckets)))
+                    buckets[new_priority].append(other)
+        priority += 1
+    return None, distances
+
+
+def dijkstra(
+    starts: Iterable[int],
+    edges: Callable[[int], Iterable[Tuple[int, int]]],
+    num_states: int,
+    goal: Optional[Callable[[int], bool]] = None,
+) -> Tuple[Optional[int], array]:
+    return astar(starts, edges, num_states, goal)
+
+
+# Progress reports and checkpoints for the long searches that work through a sequence of independent pieces (day 23's
+# DFS subtrees, day 24's candidate rock velocities).  Both are off unless switched on, and even then a search only
+# looks at the clock once per piece, so the pieces themselves run just as fast as before.  A checkpoint records how
+# many pieces are done and the best result so far, so an interrupted search can pick up from there.
+class SearchSettings:
+    on_progress: Optional[Callable[["SearchProgress"], None]] = None
+    progress_interval: float = 1.0
+    checkpoints: bool = bool(os.environ.get("ADVENT2023_CHECKPOINTS"))
+    directory: Path = CACHE_DIR / "checkpoints"
+    checkpoint_interval: float = 10.0
+
+
+class SearchProgress(NamedTuple):
+    name: str
+    explored: int
+    # None for a search that just keeps going until it finds something
+    total: Optional[int]
+    # Pieces per second, counting only the ones done since this run started (not ones a checkpoint skipped)
+    rate: float
+    best: Optional[int]
+    elapsed: float
+
+
+def enable_search_progress(callback: Callable[[SearchProgress], None], interval: Optional[float] = None) -> None:
+    SearchSettings.on_progress = callback
+    SearchSettings.progress_interval = interval if interval is not None else SearchSettings.progress_interval
+
+
+def disable_search_progress() -> None:
+    SearchSettings.on_progress = None
+
+
+def enable_checkpoints(directory: Optional[Path] = None, interval: Optional[float] = None) -> None:
+    SearchSettings.checkpoints = True
+    SearchSettings.directory = Path(directory) if directory else SearchSettings.directory
+    SearchSettings.checkpoint_interval = interval if interval is not None else SearchSettings.checkpoint_interval
+
+
+def disable_checkpoints() -> None:
+    SearchSettings.checkpoints = False
+
+
+def save_checkpoints() -> None:
+    # Checkpoint every search that's still running, e.g. when the runner cancels a day that went over its budget
+    for search in Search.active:
+        if search.checkpoint:
+            search.save()
+    Search.active.clear()
+
+
+class Search:
+    # Searches that haven't finished yet, so save_checkpoints() can write them out when a run gets interrupted
+    active: List["Search"] = []
+    name: str
+    total: Optional[int]
+    explored: int
+    best: Optional[int]
+    checkpoint: Optional[Path]
+
+    def __init__(self, name: str, key: str, total: Optional[int] = None):
+        # key should change whenever the pieces would, e.g. a content_hash() of the input and the searching code
+        self.name = name
+        self.total = total
+        self.explored, self.best = 0, None
+        self.checkpoint = SearchSettings.directory / f"{name}_{key}.json" if SearchSettings.checkpoints else None
+        if self.checkpoint:
+            import json
+
+            try:
+                saved = json.loads(self.checkpoint.read_text())
+                self.explored, self.best = saved["explored"], saved["best"]
+            except (OSError, ValueError, KeyError):
+                pass
+        self.resumed_from = self.explored
+        self.start = time.perf_counter()
+        self.next_report = self.start + SearchSettings.progress_interval
+        self.next_checkpoint = self.start + SearchSettings.checkpoint_interval
+        self.active.append(self)
+
+    def remaining(self, pieces: Iterable[T]) -> Iterator[T]:
+        # The pieces still to do, which is all of them unless this search resumed from a checkpoint
+        return islice(pieces, self.explored, None)
+
+    def advance(self, best: Optional[int] = None) -> None:
+        # Call once each piece is done, with the best result so far if the search has one
+        self.explored += 1
+        if best is not None:
+            self.best = best
+        if not (SearchSettings.on_progress or self.checkpoint):
+            return
+        now = time.perf_counter()
+        if SearchSettings.on_progress and now >= self.next_report:
+            SearchSettings.on_progress(self.progress(now))
+            self.next_report = now + SearchSettings.progress_interval
+        if self.checkpoint and now >= self.next_checkpoint:
+            self.save()
+            self.next_checkpoint = now + SearchSettings.checkpoint_interval
+
+    def progress(self, now: float) -> SearchProgress:
+        elapsed = now - self.start
+        rate = (self.explored - self.resumed_from) / elapsed if elapsed else 0.0
+        return SearchProgress(self.name, self.explored, self.total, rate, self.best, elapsed)
+
+    def save(self) -> None:
+        import json
+
+        self.checkpoint.parent.mkdir(parents=True, exist_ok=True)
+        # Write then rename, so being killed mid-write leaves the previous checkpoint rather than half of this one
+        temp_path = self.checkpoint.with_suffix(f".{os.getpid()}.tmp")
+        temp_path.write_text(json.dumps({"explored": self.explored, "best": self.best}))
+        temp_path.replace(self.checkpoint)
+
+    def finish(self) -> None:
+        # A finished search has nothing to resume, so its checkpoint goes
+        self.active.remove(self)
+        if self.checkpoint:
+            self.checkpoint.unlink(missing_ok=True)
+        if SearchSettings.on_progress:
+            SearchSettings.on_progress(self.progress(time.perf_counter()))
+
+
+# A set of ints kept as sorted, disjoint, non-touching half-open intervals, with starts[i]/stops[i] as the bounds of
+# the i-th one.  Finding the intervals a range touches is a bisect on those bounds, so clipping to or cutting out a
+# range costs O(log n) plus the intervals it actually touches.  Iterating gives the intervals back as ranges.
+class IntervalSet:
+    starts: List[int]
+    stops: List[int]
+
+    def __init__(self, intervals: Iterable[range] = ()):
+        self.starts, self.stops = [], []
+        for interval in sorted((x for x in intervals if x), key=lambda x: x.start):
+            if self.stops and interval.start <= self.stops[-1]:
+                self.stops[-1] = max(self.stops[-1], interval.stop)
+            else:
+                self.starts.append(interval.start)
+                self.stops.append(interval.stop)
+
+    @classmethod
+    def _from_bounds(cls, starts: List[int], stops: List[int]) -> "Self":
+        # For bounds that are already sorted, disjoint and coalesced
+        new = cls.__new__(cls)
+        new.starts, new.stops = starts, stops
+        return new
+
+    def __len__(self) -> int:
+        return sum(self.stops) - sum(self.starts)
+
+    def __bool__(self) -> bool:
+        return bool(self.starts)
+
+    def __contains__(self, value: int) -> bool:
+        i = bisect_right(self.starts, value) - 1
+        return i >= 0 and value < self.stops[i]
+
+    def __iter__(self) -> Iterator[range]:
+        return map(range, self.starts, self.stops)
+
+    def __eq__(self, other) -> bool:
+        return isinstance(other, IntervalSet) and self.starts == other.starts and self.stops == other.stops
+
+    def __repr__(self):
+        return f"IntervalSet({list(self)})"
+
+    def min(self) -> int:
+        return self.starts[0]
+
+    def max(self) -> int:
+        return self.stops[-1] - 1
+
+    def clip(self, start: int, stop: int) -> "IntervalSet":
+        # Only the part inside [start, stop)
+        if start >= stop:
+            return IntervalSet()
+        first, last = bisect_right(self.stops, start), bisect_left(self.starts, stop)
+        starts, stops = self.starts[first:last], self.stops[first:last]
+        if starts:
+            starts[0], stops[-1] = max(starts[0], start), min(stops[-1], stop)
+        return IntervalSet._from_bounds(starts, stops)
+
+    def cut(self, start: int, stop: int) -> "IntervalSet":
+        # Everything but the part inside [start, stop)
+        if start >= stop:
+            return self
+        first, last = bisect_right(self.stops, start), bisect_left(self.starts, stop)
+        starts, stops = self.starts[:first], self.stops[:first]
+        if first < last and self.starts[first] < start:
+            starts.append(self.starts[first])
+            stops.append(start)
+        if first < last and self.stops[last - 1] > stop:
+            starts.append(stop)
+            stops.append(self.stops[last - 1])
+        return IntervalSet._from_bounds(starts + self.starts[last:], stops + self.stops[last:])
+
+    def shift(self, offset: int) -> "IntervalSet":
+        return IntervalSet._from_bounds([x + offset for x in self.starts], [x + offset for x in self.stops])
+
+    def __and__(self, other: "IntervalSet") -> "IntervalSet":
+        starts, stops = [], []
+        for interval in other:
+            clipped = self.clip(interval.start, interval.stop)
+            starts += clipped.starts
+            stops += clipped.stops
+        return IntervalSet._from_bounds(starts, stops)
+
+    def __or__(self, other: "IntervalSet") -> "IntervalSet":
+        return IntervalSet(chain(self, other))
+
+    def __sub__(self, other: "IntervalSet") -> "IntervalSet":
+        remaining = self
+        for interval in other:
+            remaining = remaining.cut(interval.start, interval.stop)
+        return remaining
+
+
+# An axis-aligned box of ints with one range per axis, i.e. the n-dimensional version of a single interval.  It's a
+# tuple of ranges underneath, so boxes hash and compare like the NamedTuples of ranges they replace, and subclasses
+# can name their axes with properties.  An empty box (one with an empty range) is falsy.
+class Box(tuple):
+    # Boxes get made by the thousand (one per brick, or per split), so like NamedTuple they don't get an instance dict
+    __slots__ = ()
+
+    def __new__(cls, ranges: Iterable[range]):
+        return super().__new__(cls, ranges)
+
+    def __repr__(self):
+        return f"{type(self).__name__}({list(self)})"
+
+    def __bool__(self) -> bool:
+        return all(self)
+
+    def volume(self) -> int:
+        return prod(map(len, self))
+
+    def replace(self, axis: int, new_range: range) -> "Self":
+        return type(self)(new_range if i == axis else x for i, x in enumerate(self))
+
+    def shift(self, axis: int, offset: int) -> "Self":
+        return self.replace(axis, range(self[axis].start + offset, self[axis].stop + offset))
+
+    def split(self, axis: int, at: int) -> Tuple[Optional["Self"], Optional["Self"]]:
+        # The parts of the box below at and from at upwards along one axis, or None where that part is empty
+        current = self[axis]
+        below = range(current.start, min(at, current.stop))
+        above = range(max(at, current.start), current.stop)
+        return (self.replace(axis, below) if below else None), (self.replace(axis, above) if above else None)
+
+    def overlaps(self, other: "Box", axes: Optional[Iterable[int]] = None) -> bool:
+        # Whether the boxes share any cell, looking only at the given axes if there are any
+        for mine, theirs in zip(self, other) if axes is None else ((self[i], other[i]) for i in axes):
+            if max(mine.start, theirs.start) >= min(mine.stop, theirs.stop):
+                return False
+        return True
+
+    def intersection(self, other: "Box") -> Optional["Self"]:
+        common = type(self)(range(max(x.start, y.start), min(x.stop, y.stop)) for x, y in zip(self, other))
+        return common if common else None
+
+
+# Cycle detection for anything that repeatedly applies step() to a state until the states start repeating.  The
+# states from step number tail onwards repeat every period steps.
+class Cycle(NamedTuple):
+    tail: int
+    period: int
+
+    def index(self, n: int) -> int:
+        # The earliest step whose state is the same as step n's
+        return n if n < self.tail else self.tail + (n - self.tail) % self.period
+
+
+def brent(step: Callable[[T], T], start: T) -> Cycle:
+    # Brent's algorithm: only ever holds two states, at the cost of re-stepping from the start to find the tail
+    power = period = 1
+    tortoise, hare = start, step(start)
+    while tortoise != hare:
+        if power == period:
+            tortoise, power, period = hare, power * 2, 0
+        hare = step(hare)
+        period += 1
+    tortoise = hare = start
+    for _ in range(period):
+        hare = step(hare)
+    tail = 0
+    while tortoise != hare:
+        tortoise, hare = step(tortoise), step(hare)
+        tail += 1
+    return Cycle(tail, period)
+
+
+def floyd(step: Callable[[T], T], start: T) -> Cycle:
+    # Floyd's tortoise and hare, also two states at a time
+    tortoise, hare = step(start), step(step(start))
+    while tortoise != hare:
+        tortoise, hare = step(tortoise), step(step(hare))
+    tortoise, tail = start, 0
+    while tortoise != hare:
+        tortoise, hare = step(tortoise), step(hare)
+        tail += 1
+    period, hare = 1, step(tortoise)
+    while tortoise != hare:
+        hare = step(hare)
+        period += 1
+    return Cycle(tail, period)
+
+
+def _find_repeat(
+    step: Callable[[T], T], start: T, key: Optional[Callable[[T], Hashable]], limit: Optional[int]
+) -> Tuple[T, int, Optional[int]]:
+    # Steps until a state's key has been seen before (or limit steps have been taken), and returns the state it got
+    # to, how many steps that took, and the step that first had the same key (None if nothing repeated)
+    seen: Dict[Hashable, int] = {}
+    state, i = start, 0
+    while limit is None or i < limit:
+        fingerprint = key(state) if key else state
+        if fingerprint in seen:
+            return state, i, seen[fingerprint]
+        seen[fingerprint] = i
+        state, i = step(state), i + 1
+    return state, i, None
+
+
+def find_cycle(step: Callable[[T], T], start: T, key: Optional[Callable[[T], Hashable]] = None) -> Cycle:
+    # Hash-indexed: each step is a dict lookup, and every state is only stepped once.  States are remembered by
+    # key(state), so a compact key (e.g. key=hash for a 64-bit fingerprint) saves holding on to every whole state, at
+    # the cost of a vanishingly small chance of two different states colliding.
+    _, repeat, first = _find_repeat(step, start, key, None)
+    return Cycle(first, repeat - first)
+
+
+def state_at(step: Callable[[T], T], start: T, n: int, key: Optional[Callable[[T], Hashable]] = None) -> T:
+    # The state after n steps, skipping straight past all the whole periods once the states start repeating
+    state, repeat, first = _find_repeat(step, start, key, n)
+    if first is not None:
+        for _ in range((n - repeat) % (repeat - first)):
+            state = step(state)
+    return state